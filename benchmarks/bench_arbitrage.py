@@ -0,0 +1,49 @@
+"""
+Benchmark arbitrage scanning: a full scan_arbitrage pass against incremental ArbitrageScanner ticks.
+
+Usage: python benchmarks/bench_arbitrage.py [--markets 10000] [--outcomes 3] [--books 30] [--ticks 100000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.arbitrage import ArbitrageScanner, scan_arbitrage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--markets', type=int, default=10000)
+    parser.add_argument('--outcomes', type=int, default=3)
+    parser.add_argument('--books', type=int, default=30)
+    parser.add_argument('--ticks', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shape = (args.markets, args.outcomes, args.books)
+    prices = args.outcomes / rng.uniform(0.995, 1.1, shape)
+
+    start = time.perf_counter()
+    scan = scan_arbitrage(prices)
+    full = time.perf_counter() - start
+    print(f"full scan of {shape}: {full * 1e3:.1f} ms, {scan.is_arbitrage.sum()} arbitrages")
+
+    scanner = ArbitrageScanner(prices)
+    ticks = [tuple(rng.integers(0, n) for n in shape) for _ in range(args.ticks)]
+    new_prices = (args.outcomes / rng.uniform(0.995, 1.1, args.ticks)).tolist()
+    start = time.perf_counter()
+    for (market, outcome, book), price in zip(ticks, new_prices):
+        scanner.update(market, outcome, book, price)
+    incremental = time.perf_counter() - start
+    print(f"incremental: {args.ticks / incremental:,.0f} ticks/s "
+          f"({incremental / args.ticks * 1e6:.1f} us per tick vs {full * 1e6:,.0f} us per full rescan)")
+
+    markets, outcomes, books = (rng.integers(0, n, args.ticks) for n in shape)
+    start = time.perf_counter()
+    scanner.update_many(markets, outcomes, books, new_prices)
+    batched = time.perf_counter() - start
+    print(f"update_many: {args.ticks / batched:,.0f} ticks/s")
+
+
+if __name__ == '__main__':
+    main()
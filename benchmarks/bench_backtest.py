@@ -0,0 +1,60 @@
+"""
+Benchmark run_backtest on generated CSV bet logs of growing size.
+
+Peak traced memory (tracemalloc, which includes NumPy buffers) should stay flat as the file grows.
+
+Usage: python benchmarks/bench_backtest.py [--rows 100000 1000000] [--chunk-size 100000]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from quantbets.backtest import run_backtest
+
+
+def write_bet_log(path, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    n_markets = n_rows // 2
+    probability = rng.uniform(0.2, 0.8, n_markets)
+    rows = np.empty((n_markets * 2, 5))
+    rows[:, 0] = np.repeat(np.arange(n_markets), 2)
+    rows[0::2, 3], rows[1::2, 3] = probability, 1 - probability
+    rows[:, 1] = 1 / rows[:, 3] * rng.uniform(0.92, 1.06, len(rows))
+    rows[:, 4] = 1 / rows[:, 3] * rng.uniform(0.95, 1.0, len(rows))
+    winner = rng.random(n_markets) < probability
+    rows[0::2, 2], rows[1::2, 2] = winner, ~winner
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['market_id', 'odds', 'result', 'probability', 'closing_odds'])
+        for start in range(0, len(rows), 100000):
+            writer.writerows(rows[start:start + 100000].tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rows in args.rows:
+            path = os.path.join(directory, f'bets_{n_rows}.csv')
+            write_bet_log(path, n_rows)
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = run_backtest(path, 1000, chunk_size=args.chunk_size, multiplier=0.25)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{n_rows:>10} rows {elapsed:7.2f}s {n_rows / elapsed:>11,.0f} rows/s "
+                  f"peak {peak / 2 ** 20:6.1f} MiB  bets {result.n_bets} yield {result.yield_:+.4f} "
+                  f"clv {result.clv:+.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark ResultCache against recomputing EV and Kelly stakes when most market prices have not moved.
+
+Usage: python benchmarks/bench_cache.py [--markets 10000] [--rounds 20] [--move 0.05]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.bankroll_management import kelly_criterion_batch
+from quantbets.cache import ResultCache
+from quantbets.probability import calculate_ev_percentage_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--markets', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--move', type=float, default=0.05, help="Fraction of markets whose prices move per round.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    odds = 3 / rng.uniform(0.9, 1.0, (args.markets, 3))
+    probability = rng.dirichlet(np.ones(3), args.markets)
+    rounds = []
+    for _ in range(args.rounds):
+        moved = rng.random(args.markets) < args.move
+        odds = np.where(moved[:, None], odds * rng.uniform(0.98, 1.02, odds.shape), odds)
+        rounds.append((odds.copy(), np.flatnonzero(moved)))
+
+    start = time.perf_counter()
+    for prices, _ in rounds:
+        for market in range(args.markets):
+            calculate_ev_percentage_batch(prices[market], probability[market])
+            kelly_criterion_batch(1000, probability[market], prices[market], 0.5)
+    uncached = time.perf_counter() - start
+
+    cache = ResultCache(maxsize=4 * args.markets)
+    start = time.perf_counter()
+    for prices, moved in rounds:
+        for market in moved.tolist():
+            cache.invalidate(market_id=market)
+        for market in range(args.markets):
+            cache.ev('v1', market, prices[market], probability[market])
+            cache.kelly('v1', market, prices[market], probability[market], 1000, 0.5)
+    cached = time.perf_counter() - start
+
+    evaluations = 2 * args.markets * args.rounds
+    print(f"recompute: {evaluations / uncached:12,.0f} market evaluations/s")
+    print(f"cached:    {evaluations / cached:12,.0f} market evaluations/s ({uncached / cached:.1f}x)")
+    print(cache.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark de-vigging many markets: calculate_true_odds per market against calculate_true_odds_batch,
+then markets per second and solver iterations of every calculate_true_odds_batch method.
+
+calculate_true_odds is fed a pandas DataFrame per market when pandas is installed, otherwise a dict of arrays.
+
+Usage: python benchmarks/bench_devig.py [--markets 10000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.devig import METHODS, calculate_true_odds_batch
+from quantbets.odds import calculate_true_odds
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def make_markets(n_markets, seed=0):
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(2, 4, n_markets)
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    strength = rng.uniform(0.1, 1.0, offsets[-1])
+    probabilities = strength / np.repeat(np.add.reduceat(strength, offsets[:-1]), sizes)
+    odds = 1.0 / (probabilities * np.repeat(rng.uniform(1.02, 1.08, n_markets), sizes))
+    return odds, offsets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--markets', type=int, default=10000)
+    args = parser.parse_args()
+
+    odds, offsets = make_markets(args.markets)
+    frame = pd.DataFrame if pd is not None else (lambda data: data)
+
+    start = time.perf_counter()
+    for lo, hi in zip(offsets[:-1], offsets[1:]):
+        calculate_true_odds(frame({'odds': odds[lo:hi]}))
+    per_market = time.perf_counter() - start
+
+    start = time.perf_counter()
+    calculate_true_odds_batch(odds, offsets=offsets)
+    batch = time.perf_counter() - start
+
+    print(f"{args.markets} markets: per market {per_market:.3f}s "
+          f"({args.markets / per_market:,.0f} markets/s), "
+          f"batch {batch:.4f}s ({args.markets / batch:,.0f} markets/s)")
+
+    print(f"{'method':<14} {'markets/s':>14} {'max iter':>9} {'max |residual|':>15}")
+    for method in METHODS:
+        start = time.perf_counter()
+        _, info = calculate_true_odds_batch(odds, offsets=offsets, method=method, full_output=True)
+        elapsed = time.perf_counter() - start
+        print(f"{method:<14} {args.markets / elapsed:>14,.0f} {info.iterations.max():>9} "
+              f"{np.abs(info.residual).max():>15.2e}")
+
+
+if __name__ == '__main__':
+    main()
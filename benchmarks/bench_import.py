@@ -0,0 +1,35 @@
+"""
+Benchmark the import time of quantbets in fresh interpreters, alone and followed by first use of each layer.
+
+Usage: python benchmarks/bench_import.py [--runs 20]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+CASES = {
+    'import quantbets': "import quantbets",
+    '+ Odds conversion': "import quantbets; quantbets.Odds((5, 2), 'fractional').to_decimal()",
+    '+ kelly_criterion': "import quantbets; quantbets.kelly_criterion(1000, 0.55, 2.5)",
+    '+ kelly_criterion_batch': "import quantbets; quantbets.kelly_criterion_batch(1000, [0.55], [2.5])",
+    'import numpy': "import numpy",
+}
+
+TIMER = "import time; start = time.perf_counter(); {code}; print(time.perf_counter() - start)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    for label, code in CASES.items():
+        times = [float(subprocess.run([sys.executable, '-c', TIMER.format(code=code)],
+                                      capture_output=True, text=True, check=True).stdout)
+                 for _ in range(args.runs)]
+        print(f"{label:<26} median {statistics.median(times) * 1e3:7.2f} ms   min {min(times) * 1e3:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
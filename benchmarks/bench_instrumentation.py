@@ -0,0 +1,44 @@
+"""
+Benchmark the overhead of instrumentation on the scalar hot paths: unwrapped, disabled and enabled.
+
+Usage: python benchmarks/bench_instrumentation.py [--calls 100000]
+"""
+import argparse
+import time
+
+from quantbets import instrumentation
+from quantbets.bankroll_management import kelly_criterion
+from quantbets.odds import Odds
+from quantbets.probability import calculate_ev_percentage
+
+CASES = {
+    'Odds': (Odds.__init__, lambda init: init(Odds.__new__(Odds), 2.5, precision='fast')),
+    'calculate_ev_percentage': (calculate_ev_percentage, lambda f: f(2.5, 0.5, precision='fast')),
+    'kelly_criterion': (kelly_criterion, lambda f: f(1000, 0.55, 2.5, precision='fast')),
+}
+
+
+def per_call(call, function, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        call(function)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args()
+
+    instrumentation.disable()
+    for name, (function, call) in CASES.items():
+        unwrapped = per_call(call, function.__wrapped__, args.calls)
+        disabled = per_call(call, function, args.calls)
+        with instrumentation.instrumented():
+            enabled = per_call(call, function, args.calls)
+        print(f"{name:24s} unwrapped: {unwrapped * 1e6:6.2f} us  disabled: {disabled * 1e6:6.2f} us  "
+              f"enabled: {enabled * 1e6:6.2f} us per call")
+
+
+if __name__ == '__main__':
+    main()
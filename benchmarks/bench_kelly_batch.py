@@ -0,0 +1,58 @@
+"""
+Benchmark kelly_criterion_batch against a Python loop over kelly_criterion.
+
+The scalar loop is timed on at most --scalar-limit rows and extrapolated to the full size,
+since looping over 1e7 Decimal calls takes minutes. Pass --scalar-limit 0 to time every row.
+
+Usage: python benchmarks/bench_kelly_batch.py [--sizes 1000 100000 10000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.bankroll_management import kelly_criterion, kelly_criterion_batch
+
+
+def make_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    probability = rng.uniform(0.05, 0.95, n)
+    odds = rng.uniform(1.05, 10.0, n)
+    return probability, odds
+
+
+def time_batch(probability, odds, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kelly_criterion_batch(1000.0, probability, odds, 0.5)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_scalar(probability, odds):
+    start = time.perf_counter()
+    for p, o in zip(probability.tolist(), odds.tolist()):
+        kelly_criterion(1000.0, p, o, 0.5)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 5, 10 ** 7])
+    parser.add_argument('--scalar-limit', type=int, default=10 ** 5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'batch s':>10} {'scalar s':>10} {'speedup':>9}")
+    for n in args.sizes:
+        probability, odds = make_inputs(n)
+        batch = time_batch(probability, odds)
+        sample = n if args.scalar_limit <= 0 else min(n, args.scalar_limit)
+        scalar = time_scalar(probability[:sample], odds[:sample]) * n / sample
+        marker = '' if sample == n else '*'
+        print(f"{n:>12} {batch:>10.4f} {scalar:>9.3f}{marker:1} {scalar / batch:>8.0f}x")
+    print("* extrapolated from a sample of --scalar-limit rows")
+
+
+if __name__ == '__main__':
+    main()
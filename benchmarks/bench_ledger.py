@@ -0,0 +1,68 @@
+"""
+Benchmark BankrollLedger: placing and settling 1M bets in one batch and in smaller batches, against a Python loop.
+
+Usage: python benchmarks/bench_ledger.py [--bets 1000000] [--batch 10000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.ledger import LOST, VOID, WON, BankrollLedger
+
+
+def python_loop(bankroll, stakes, odds, results):
+    """
+    Reference settlement with plain floats, one bet at a time.
+    """
+    equity = peak = bankroll
+    max_drawdown = 0.0
+    for stake, price, result in zip(stakes, odds, results):
+        if result == WON:
+            equity += stake * (price - 1)
+        elif result == LOST:
+            equity -= stake
+        peak = max(peak, equity)
+        max_drawdown = max(max_drawdown, 1 - equity / peak)
+    return equity, max_drawdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bets', type=int, default=1000000)
+    parser.add_argument('--batch', type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    stakes = rng.uniform(1, 10, args.bets)
+    odds = rng.uniform(1.5, 4.0, args.bets)
+    results = rng.choice([LOST, WON, VOID], args.bets, p=[0.58, 0.4, 0.02]).astype(np.int8)
+    bankroll = 10 * stakes.sum()
+
+    ledger = BankrollLedger(bankroll)
+    start = time.perf_counter()
+    ids = ledger.place(stakes, odds)
+    placed = time.perf_counter() - start
+    start = time.perf_counter()
+    ledger.settle(ids, results)
+    settled = time.perf_counter() - start
+    print(f"place, one batch:   {args.bets / placed:14,.0f} bets/s")
+    print(f"settle, one batch:  {args.bets / settled:14,.0f} bets/s ({settled * 1e3:.1f} ms)")
+
+    ledger = BankrollLedger(bankroll, capacity=args.bets)
+    ids = ledger.place(stakes, odds)
+    start = time.perf_counter()
+    for begin in range(0, args.bets, args.batch):
+        ledger.settle(ids[begin:begin + args.batch], results[begin:begin + args.batch])
+    batched = time.perf_counter() - start
+    print(f"settle, {args.batch:,}/batch: {args.bets / batched:11,.0f} bets/s")
+
+    start = time.perf_counter()
+    equity, max_drawdown = python_loop(bankroll, stakes.tolist(), odds.tolist(), results.tolist())
+    looped = time.perf_counter() - start
+    print(f"python loop:        {args.bets / looped:14,.0f} bets/s")
+    print(f"equity {ledger.equity:,.2f} vs {equity:,.2f}, max drawdown {ledger.max_drawdown:.6f} vs {max_drawdown:.6f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark ticks per second of Market against recomputing the whole market on every tick.
+
+Usage: python benchmarks/bench_market.py [--ticks 200000] [--selections 3 20]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.bankroll_management import kelly_criterion_batch
+from quantbets.devig import calculate_true_odds_batch
+from quantbets.market import Market
+from quantbets.probability import calculate_ev_percentage_batch
+
+
+def incremental(selections, prices, probabilities):
+    market = Market(dict(enumerate(1 / probabilities)), dict(enumerate(probabilities)), bankroll=1000)
+    for selection, price in zip(selections.tolist(), prices.tolist()):
+        market.tick(selection, price)
+        market.stake(selection)
+
+
+def full(selections, prices, probabilities):
+    odds = 1 / probabilities
+    offsets = [0, len(odds)]
+    for selection, price in zip(selections.tolist(), prices.tolist()):
+        odds[selection] = price
+        calculate_true_odds_batch(odds, offsets=offsets)
+        calculate_ev_percentage_batch(odds, probabilities)
+        kelly_criterion_batch(1000, probabilities, odds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=200000)
+    parser.add_argument('--selections', type=int, nargs='+', default=[3, 20])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.selections:
+        probabilities = np.full(n, 1 / n)
+        selections = rng.integers(0, n, args.ticks)
+        prices = n * rng.uniform(0.9, 1.1, args.ticks)
+        for name, run, ticks in (('incremental', incremental, args.ticks), ('full', full, args.ticks // 10)):
+            start = time.perf_counter()
+            run(selections[:ticks], prices[:ticks], probabilities)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>3} selections {name:<12} {ticks / elapsed:>12,.0f} ticks/s")
+
+
+if __name__ == '__main__':
+    main()
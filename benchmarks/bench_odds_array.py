@@ -0,0 +1,47 @@
+"""
+Benchmark bulk conversion of a price feed with OddsArray against per-price Odds objects.
+
+Usage: python benchmarks/bench_odds_array.py [--rows 500000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.odds import Odds, OddsArray
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def convert_scalar(american):
+    for value in american:
+        odds = Odds(value, odds_type='american')
+        odds.to_fractional()
+        odds.odds_to_probability()
+
+
+def convert_array(american):
+    odds = OddsArray.from_american(american)
+    odds.to_american()
+    odds.to_fractional()
+    odds.odds_to_probability()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=500000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    american = rng.choice([-1, 1], args.rows) * rng.integers(100, 1000, args.rows)
+    scalar = timed(lambda: convert_scalar(american.tolist()))
+    array = timed(lambda: convert_array(american))
+    print(f"{args.rows} prices: Odds {scalar:.3f}s, OddsArray {array:.4f}s ({scalar / array:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark Odds memory per instance and conversion throughput under repeated access.
+
+Usage: python benchmarks/bench_odds_cache.py [--instances 100000] [--accesses 10]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from quantbets.odds import Odds
+
+
+def measure_memory(make, values):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make(value) for value in values]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, (after - before) / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--instances', type=int, default=100000)
+    parser.add_argument('--accesses', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Feed prices repeat a lot: a few hundred distinct American prices
+    american = (rng.choice([-1, 1], args.instances) * rng.integers(100, 400, args.instances)).tolist()
+
+    objects, per_instance = measure_memory(lambda value: Odds(value, 'american'), american)
+    print(f"Odds:          {per_instance:7.1f} bytes per instance (including its Decimal)")
+    interned, per_interned = measure_memory(lambda value: Odds.interned(value, 'american'), american)
+    print(f"Odds.interned: {per_interned:7.1f} bytes per reference ({len(set(map(id, interned)))} distinct objects)")
+
+    start = time.perf_counter()
+    for _ in range(args.accesses):
+        for odds in objects:
+            odds.to_decimal()
+            odds.to_fractional()
+            odds.odds_to_probability()
+    elapsed = time.perf_counter() - start
+    conversions = 3 * args.accesses * len(objects)
+    print(f"repeated access: {conversions / elapsed:,.0f} conversions/s over {args.accesses} passes")
+
+    start = time.perf_counter()
+    for odds in objects:
+        str(odds)
+    print(f"str(): {len(objects) / (time.perf_counter() - start):,.0f} per second")
+
+
+if __name__ == '__main__':
+    main()
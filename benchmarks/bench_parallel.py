@@ -0,0 +1,42 @@
+"""
+Benchmark EV and Kelly evaluation scaling from 1 to N workers over shared-memory inputs.
+
+Usage: python benchmarks/bench_parallel.py [--size 20000000] [--jobs 1 2 4 8] [--backend process thread]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from quantbets.parallel import ParallelEvaluator, SharedArray
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=20000000)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--backend', nargs='+', default=['process', 'thread'])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{args.size} (probability, price) pairs on {os.cpu_count()} CPUs")
+    with SharedArray.from_array(rng.uniform(0.05, 0.95, args.size)) as probability, \
+            SharedArray.from_array(rng.uniform(1.05, 20.0, args.size)) as odds, SharedArray(args.size) as out:
+        for backend in args.backend:
+            for jobs in args.jobs:
+                with ParallelEvaluator(jobs, backend) as evaluator:
+                    # Warm the pool so worker start-up is not timed
+                    evaluator.calculate_ev_percentage(odds, probability, out=out)
+                    start = time.perf_counter()
+                    evaluator.calculate_ev_percentage(odds, probability, out=out)
+                    ev_elapsed = time.perf_counter() - start
+                    start = time.perf_counter()
+                    evaluator.kelly_criterion(1000, probability, odds, 0.5, out=out)
+                    kelly_elapsed = time.perf_counter() - start
+                print(f"{backend:<8} jobs={jobs:<3} EV {args.size / ev_elapsed / 1e6:8.1f}M/s  "
+                      f"Kelly {args.size / kelly_elapsed / 1e6:8.1f}M/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark parsing feed price strings: Odds per string against parse_odds on lists, string arrays and buffers.
+
+Usage: python benchmarks/bench_parsing.py [--rows 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.odds import Odds
+from quantbets.parsing import parse_odds
+
+
+def feed(rows, rng):
+    decimal = np.round(rng.uniform(1.1, 10.0, rows), 2)
+    american = np.where(decimal >= 2, (decimal - 1) * 100, -100 / (decimal - 1)).round().astype(int)
+    numerators = np.round((decimal - 1) * 4).astype(int) + 1
+    kind = rng.integers(0, 3, rows)
+    return [f'{d:.2f}' if k == 0 else f'{a:+d}' if k == 1 else f'{n}/4'
+            for d, a, n, k in zip(decimal.tolist(), american.tolist(), numerators.tolist(), kind.tolist())]
+
+
+def odds_per_string(values):
+    odds = []
+    for value in values:
+        if '/' in value:
+            numerator, denominator = value.split('/')
+            odds.append(Odds((numerator, denominator), 'fractional'))
+        elif value[0] in '+-':
+            odds.append(Odds(value, 'american'))
+        else:
+            odds.append(Odds(value))
+    return odds
+
+
+def report(label, rows, function, *args):
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {rows / elapsed:>14,.0f} strings/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    values = feed(args.rows, np.random.default_rng(0))
+    sample = values[:min(args.rows, 100000)]
+    report("Odds per string (exact)", len(sample), odds_per_string, sample)
+    report("parse_odds, mixed list of str", args.rows, parse_odds, values)
+    report("parse_odds, mixed bytes buffer", args.rows, parse_odds, '\n'.join(values).encode())
+
+    decimal = np.array([value for value in values if '/' not in value and value[0] not in '+-'], dtype='S')
+    report("parse_odds, mixed S array", args.rows, parse_odds, np.array(values, dtype='S'))
+    report("parse_odds, decimal S array, detected", len(decimal), parse_odds, decimal)
+    report("parse_odds, decimal S array, odds_type", len(decimal), parse_odds, decimal, 'decimal')
+
+
+if __name__ == '__main__':
+    main()
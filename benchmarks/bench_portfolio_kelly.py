@@ -0,0 +1,36 @@
+"""
+Benchmark the portfolio Kelly solvers for growing numbers of concurrent positions.
+
+Usage: python benchmarks/bench_portfolio_kelly.py [--positions 5 10 20 40]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from quantbets.bankroll_management import kelly_mutually_exclusive, kelly_simultaneous
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--positions', type=int, nargs='+', default=[5, 10, 20, 40])
+    parser.add_argument('--number', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'positions':>9} {'exclusive ms':>13} {'simultaneous ms':>16}")
+    for n in args.positions:
+        probabilities = rng.uniform(0.3, 0.6, n)
+        odds = 1 / probabilities * rng.uniform(0.95, 1.15, n)
+        exclusive_probabilities = probabilities / probabilities.sum()
+        exclusive_odds = 1 / exclusive_probabilities * rng.uniform(0.9, 1.05, n)
+
+        exclusive = min(timeit.repeat(lambda: kelly_mutually_exclusive(1000, exclusive_probabilities, exclusive_odds),
+                                      number=args.number, repeat=3)) / args.number
+        simultaneous = min(timeit.repeat(lambda: kelly_simultaneous(1000, probabilities, odds, seed=0),
+                                         number=args.number, repeat=3)) / args.number
+        print(f"{n:>9} {exclusive * 1e3:>13.3f} {simultaneous * 1e3:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
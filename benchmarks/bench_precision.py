@@ -0,0 +1,37 @@
+"""
+Microbenchmark the per-call latency of the 'exact' (Decimal) and 'fast' (float) precision modes.
+
+Usage: python benchmarks/bench_precision.py [--number 20000]
+"""
+import argparse
+import timeit
+
+from quantbets.bankroll_management import kelly_criterion
+from quantbets.odds import Odds
+from quantbets.probability import calculate_ev_percentage
+
+CALLS = {
+    'kelly_criterion': lambda precision: kelly_criterion(1000.0, 0.55, 2.5, 0.5, precision=precision),
+    'calculate_ev_percentage': lambda precision: calculate_ev_percentage(2.5, 0.55, precision=precision),
+    'Odds(american).odds_to_probability': lambda precision: Odds(-110, 'american', precision).odds_to_probability(),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'call':<38} {'exact us':>9} {'fast us':>9} {'speedup':>8}")
+    for name, call in CALLS.items():
+        latency = {}
+        for precision in ('exact', 'fast'):
+            timer = timeit.Timer(lambda: call(precision))
+            latency[precision] = min(timer.repeat(args.repeat, args.number)) / args.number * 1e6
+        print(f"{name:<38} {latency['exact']:>9.2f} {latency['fast']:>9.2f} "
+              f"{latency['exact'] / latency['fast']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark RepricingService throughput and update-to-recommendation latency.
+
+Usage: python benchmarks/bench_service.py [--updates 200000] [--markets 2000] [--window 0.01 0.05]
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from quantbets.service import FakeSource, PriceUpdate, RepricingService
+
+
+async def replay(updates, window):
+    service = RepricingService([FakeSource(updates)], 1000, multiplier=0.5, window=window)
+    task = asyncio.ensure_future(service.run())
+    count = 0
+    async for _ in service.stream():
+        count += 1
+    await task
+    return service, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--updates', type=int, default=200000)
+    parser.add_argument('--markets', type=int, default=2000)
+    parser.add_argument('--window', type=float, nargs='+', default=[0.01, 0.05])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    markets = rng.integers(0, args.markets, args.updates)
+    selections = rng.integers(0, 3, args.updates)
+    odds = rng.uniform(2.5, 3.5, args.updates)
+    updates = [PriceUpdate(int(m), int(s), float(o), 0.34) for m, s, o in zip(markets, selections, odds)]
+
+    print(f"{args.updates} updates over {args.markets} markets")
+    for window in args.window:
+        start = time.perf_counter()
+        service, count = asyncio.run(replay(updates, window))
+        elapsed = time.perf_counter() - start
+        latency = service.latency_percentiles()
+        print(f"window={window:<6} {elapsed:6.2f}s {args.updates / elapsed:>10,.0f} updates/s "
+              f"{count:>8} recommendations  p50 {latency['p50'] * 1e3:7.2f}ms  p99 {latency['p99'] * 1e3:7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark simulate_bankroll throughput in this process and across a process pool.
+
+Usage: python benchmarks/bench_simulation.py [--paths 1000000] [--bets 100] [--jobs 1 2 4]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from quantbets.simulation import simulate_bankroll
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--paths', type=int, default=1000000)
+    parser.add_argument('--bets', type=int, default=100)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    probabilities = rng.uniform(0.4, 0.6, args.bets)
+    odds = 1 / probabilities * rng.uniform(0.97, 1.1, args.bets)
+    multipliers = (1.0, 0.5, 0.25)
+
+    print(f"{args.paths} paths x {args.bets} bets x {len(multipliers)} strategies")
+    for jobs in args.jobs:
+        start = time.perf_counter()
+        results = simulate_bankroll(probabilities, odds, multipliers, n_paths=args.paths, seed=1, n_jobs=jobs)
+        elapsed = time.perf_counter() - start
+        growth = ', '.join(f"{m}: {results[m].growth_rate:.5f}" for m in multipliers)
+        print(f"jobs={jobs:<3} {elapsed:7.2f}s {args.paths / elapsed:>12,.0f} paths/s  growth per bet {growth}")
+
+
+if __name__ == '__main__':
+    main()
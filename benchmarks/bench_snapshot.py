@@ -0,0 +1,80 @@
+"""
+Benchmark reloading odds snapshots: CSV parsing plus the Odds constructor against a memory-mapped snapshot.
+
+Each load runs in a fresh subprocess so that its load time and peak RSS are measured in isolation.
+
+Usage: python benchmarks/bench_snapshot.py [--rows 1000000]
+"""
+import argparse
+import csv
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from quantbets.snapshot import write_snapshot
+
+
+def load_csv(path):
+    from quantbets.odds import Odds
+    with open(path, newline='') as handle:
+        reader = csv.reader(handle)
+        next(reader)
+        odds = [Odds(row[3]) for row in reader]
+    return sum(float(o.odds_to_probability()) for o in odds[:1000])
+
+
+def load_snapshot(path):
+    from quantbets.probability import calculate_ev_percentage_batch
+    from quantbets.snapshot import read_snapshot
+    snapshot = read_snapshot(path)
+    return float(calculate_ev_percentage_batch(snapshot.odds, 0.5).sum())
+
+
+def child(mode, path):
+    start = time.perf_counter()
+    (load_csv if mode == 'csv' else load_snapshot)(path)
+    elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{elapsed} {peak_kib}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(*args.child)
+
+    rng = np.random.default_rng(0)
+    market_id = np.repeat(np.arange(args.rows // 2), 2)
+    selection = np.tile([1, 2], args.rows // 2)
+    timestamp = np.arange(len(market_id)) * 1000
+    odds = np.round(rng.uniform(1.2, 6.0, len(market_id)), 2)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'odds.csv')
+        snapshot_path = os.path.join(directory, 'odds.qbs')
+        with open(csv_path, 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['market_id', 'selection', 'timestamp', 'odds', 'book'])
+            writer.writerows(zip(market_id.tolist(), selection.tolist(), timestamp.tolist(), odds.tolist(),
+                                 [0] * len(odds)))
+        write_snapshot(snapshot_path, market_id, selection, timestamp, odds)
+
+        print(f"{len(odds)} rows: CSV {os.path.getsize(csv_path) / 2 ** 20:.1f} MiB, "
+              f"snapshot {os.path.getsize(snapshot_path) / 2 ** 20:.1f} MiB")
+        for mode, path in (('csv', csv_path), ('snapshot', snapshot_path)):
+            output = subprocess.run([sys.executable, __file__, '--child', mode, path], check=True,
+                                    capture_output=True, text=True, env=dict(os.environ)).stdout.split()
+            elapsed, peak_kib = float(output[0]), int(output[1])
+            print(f"{mode:<9} load {elapsed:8.3f}s  peak RSS {peak_kib / 1024:8.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
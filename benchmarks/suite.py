@@ -0,0 +1,217 @@
+"""
+Benchmark suite covering the public API, with JSON results and regression checks against a baseline.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1 100 10000] [--filter kelly] [--output results.json]
+    python benchmarks/suite.py --save-baseline baseline.json
+    python benchmarks/suite.py --compare baseline.json [--threshold 0.25]
+
+Each case is timed on fresh inputs, as the best of several repeats. The result is reported per item, so sizes
+and machines with different loop counts stay comparable. --compare exits with status 1 when any case present in
+the baseline is slower by more than the threshold (a fraction, 0.25 = 25%).
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+import quantbets
+from quantbets import (
+    Odds, OddsArray, calculate_ev_percentage, calculate_ev_percentage_batch, kelly_criterion, kelly_criterion_batch,
+)
+from quantbets.devig import calculate_true_odds_batch
+from quantbets.odds import calculate_true_odds
+from quantbets.parsing import parse_odds
+
+FORMATS = ('decimal', 'american', 'fractional')
+PRECISIONS = ('exact', 'fast')
+
+
+def _prices(n, odds_type, rng):
+    decimal = np.round(rng.uniform(1.1, 10.0, n), 2)
+    if odds_type == 'decimal':
+        return [str(price) for price in decimal]
+    if odds_type == 'american':
+        american = np.where(decimal >= 2, (decimal - 1) * 100, -100 / (decimal - 1)).round()
+        return [str(int(price)) for price in american]
+    numerators = np.round((decimal - 1) * 4).astype(int) + 1
+    return [(int(numerator), 4) for numerator in numerators]
+
+
+def _feed(n, rng):
+    """
+    n price strings in mixed formats, as a bookmaker feed delivers them.
+    """
+    third = n // 3 + 1
+    decimal = _prices(third, 'decimal', rng)
+    american = [price if price.startswith('-') else '+' + price for price in _prices(third, 'american', rng)]
+    fractional = [f'{numerator}/{denominator}' for numerator, denominator in _prices(third, 'fractional', rng)]
+    return (decimal + american + fractional)[:n]
+
+
+def cases(sizes):
+    """
+    Yield (name, size, setup, run): run(setup()) performs the timed work on inputs of the given size.
+    """
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        for odds_type in FORMATS:
+            prices = _prices(n, odds_type, rng)
+            for precision in PRECISIONS:
+                tag = f'{odds_type},{precision},n={n}'
+
+                def construct(prices=prices, odds_type=odds_type, precision=precision):
+                    return [Odds(price, odds_type, precision) for price in prices]
+
+                yield f'Odds[{tag}]', n, lambda prices=prices: prices, construct
+                for method in ('to_decimal', 'to_american', 'to_fractional', 'odds_to_probability'):
+                    # Conversions are cached per instance, so every run converts freshly built objects
+                    yield (f'Odds.{method}[{tag}]', n, construct,
+                           lambda objects, method=method: [getattr(odds, method)() for odds in objects])
+
+        # Separate generator, so that the inputs of the other cases do not change
+        feed = _feed(n, np.random.default_rng(n))
+        yield f'parse_odds[mixed,n={n}]', n, lambda: feed, parse_odds
+        decimal_feed = np.array(feed[:n // 3 + 1], dtype='S')
+        yield (f'parse_odds[decimal,n={len(decimal_feed)}]', len(decimal_feed), lambda: decimal_feed,
+               lambda values: parse_odds(values, 'decimal'))
+
+        probability = rng.uniform(0.05, 0.95, n)
+        odds = rng.uniform(1.1, 10.0, n)
+        scalar_inputs = lambda: (odds.tolist(), probability.tolist())
+        for precision in PRECISIONS:
+            yield (f'calculate_ev_percentage[{precision},n={n}]', n, scalar_inputs,
+                   lambda inputs, precision=precision: [calculate_ev_percentage(o, p, precision)
+                                                        for o, p in zip(*inputs)])
+            yield (f'kelly_criterion[{precision},n={n}]', n, scalar_inputs,
+                   lambda inputs, precision=precision: [kelly_criterion(1000, p, o, 0.5, precision=precision)
+                                                        for o, p in zip(*inputs)])
+
+        array_inputs = lambda: (odds, probability)
+        yield (f'calculate_ev_percentage_batch[n={n}]', n, array_inputs,
+               lambda inputs: calculate_ev_percentage_batch(*inputs))
+        yield (f'kelly_criterion_batch[n={n}]', n, array_inputs,
+               lambda inputs: kelly_criterion_batch(1000, inputs[1], inputs[0], 0.5))
+        yield f'OddsArray.from_decimal[n={n}]', n, lambda: odds, OddsArray.from_decimal
+        for method in ('to_american', 'to_fractional', 'odds_to_probability'):
+            yield (f'OddsArray.{method}[n={n}]', n, lambda: OddsArray.from_decimal(odds),
+                   lambda array, method=method: getattr(array, method)())
+
+        # Markets of three selections, as in a typical 1X2 market
+        market_odds = 3 / rng.uniform(0.9, 1.0, 3 * n)
+        offsets = np.arange(0, 3 * n + 1, 3)
+        for method in ('proportional', 'shin'):
+            # pandas is optional: calculate_true_odds works on any mapping of column arrays
+            yield (f'calculate_true_odds[{method},markets={n}]', n,
+                   lambda: [{'odds': market_odds[start:start + 3]} for start in offsets[:-1]],
+                   lambda markets, method=method: [calculate_true_odds(market, method=method) for market in markets])
+            yield (f'calculate_true_odds_batch[{method},markets={n}]', n, lambda: market_odds,
+                   lambda values, method=method: calculate_true_odds_batch(values, offsets=offsets, method=method))
+
+
+def measure(setup, run, repeat=5, min_time=0.05):
+    """
+    Best time of one run over `repeat` repeats. Fast runs are looped until a repeat lasts at least min_time.
+    """
+    number = 1
+    while True:
+        inputs = [setup() for _ in range(number)]
+        start = time.perf_counter()
+        for value in inputs:
+            run(value)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(int(min_time / elapsed * 1.2) + 1, 100))
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        inputs = [setup() for _ in range(number)]
+        start = time.perf_counter()
+        for value in inputs:
+            run(value)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_suite(sizes, pattern=None, repeat=5, min_time=0.05, verbose=True):
+    """
+    Run every case whose name contains pattern.
+
+    :return: Dict with 'meta' (environment) and 'results' ({name: {'size', 'seconds', 'ns_per_item'}}).
+    """
+    results = {}
+    for name, size, setup, run in cases(sizes):
+        if pattern and pattern not in name:
+            continue
+        seconds = measure(setup, run, repeat, min_time)
+        results[name] = {'size': size, 'seconds': seconds, 'ns_per_item': seconds / size * 1e9}
+        if verbose:
+            print(f"{name:<55} {results[name]['ns_per_item']:>14,.1f} ns/item", file=sys.stderr)
+    meta = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'quantbets': getattr(quantbets, '__version__', None),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare per-item times with a baseline.
+
+    :return: Tuple (rows, regressions): rows of (name, baseline ns, current ns, ratio) and the names slower
+             than the baseline by more than threshold.
+    """
+    rows, regressions = [], []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        ratio = result['ns_per_item'] / reference['ns_per_item']
+        rows.append((name, reference['ns_per_item'], result['ns_per_item'], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 10000])
+    parser.add_argument('--filter', help="Only run cases whose name contains this string.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help="Minimum seconds per repeat.")
+    parser.add_argument('--output', help="Write the results as JSON to this file ('-' for stdout).")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Write the results as a new baseline.")
+    parser.add_argument('--compare', metavar='PATH', help="Compare with a baseline and fail on regressions.")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown as a fraction.")
+    args = parser.parse_args()
+
+    current = run_suite(args.sizes, args.filter, args.repeat, args.min_time)
+    for path in (args.output, args.save_baseline):
+        if path == '-':
+            json.dump(current, sys.stdout, indent=2)
+        elif path:
+            with open(path, 'w') as file:
+                json.dump(current, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        rows, regressions = compare(current, baseline, args.threshold)
+        for name, before, after, ratio in rows:
+            flag = '  REGRESSION' if name in regressions else ''
+            print(f"{name:<55} {before:>12,.1f} -> {after:>12,.1f} ns/item  {ratio:6.2f}x{flag}")
+        if regressions:
+            print(f"{len(regressions)} of {len(rows)} benchmarks regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"No regressions in {len(rows)} benchmarks")
+
+
+if __name__ == '__main__':
+    main()
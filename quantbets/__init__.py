@@ -1,3 +1,44 @@
-from .odds import Odds
-from .probability import calculate_ev_percentage
-from .bankroll_management import kelly_criterion
+"""
+Quantitative tools for sports betting.
+
+Submodules and the names below are imported on first access, so ``import quantbets`` stays cheap and does not
+load NumPy or pandas. The scalar core (Odds, calculate_ev_percentage, kelly_criterion) never needs them; the
+vectorized and DataFrame paths import them the first time they run.
+"""
+import importlib
+
+_EXPORTS = {
+    'Odds': 'odds',
+    'OddsArray': 'odds',
+    'calculate_ev_percentage': 'probability',
+    'calculate_ev_percentage_batch': 'probability',
+    'kelly_criterion': 'bankroll_management',
+    'kelly_criterion_batch': 'bankroll_management',
+    'kelly_mutually_exclusive': 'bankroll_management',
+    'kelly_simultaneous': 'bankroll_management',
+    'get_precision': 'precision',
+    'set_precision': 'precision',
+    'precision_context': 'precision',
+}
+
+_SUBMODULES = (
+    'arbitrage', 'backtest', 'bankroll_management', 'cache', 'devig', 'instrumentation', 'lazy', 'ledger', 'market',
+    'odds', 'parallel', 'parlay', 'parsing', 'precision', 'probability', 'service', 'simulation', 'snapshot',
+    'validation',
+)
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
@@ -0,0 +1,159 @@
+"""
+Arbitrage (surebet) detection across bookmakers.
+
+Prices are held in a (market, outcome, book) tensor of decimal odds, with NaN where a book does not quote
+an outcome. A market is an arbitrage when the implied probabilities of the best price of every outcome
+sum to less than 1; staking ``payout / best_odds`` on each outcome then returns ``payout`` whatever happens.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .validation import ODDS_MESSAGE, as_float_array
+
+ArbitrageScan = namedtuple('ArbitrageScan', ['best_odds', 'best_book', 'implied_sum', 'is_arbitrage'])
+
+
+def _check_prices(prices):
+    quoted = ~np.isnan(prices)
+    if not (prices[quoted] > 1).all():
+        raise ValueError(ODDS_MESSAGE)
+
+
+def best_prices(prices):
+    """
+    Find the best price of every outcome across books.
+
+    :param prices: (..., books) array of decimal odds, NaN where a book has no price.
+    :return: Tuple (best odds, index of the best book) with the book axis removed; NaN and -1 where no book quotes.
+    """
+    filled = np.where(np.isnan(prices), -np.inf, prices)
+    best_book = np.asarray(np.argmax(filled, axis=-1))
+    best_odds = np.take_along_axis(filled, best_book[..., None], axis=-1)[..., 0]
+    missing = np.isneginf(best_odds)
+    best_odds[missing] = np.nan
+    best_book[missing] = -1
+    return best_odds, best_book
+
+
+def scan_arbitrage(prices):
+    """
+    Scan a (market, outcome, book) price tensor for arbitrage opportunities.
+
+    Markets in which some outcome has no price at all have a NaN implied sum and are never flagged.
+
+    :param prices: (markets, outcomes, books) array of decimal odds, NaN where a book has no price.
+    :return: ArbitrageScan with the best odds and book per (market, outcome), and the implied probability
+             sum and arbitrage flag per market.
+    """
+    prices = as_float_array(prices, "Odds must be numeric values.")
+    if prices.ndim != 3:
+        raise ValueError("prices must be a (market, outcome, book) array.")
+    _check_prices(prices)
+    best_odds, best_book = best_prices(prices)
+    implied_sum = (1.0 / best_odds).sum(axis=1)
+    return ArbitrageScan(best_odds, best_book, implied_sum, implied_sum < 1)
+
+
+def arbitrage_stakes(best_odds, target_payout=1.0):
+    """
+    Split stakes over the outcomes of a market so that every outcome pays the same amount.
+
+    :param best_odds: Best decimal odds of each outcome of the market(s), outcomes on the last axis.
+    :param target_payout: Amount returned whichever outcome wins.
+    :return: Tuple (stakes per outcome, profit per market); the profit is negative unless the market is an arbitrage.
+    """
+    stakes = target_payout / np.asarray(best_odds, dtype=np.float64)
+    return stakes, target_payout - stakes.sum(axis=-1)
+
+
+class ArbitrageScanner:
+    def __init__(self, prices):
+        """
+        Initialize the scanner with a full (market, outcome, book) price tensor.
+
+        The best price per (market, outcome) and the implied sum per market are kept up to date on every
+        price update, recomputing only the market that changed.
+
+        :param prices: (markets, outcomes, books) array of decimal odds, NaN where a book has no price.
+        """
+        scan = scan_arbitrage(prices)
+        self.prices = np.array(prices, dtype=np.float64)
+        self.best_odds = scan.best_odds
+        self.best_book = scan.best_book
+        self.implied_sum = scan.implied_sum
+
+    @property
+    def is_arbitrage(self):
+        return self.implied_sum < 1
+
+    def opportunities(self):
+        """
+        :return: Indices of the markets that currently are arbitrages.
+        """
+        return np.flatnonzero(self.is_arbitrage)
+
+    def stakes(self, market, target_payout=1.0):
+        """
+        Stake split of one market for a target payout.
+
+        :return: Tuple (stakes per outcome, best book per outcome, profit).
+        """
+        stakes, profit = arbitrage_stakes(self.best_odds[market], target_payout)
+        return stakes, self.best_book[market], profit
+
+    def update(self, market, outcome, book, price):
+        """
+        Apply one price tick and maintain the best-price index of the affected market.
+
+        Only the (market, outcome) row is rescanned, and only when the tick lowers or withdraws the current best price.
+
+        :param market: Market index.
+        :param outcome: Outcome index.
+        :param book: Book index.
+        :param price: New decimal odds, or NaN to withdraw the price.
+        :return: True if the market is an arbitrage after the update.
+        """
+        price = float(price)
+        if not (price > 1 or np.isnan(price)):
+            raise ValueError(ODDS_MESSAGE)
+        self.prices[market, outcome, book] = price
+
+        best = self.best_odds[market, outcome]
+        if self.best_book[market, outcome] == book:
+            if price >= best:
+                self.best_odds[market, outcome] = price
+            else:
+                row_odds, row_book = best_prices(self.prices[market, outcome])
+                self.best_odds[market, outcome] = row_odds
+                self.best_book[market, outcome] = row_book
+        elif price > best or (np.isnan(best) and not np.isnan(price)):
+            self.best_odds[market, outcome] = price
+            self.best_book[market, outcome] = book
+
+        self.implied_sum[market] = (1.0 / self.best_odds[market]).sum()
+        return bool(self.implied_sum[market] < 1)
+
+    def update_many(self, markets, outcomes, books, prices):
+        """
+        Apply a batch of price ticks, rescanning each affected market once.
+
+        Later ticks win when the same price is updated twice.
+
+        :param markets: Market indices.
+        :param outcomes: Outcome indices.
+        :param books: Book indices.
+        :param prices: New decimal odds, NaN to withdraw a price.
+        :return: Indices of the affected markets that are arbitrages after the update.
+        """
+        prices = as_float_array(prices, "Odds must be numeric values.")
+        _check_prices(prices)
+        markets = np.asarray(markets)
+        self.prices[markets, np.asarray(outcomes), np.asarray(books)] = prices
+
+        affected = np.unique(markets)
+        best_odds, best_book = best_prices(self.prices[affected])
+        self.best_odds[affected] = best_odds
+        self.best_book[affected] = best_book
+        self.implied_sum[affected] = (1.0 / best_odds).sum(axis=1)
+        return affected[self.implied_sum[affected] < 1]
@@ -0,0 +1,221 @@
+"""
+Backtesting of an EV betting strategy over historical bet logs streamed from disk in bounded-memory chunks.
+
+A bet log has one row per selection, with every market stored in contiguous rows, and the columns:
+
+- ``market_id``: market identifier.
+- ``odds``: decimal odds available for the selection.
+- ``result``: 1 if the selection won, 0 otherwise.
+- ``probability``: the model's probability of the selection winning. If absent, the probability is taken
+  from the de-vigged ``sharp_odds`` column instead.
+- ``closing_odds`` (optional): closing decimal odds, de-vigged to measure closing line value (CLV).
+
+Stakes are sized with kelly_criterion_batch on the initial bankroll (flat, non-compounding staking), so the
+results do not depend on the chunk size.
+"""
+import csv
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from .bankroll_management import kelly_criterion_batch
+from .devig import calculate_true_odds_batch, market_offsets
+from .probability import calculate_ev_percentage_batch
+from .validation import validate_bankroll, validate_multiplier
+
+NUMERIC_COLUMNS = ('odds', 'result', 'probability', 'sharp_odds', 'closing_odds')
+
+BacktestResult = namedtuple('BacktestResult', ['n_selections', 'n_bets', 'wins', 'staked', 'pnl', 'expected_pnl',
+                                               'roi', 'yield_', 'clv'])
+
+
+def read_csv_chunks(path, chunk_size=100000):
+    """
+    Stream a CSV bet log as dicts of NumPy arrays of at most chunk_size rows.
+
+    :param path: Path to a CSV file with a header row.
+    :param chunk_size: Maximum number of rows per chunk.
+    :return: Generator of {column: ndarray} dicts; the columns in NUMERIC_COLUMNS are float64.
+    """
+    with open(path, newline='') as handle:
+        reader = csv.reader(handle)
+        header = next(reader)
+        rows = []
+        for row in reader:
+            rows.append(row)
+            if len(rows) == chunk_size:
+                yield _columns(header, rows)
+                rows = []
+        if rows:
+            yield _columns(header, rows)
+
+
+def _columns(header, rows):
+    chunk = {}
+    for name, values in zip(header, zip(*rows)):
+        chunk[name] = np.array(values, dtype=np.float64 if name in NUMERIC_COLUMNS else None)
+    return chunk
+
+
+def read_parquet_chunks(path, chunk_size=100000):
+    """
+    Stream a Parquet bet log as dicts of NumPy arrays of at most chunk_size rows.
+
+    Requires pyarrow.
+
+    :param path: Path to a Parquet file.
+    :param chunk_size: Maximum number of rows per chunk.
+    :return: Generator of {column: ndarray} dicts.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required to read Parquet files.")
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield {name: column.to_numpy(zero_copy_only=False) for name, column in zip(batch.schema.names, batch.columns)}
+
+
+def read_bet_log(path, chunk_size=100000):
+    """
+    Stream a CSV or Parquet bet log, chosen by file extension.
+
+    :param path: Path to a .csv or .parquet file.
+    :param chunk_size: Maximum number of rows per chunk.
+    :return: Generator of {column: ndarray} dicts.
+    """
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == '.csv':
+        return read_csv_chunks(path, chunk_size)
+    if extension in ('.parquet', '.pq'):
+        return read_parquet_chunks(path, chunk_size)
+    raise ValueError("Unsupported bet log format. Use a .csv or .parquet file.")
+
+
+class Backtest:
+    def __init__(self, bankroll, multiplier=1.0, min_ev=0.0, method='proportional', tax_rate=0):
+        """
+        Initialize an incremental backtest.
+
+        :param bankroll: Bankroll used to size every bet.
+        :param multiplier: Kelly multiplier, between 0 (exclusive) and 1 (inclusive).
+        :param min_ev: Only bets with an expected value above this threshold are placed.
+        :param method: De-vig method for the sharp and closing odds, see calculate_true_odds_batch.
+        :param tax_rate: Tax rate as a percentage applied when de-vigging (default: 0).
+        """
+        validate_bankroll(bankroll)
+        validate_multiplier(multiplier)
+        self.bankroll = bankroll
+        self.multiplier = multiplier
+        self.min_ev = min_ev
+        self.method = method
+        self.tax_rate = tax_rate
+
+        self.n_selections = 0
+        self.n_bets = 0
+        self.wins = 0
+        self.staked = 0.0
+        self.pnl = 0.0
+        self.expected_pnl = 0.0
+        self.clv_staked = 0.0
+        self.clv_sum = 0.0
+        self._pending = None
+
+    def update(self, chunk):
+        """
+        Process one chunk of the bet log. The last market of the chunk is held back until the next chunk
+        shows it is complete, since it may continue there.
+
+        :param chunk: Dict of column arrays.
+        """
+        if self._pending is not None:
+            chunk = {name: np.concatenate((self._pending[name], np.asarray(values)))
+                     for name, values in chunk.items()}
+        if not len(chunk['market_id']):
+            return
+        complete = market_offsets(chunk['market_id'])[-2]
+        self._pending = {name: values[complete:] for name, values in chunk.items()}
+        if complete:
+            self._process({name: values[:complete] for name, values in chunk.items()})
+
+    def finish(self):
+        """
+        Process the held-back last market and return the result.
+
+        :return: BacktestResult.
+        """
+        if self._pending is not None and len(self._pending['market_id']):
+            self._process(self._pending)
+        self._pending = None
+        return self.result()
+
+    def result(self):
+        """
+        Summarize the bets processed so far.
+
+        :return: BacktestResult with the P&L, ROI on the bankroll, yield on turnover and stake-weighted CLV.
+        """
+        return BacktestResult(
+            n_selections=self.n_selections,
+            n_bets=self.n_bets,
+            wins=self.wins,
+            staked=self.staked,
+            pnl=self.pnl,
+            expected_pnl=self.expected_pnl,
+            roi=self.pnl / self.bankroll,
+            yield_=self.pnl / self.staked if self.staked else float('nan'),
+            clv=self.clv_sum / self.clv_staked if self.clv_staked else float('nan'),
+        )
+
+    def _fair_probability(self, market_ids, odds):
+        return calculate_true_odds_batch(odds, market_ids=market_ids, tax_rate=self.tax_rate,
+                                         method=self.method).adjusted_probability
+
+    def _process(self, chunk):
+        market_ids = chunk['market_id']
+        odds = np.asarray(chunk['odds'], dtype=np.float64)
+        won = np.asarray(chunk['result'], dtype=np.float64) > 0
+
+        if 'probability' in chunk:
+            probability = np.asarray(chunk['probability'], dtype=np.float64)
+        elif 'sharp_odds' in chunk:
+            probability = self._fair_probability(market_ids, chunk['sharp_odds'])
+        else:
+            raise ValueError("The bet log needs a 'probability' or a 'sharp_odds' column.")
+
+        ev = calculate_ev_percentage_batch(odds, probability, errors='nan')
+        stake = kelly_criterion_batch(self.bankroll, probability, odds, self.multiplier, errors='nan')
+        bet = (ev > self.min_ev) & (stake > 0)
+        stake, odds, ev, won = stake[bet], odds[bet], ev[bet], won[bet]
+        pnl = np.where(won, stake * (odds - 1), -stake)
+
+        self.n_selections += len(market_ids)
+        self.n_bets += int(bet.sum())
+        self.wins += int(won.sum())
+        self.staked += float(stake.sum())
+        self.pnl += float(pnl.sum())
+        self.expected_pnl += float((stake * ev).sum())
+
+        if 'closing_odds' in chunk:
+            closing = self._fair_probability(market_ids, chunk['closing_odds'])[bet]
+            clv = odds * closing - 1
+            self.clv_sum += float((stake * clv).sum())
+            self.clv_staked += float(stake.sum())
+
+
+def run_backtest(source, bankroll, chunk_size=100000, **kwargs):
+    """
+    Run a backtest over a whole bet log with memory bounded by the chunk size.
+
+    :param source: Path to a .csv or .parquet bet log, or an iterable of column dict chunks.
+    :param bankroll: Bankroll used to size every bet.
+    :param chunk_size: Rows read per chunk when source is a path.
+    :param kwargs: Further Backtest arguments (multiplier, min_ev, method, tax_rate).
+    :return: BacktestResult.
+    """
+    chunks = read_bet_log(source, chunk_size) if isinstance(source, (str, os.PathLike)) else source
+    backtest = Backtest(bankroll, **kwargs)
+    for chunk in chunks:
+        backtest.update(chunk)
+    return backtest.finish()
@@ -1,6 +1,18 @@
-from decimal import Decimal, InvalidOperation
+from .instrumentation import instrument
+from .lazy import lazy_import
+from .precision import resolve_precision, to_number
+from .validation import (
+    BANKROLL_MESSAGE, MULTIPLIER_MESSAGE, ODDS_MESSAGE, PROBABILITY_MESSAGE, TRUE_ODDS_MESSAGE,
+    as_float_array, bankroll_mask, check_errors, flag_invalid, multiplier_mask, odds_mask, probability_mask,
+    validate_bankroll, validate_input_type, validate_multiplier, validate_odds, validate_probability,
+    validate_true_odds,
+)
 
-def kelly_criterion(bankroll, win_input, odds, multiplier=1.0, input_type='probability'):
+np = lazy_import('numpy')
+
+
+@instrument('kelly_criterion')
+def kelly_criterion(bankroll, win_input, odds, multiplier=1.0, input_type='probability', precision=None):
     """
     Calculate the optimal bet size using the Kelly Criterion, with an optional multiplier to adjust the bet size.
     This function allows using either the estimated probability of winning or the true odds (in decimal) as input.
@@ -11,42 +23,35 @@ def kelly_criterion(bankroll, win_input, odds, multiplier=1.0, input_type='proba
     :param multiplier: A multiplier to adjust the fraction of the bankroll to bet according to Kelly's suggestion.
                        A value of 1.0 uses the full Kelly bet; less than 1.0 uses a more conservative approach.
     :param input_type: 'probability' if win_input is the probability of winning, 'true_odds' if win_input is true odds.
-    :return: The recommended bet size.
-    """
-    
-    try:        
-        bankroll = Decimal(bankroll)
-        win_input = Decimal(win_input)
-        odds = Decimal(odds)
-        multiplier = Decimal(multiplier)
-    except InvalidOperation:
-        raise ValueError("Bankroll, win_input, odds, and multiplier must be convertible to Decimal.")
-    
-    if bankroll <= Decimal('0'):
-        raise ValueError("Bankroll must be a positive value.")
+    :param precision: 'exact' to compute with Decimal, 'fast' to compute with float, None for the package-wide setting.
+    :return: The recommended bet size, as a Decimal or float depending on the precision.
+    """
+    precision = resolve_precision(precision)
 
-    if input_type == 'probability':
-        probability = win_input
-        if not (Decimal('0') <= probability <= Decimal('1')):
-            raise ValueError("Probability must be between 0 and 1, inclusive.")
+    try:
+        bankroll = to_number(bankroll, precision)
+        win_input = to_number(win_input, precision)
+        odds = to_number(odds, precision)
+        multiplier = to_number(multiplier, precision)
+    except ValueError:
+        raise ValueError("Bankroll, win_input, odds, and multiplier must be numeric values.")
 
-    elif input_type == 'true_odds':
-        true_odds = win_input
-        if true_odds <= Decimal('1'):
-            raise ValueError("True odds must be greater than 1.")
-        probability = Decimal('1') / true_odds
+    validate_bankroll(bankroll)
+    validate_input_type(input_type)
 
+    if input_type == 'probability':
+        probability = win_input
+        validate_probability(probability)
     else:
-        raise ValueError("input_type must be either 'probability' or 'true_odds'.")
-
-    if odds <= Decimal('1'):
-        raise ValueError("Odds must be greater than 1.")
+        true_odds = win_input
+        validate_true_odds(true_odds)
+        probability = 1 / true_odds
 
-    if not (Decimal('0') < multiplier <= Decimal('1')):
-        raise ValueError("Multiplier must be between 0 and 1, exclusive of 0 and inclusive of 1.")
+    validate_odds(odds)
+    validate_multiplier(multiplier)
 
-    b = odds - Decimal('1')  # Converts decimal odds to multiplier
-    q = Decimal('1') - probability
+    b = odds - 1  # Converts decimal odds to multiplier
+    q = 1 - probability
 
     # Calculate the fraction of the bankroll to bet according to Kelly's formula
     kelly_fraction = (b * probability - q) / b
@@ -58,3 +63,223 @@ def kelly_criterion(bankroll, win_input, odds, multiplier=1.0, input_type='proba
     recommended_bet = bankroll * adjusted_bet
 
     return recommended_bet
+
+
+def kelly_criterion_batch(bankroll, win_input, odds, multiplier=1.0, input_type='probability', errors='raise'):
+    """
+    Vectorized Kelly Criterion over whole arrays of bets.
+
+    Inputs are broadcast against each other, validated with array-wide masks and evaluated in float64,
+    so the result matches kelly_criterion up to floating point rounding.
+
+    :param bankroll: Total available bankroll for betting, scalar or array.
+    :param win_input: Estimated probabilities of winning or true odds, based on the input_type.
+    :param odds: Decimal odds of the bets.
+    :param multiplier: Multiplier(s) applied to the Kelly fraction, between 0 (exclusive) and 1 (inclusive).
+    :param input_type: 'probability' if win_input holds probabilities, 'true_odds' if it holds true odds.
+    :param errors: 'raise' to raise a ValueError on the first failed check (same messages as kelly_criterion),
+                   'nan' to return NaN for the invalid rows instead.
+    :return: The recommended bet sizes as a float64 ndarray.
+    """
+    check_errors(errors)
+    validate_input_type(input_type)
+
+    message = "Bankroll, win_input, odds, and multiplier must be numeric values."
+    bankroll, win_input, odds, multiplier = np.broadcast_arrays(
+        as_float_array(bankroll, message),
+        as_float_array(win_input, message),
+        as_float_array(odds, message),
+        as_float_array(multiplier, message),
+    )
+    invalid = np.zeros(bankroll.shape, dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        invalid = flag_invalid(bankroll_mask(bankroll), BANKROLL_MESSAGE, errors, invalid)
+
+        if input_type == 'probability':
+            probability = win_input
+            invalid = flag_invalid(probability_mask(probability), PROBABILITY_MESSAGE, errors, invalid)
+        else:
+            invalid = flag_invalid(odds_mask(win_input), TRUE_ODDS_MESSAGE, errors, invalid)
+            probability = 1.0 / win_input
+
+        invalid = flag_invalid(odds_mask(odds), ODDS_MESSAGE, errors, invalid)
+        invalid = flag_invalid(multiplier_mask(multiplier), MULTIPLIER_MESSAGE, errors, invalid)
+
+        b = odds - 1.0
+        q = 1.0 - probability
+        kelly_fraction = (b * probability - q) / b
+        recommended_bet = np.asarray(bankroll * (kelly_fraction * multiplier), dtype=np.float64)
+
+    if invalid.any():
+        recommended_bet[invalid] = np.nan
+    return recommended_bet
+
+
+def _portfolio_inputs(bankroll, win_input, odds, multiplier, input_type):
+    """
+    Validate the inputs of the portfolio Kelly solvers with the same rules as kelly_criterion.
+
+    :return: Tuple (bankroll, probabilities, odds, multiplier) with 1-D float64 arrays of probabilities and odds.
+    """
+    validate_input_type(input_type)
+    try:
+        bankroll = float(bankroll)
+        multiplier = float(multiplier)
+    except (TypeError, ValueError):
+        raise ValueError("Bankroll, win_input, odds, and multiplier must be numeric values.")
+    validate_bankroll(bankroll)
+    validate_multiplier(multiplier)
+
+    message = "Bankroll, win_input, odds, and multiplier must be numeric values."
+    win_input = as_float_array(win_input, message).reshape(-1)
+    odds = as_float_array(odds, message).reshape(-1)
+    if len(win_input) != len(odds):
+        raise ValueError("win_input and odds must have the same length.")
+
+    invalid = np.zeros(len(odds), dtype=bool)
+    if input_type == 'probability':
+        probability = win_input
+        flag_invalid(probability_mask(probability), PROBABILITY_MESSAGE, 'raise', invalid)
+    else:
+        flag_invalid(odds_mask(win_input), TRUE_ODDS_MESSAGE, 'raise', invalid)
+        probability = 1.0 / win_input
+    flag_invalid(odds_mask(odds), ODDS_MESSAGE, 'raise', invalid)
+    return bankroll, probability, odds, multiplier
+
+
+def kelly_mutually_exclusive(bankroll, win_input, odds, multiplier=1.0, input_type='probability'):
+    """
+    Calculate Kelly bet sizes for mutually exclusive outcomes of a single market, betting on several at once.
+
+    Uses the exact closed-form allocation: outcomes are added in decreasing order of expected return
+    while their expected return exceeds the reserve rate R = (1 - sum of their probabilities) /
+    (1 - sum of their implied probabilities), and each chosen outcome gets a fraction p - R / odds.
+
+    :param bankroll: Total available bankroll for betting.
+    :param win_input: Estimated probabilities (summing to at most 1) or true odds of the outcomes, based on the input_type.
+    :param odds: Decimal odds of the outcomes.
+    :param multiplier: A multiplier applied to every Kelly fraction, between 0 (exclusive) and 1 (inclusive).
+    :param input_type: 'probability' if win_input holds probabilities, 'true_odds' if it holds true odds.
+    :return: float64 ndarray of recommended bet sizes, zero for outcomes not bet on.
+    """
+    bankroll, probability, odds, multiplier = _portfolio_inputs(bankroll, win_input, odds, multiplier, input_type)
+    if probability.sum() > 1 + 1e-12:
+        raise ValueError("Probabilities of mutually exclusive outcomes must sum to at most 1.")
+
+    order = np.argsort(-probability * odds, kind='stable')
+    p, o = probability[order], odds[order]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reserve = (1 - np.cumsum(p)) / (1 - np.cumsum(1 / o))
+    # An outcome is added while it beats the reserve rate of the outcomes already chosen
+    previous_reserve = np.concatenate(([1.0], reserve[:-1]))
+    admissible = (p * o > previous_reserve) & (np.cumsum(1 / o) < 1)
+    chosen = len(p) if admissible.all() else int(np.argmin(admissible))
+
+    fractions = np.zeros(len(p))
+    if chosen:
+        fractions[:chosen] = p[:chosen] - reserve[chosen - 1] / o[:chosen]
+
+    stakes = np.zeros(len(p))
+    stakes[order] = bankroll * multiplier * np.maximum(fractions, 0.0)
+    return stakes
+
+
+def _maximize_log_growth(returns, weights, tol=1e-10, max_iter=100):
+    """
+    Maximize the expected log growth sum(weights * log(1 + returns @ f)) over f >= 0.
+
+    Uses active-set Newton steps: each step is cut at the first bound it reaches (a fraction
+    hitting zero, or wealth reaching zero in some scenario) and then backtracked until the growth improves.
+
+    :param returns: (scenarios, bets) array of net returns per unit staked.
+    :param weights: Scenario probabilities.
+    :return: Optimal bankroll fractions.
+    """
+    n_bets = returns.shape[1]
+    fractions = np.zeros(n_bets)
+    wealth = np.ones(len(weights))
+    growth = 0.0
+
+    for _ in range(max_iter):
+        gradient = returns.T @ (weights / wealth)
+        free = (fractions > 0) | (gradient > tol)
+        kkt = np.where(fractions > 0, np.abs(gradient), np.maximum(gradient, 0.0))
+        if kkt.max() <= tol:
+            break
+
+        scaled = returns[:, free] * (np.sqrt(weights) / wealth)[:, None]
+        hessian = scaled.T @ scaled + 1e-12 * np.eye(free.sum())
+        direction = np.zeros(n_bets)
+        direction[free] = np.linalg.solve(hessian, gradient[free])
+        wealth_direction = returns @ direction
+
+        # Largest step keeping every fraction non-negative and every scenario's wealth positive
+        step = 1.0
+        shrinking = direction < 0
+        if shrinking.any():
+            step = min(step, (fractions[shrinking] / -direction[shrinking]).min())
+        falling = wealth_direction < 0
+        if falling.any():
+            step = min(step, 0.99 * (wealth[falling] / -wealth_direction[falling]).min())
+
+        slope = gradient @ direction
+        while step > 1e-12:
+            candidate_wealth = wealth + step * wealth_direction
+            candidate_growth = weights @ np.log(candidate_wealth)
+            if candidate_growth >= growth + 1e-4 * step * slope:
+                break
+            step /= 2
+        else:
+            break
+
+        fractions = np.maximum(fractions + step * direction, 0.0)
+        fractions[shrinking & (fractions <= 1e-15)] = 0.0
+        improvement = candidate_growth - growth
+        wealth, growth = candidate_wealth, candidate_growth
+        if improvement <= 1e-15:
+            break
+
+    return fractions
+
+
+def kelly_simultaneous(bankroll, win_input, odds, multiplier=1.0, input_type='probability', max_enumerate=12,
+                       n_samples=10000, seed=None):
+    """
+    Calculate Kelly bet sizes for independent bets placed at the same time.
+
+    Maximizes the expected log growth of the bankroll over the joint outcomes of all bets. With at most
+    max_enumerate bets every one of the 2**n outcomes is enumerated with its exact probability; beyond
+    that n_samples joint outcomes are drawn at random. The outcome where every bet loses gets its exact
+    probability, and the sampled outcomes share the rest.
+
+    :param bankroll: Total available bankroll for betting.
+    :param win_input: Estimated probabilities of winning or true odds of the bets, based on the input_type.
+    :param odds: Decimal odds of the bets.
+    :param multiplier: A multiplier applied to every Kelly fraction, between 0 (exclusive) and 1 (inclusive).
+    :param input_type: 'probability' if win_input holds probabilities, 'true_odds' if it holds true odds.
+    :param max_enumerate: Largest number of bets for which the joint outcomes are enumerated exactly.
+    :param n_samples: Number of sampled joint outcomes when there are more bets than max_enumerate.
+    :param seed: Seed or numpy Generator for the sampled outcomes.
+    :return: float64 ndarray of recommended bet sizes, zero for bets not placed.
+    """
+    bankroll, probability, odds, multiplier = _portfolio_inputs(bankroll, win_input, odds, multiplier, input_type)
+    n_bets = len(odds)
+    if n_bets == 0:
+        return np.zeros(0)
+
+    if n_bets <= max_enumerate:
+        wins = ((np.arange(2 ** n_bets)[:, None] >> np.arange(n_bets)) & 1).astype(bool)
+        weights = np.prod(np.where(wins, probability, 1 - probability), axis=1)
+    else:
+        # The all-lose outcome is rarely sampled but bounds the total stake, so it is added with its exact weight.
+        # Sampled all-lose rows are dropped, leaving draws conditional on at least one win, so it is not counted twice
+        all_lose = np.prod(1 - probability)
+        sampled = np.random.default_rng(seed).random((n_samples, n_bets)) < probability
+        sampled = sampled[sampled.any(axis=1)]
+        wins = np.vstack((np.zeros((1, n_bets), dtype=bool), sampled))
+        weights = np.concatenate(([all_lose], np.full(len(sampled), (1 - all_lose) / max(len(sampled), 1))))
+
+    returns = np.where(wins, odds - 1, -1.0)
+    fractions = _maximize_log_growth(returns, weights)
+    return bankroll * multiplier * fractions
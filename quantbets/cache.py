@@ -0,0 +1,198 @@
+"""
+Size-bounded LRU cache with optional expiry for EV, Kelly and de-vig results of whole markets.
+
+Entries are keyed on (model version, market id, price vector). The price vector is keyed by the bytes of its
+float64 representation, so any price move gives a new key while unchanged prices hit the cache. Model
+probabilities are not part of the key: for a given model version and market they are assumed to be fixed,
+so a model that re-emits new probabilities must do so under a new model version.
+
+Cached arrays are read-only and shared between callers. The cache is safe to use from several threads. A miss
+computes outside the lock, so threads missing the same key at the same time may each compute it once.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from .bankroll_management import kelly_criterion_batch
+from .devig import calculate_true_odds_batch
+from .probability import calculate_ev_percentage_batch
+from .validation import as_float_array
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'expirations', 'invalidations', 'size'])
+
+
+def price_key(odds):
+    """
+    Hashable key of a price vector: the bytes of its float64 representation.
+
+    :param odds: Scalar or array-like of decimal odds.
+    :return: bytes.
+    """
+    return np.ascontiguousarray(as_float_array(odds, "Odds must be numeric values."), dtype=np.float64).tobytes()
+
+
+def _read_only(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _read_only(item)
+    return value
+
+
+class ResultCache:
+    def __init__(self, maxsize=65536, ttl=None, clock=time.monotonic):
+        """
+        Initialize an empty cache.
+
+        :param maxsize: Maximum number of entries; the least recently used entry is evicted beyond it.
+        :param ttl: Seconds an entry stays valid after it is stored, None to keep entries until evicted.
+        :param clock: Function returning the current time in seconds, used for the expiry.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._by_market = {}
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for a key, computing and storing it on a miss.
+
+        Exceptions raised by compute propagate and nothing is stored.
+
+        :param key: Tuple (kind, model_version, market_id, ...) identifying the result.
+        :param compute: Function without arguments computing the value.
+        :return: The cached or computed value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or self.clock() < expires:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                self._remove(key)
+                self._expirations += 1
+            self._misses += 1
+
+        value = _read_only(compute())
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, value)
+            self._by_market.setdefault(key[2], set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+        return value
+
+    def _remove(self, key):
+        del self._entries[key]
+        keys = self._by_market[key[2]]
+        keys.discard(key)
+        if not keys:
+            del self._by_market[key[2]]
+
+    def ev(self, model_version, market_id, odds, probability):
+        """
+        Cached calculate_ev_percentage_batch for the selections of one market.
+
+        :param model_version: Version of the model that produced probability.
+        :param market_id: Market identifier.
+        :param odds: Decimal odds of the market's selections.
+        :param probability: Estimated probabilities of winning, fixed for (model_version, market_id).
+        :return: Read-only float64 ndarray of expected values.
+        """
+        key = ('ev', model_version, market_id, price_key(odds))
+        return self.get_or_compute(key, lambda: calculate_ev_percentage_batch(odds, probability))
+
+    def kelly(self, model_version, market_id, odds, win_input, bankroll, multiplier=1.0, input_type='probability'):
+        """
+        Cached kelly_criterion_batch for the selections of one market.
+
+        :param model_version: Version of the model that produced win_input.
+        :param market_id: Market identifier.
+        :param odds: Decimal odds of the market's selections.
+        :param win_input: Estimated probabilities or true odds, fixed for (model_version, market_id).
+        :param bankroll: Total available bankroll, a scalar.
+        :param multiplier: Kelly multiplier, a scalar.
+        :param input_type: 'probability' or 'true_odds'.
+        :return: Read-only float64 ndarray of recommended bet sizes.
+        """
+        key = ('kelly', model_version, market_id, price_key(odds), float(bankroll), float(multiplier), input_type)
+        return self.get_or_compute(
+            key, lambda: kelly_criterion_batch(bankroll, win_input, odds, multiplier, input_type))
+
+    def true_odds(self, market_id, odds, tax_rate=0, method='proportional'):
+        """
+        Cached calculate_true_odds_batch for one market. De-vigging does not depend on the model, so the
+        entries are stored under model version None.
+
+        :param market_id: Market identifier.
+        :param odds: Decimal odds of the market's selections.
+        :param tax_rate: Tax rate as a percentage (default: 0).
+        :param method: De-vig method, see quantbets.devig.
+        :return: TrueOdds of read-only float64 arrays.
+        """
+        key = ('true_odds', None, market_id, price_key(odds), float(tax_rate), method)
+
+        def compute():
+            prices = as_float_array(odds, "Odds must be numeric values.").reshape(-1)
+            return calculate_true_odds_batch(prices, offsets=[0, len(prices)], tax_rate=tax_rate, method=method)
+
+        return self.get_or_compute(key, compute)
+
+    def invalidate(self, market_id=None, model_version=None):
+        """
+        Drop the entries of a market, of a model version, or of both combined; all entries if neither is given.
+
+        Call it when a market's prices move to release the entries of the old prices right away.
+
+        :param market_id: Market whose entries to drop, None for any market.
+        :param model_version: Model version whose entries to drop, None for any version.
+        :return: Number of entries dropped.
+        """
+        with self._lock:
+            if market_id is not None:
+                keys = list(self._by_market.get(market_id, ()))
+            else:
+                keys = list(self._entries)
+            if model_version is not None:
+                keys = [key for key in keys if key[1] == model_version]
+            for key in keys:
+                self._remove(key)
+            self._invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """
+        Drop all entries and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._by_market.clear()
+            self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
+
+    def stats(self):
+        """
+        Hit, miss, eviction, expiration and invalidation counts since creation or the last clear().
+
+        :return: CacheStats.
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations, self._invalidations,
+                              len(self._entries))
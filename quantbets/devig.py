@@ -0,0 +1,282 @@
+"""
+Vectorized removal of the vigorish over many markets at once.
+
+Markets are given as flat arrays of decimal odds plus either CSR-style ``offsets`` (market ``i`` spans
+``odds[offsets[i]:offsets[i + 1]]``) or a ``market_ids`` array with one id per selection. Nothing is
+written back to the inputs.
+
+Supported methods, with ``pi`` the implied probabilities of one market:
+
+- 'proportional': ``p = pi / sum(pi)``.
+- 'power': ``p = pi ** k``, solving for ``k`` so that the market sums to one.
+- 'logarithmic': the logarithmic-function method, ``log p = k * log pi``; algebraically the same fit as 'power'.
+- 'odds_ratio': ``p / (1 - p) = pi / (1 - pi) / c``, solving for the odds ratio ``c``.
+- 'shin': Shin's model with insider share ``z``,
+  ``p = (sqrt(z ** 2 + 4 * (1 - z) * pi ** 2 / sum(pi)) - z) / (2 * (1 - z))``.
+
+The iterative methods are solved for all markets at once by a safeguarded Newton iteration that falls
+back to bisection whenever a Newton step leaves the current bracket. Converged markets drop out of the
+active set, so later iterations only touch the markets that still need work.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .validation import ODDS_MESSAGE, as_float_array, odds_mask
+
+TrueOdds = namedtuple('TrueOdds', ['market_probability', 'adjusted_probability', 'true_odds'])
+SolverInfo = namedtuple('SolverInfo', ['parameter', 'iterations', 'residual', 'converged'])
+
+METHODS = ('proportional', 'power', 'logarithmic', 'odds_ratio', 'shin')
+
+
+def _segments(size, offsets=None, market_ids=None):
+    """
+    Resolve the market layout into CSR offsets or per-selection market codes.
+
+    :return: Tuple (offsets, codes); exactly one of them is not None.
+    """
+    if (offsets is None) == (market_ids is None):
+        raise ValueError("Provide exactly one of offsets or market_ids.")
+
+    if offsets is not None:
+        offsets = np.asarray(offsets)
+        if (offsets.ndim != 1 or len(offsets) < 2 or not np.issubdtype(offsets.dtype, np.integer)
+                or offsets[0] != 0 or offsets[-1] != size or (np.diff(offsets) <= 0).any()):
+            raise ValueError("offsets must be integers starting at 0, ending at len(odds) and strictly increasing.")
+        return offsets, None
+
+    market_ids = np.asarray(market_ids).reshape(-1)
+    if len(market_ids) != size:
+        raise ValueError("market_ids must have one entry per odds value.")
+    offsets = market_offsets(market_ids)
+    unique_ids, codes = np.unique(market_ids, return_inverse=True)
+    if len(unique_ids) == len(offsets) - 1:
+        # Markets are contiguous runs, the common layout of a feed
+        return offsets, None
+    return None, codes.reshape(-1)
+
+
+def market_offsets(market_ids):
+    """
+    Compute CSR offsets for contiguous runs of equal market ids.
+
+    :param market_ids: Array of market ids, one per selection, with each market stored contiguously.
+    :return: int64 ndarray of offsets, of length number of markets + 1.
+    """
+    market_ids = np.asarray(market_ids).reshape(-1)
+    boundaries = np.flatnonzero(market_ids[1:] != market_ids[:-1]) + 1
+    return np.concatenate(([0], boundaries, [len(market_ids)])).astype(np.int64)
+
+
+def segment_sum(values, offsets=None, codes=None):
+    """
+    Sum values per market.
+
+    :param values: Per-selection values.
+    :param offsets: CSR offsets of the markets.
+    :param codes: Per-selection market codes, used when offsets is None.
+    :return: ndarray with one sum per market.
+    """
+    if offsets is not None:
+        return np.add.reduceat(values, offsets[:-1])
+    return np.bincount(codes, weights=values)
+
+
+def expand(per_market, offsets=None, codes=None):
+    """
+    Broadcast one value per market back to one value per selection.
+    """
+    if offsets is not None:
+        return np.repeat(per_market, np.diff(offsets))
+    return per_market[codes]
+
+
+def _power(pi, k, total):
+    p = pi ** k
+    return p, p * np.log(pi)
+
+
+def _odds_ratio(pi, c, total):
+    denominator = c * (1 - pi) + pi
+    return pi / denominator, -pi * (1 - pi) / denominator ** 2
+
+
+def _shin(pi, z, total):
+    a = 4 * pi ** 2 / total
+    g = np.sqrt(z ** 2 + (1 - z) * a)
+    p = (g - z) / (2 * (1 - z))
+    dg = (2 * z - a) / (2 * g)
+    return p, ((dg - 1) * (1 - z) + (g - z)) / (2 * (1 - z) ** 2)
+
+
+# transform, initial guess, lower and upper bound of the parameter; every market sum decreases in the parameter
+_SOLVERS = {
+    'power': (_power, 1.0, 0.0, np.inf),
+    'logarithmic': (_power, 1.0, 0.0, np.inf),
+    'odds_ratio': (_odds_ratio, 1.0, 0.0, np.inf),
+    'shin': (_shin, 0.0, -np.inf, 1.0),
+}
+
+
+def _solve(method, pi, offsets, tol, max_iter):
+    """
+    Solve every market's de-vig parameter with a batched, safeguarded Newton iteration.
+
+    :return: Tuple (fair probabilities per selection, SolverInfo per market).
+    """
+    transform, initial, lower, upper = _SOLVERS[method]
+    sizes = np.diff(offsets)
+    total = np.add.reduceat(pi, offsets[:-1])
+    n_markets = len(sizes)
+
+    parameter = np.full(n_markets, initial)
+    lo = np.full(n_markets, lower)
+    hi = np.full(n_markets, upper)
+    iterations = np.zeros(n_markets, dtype=np.int64)
+    residual = np.full(n_markets, np.nan)
+    converged = np.zeros(n_markets, dtype=bool)
+
+    active = np.arange(n_markets)
+    active_pi, active_sizes, active_offsets, active_total = pi, sizes, offsets, total
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for iteration in range(max_iter + 1):
+            x = parameter[active]
+            p, dp = transform(active_pi, np.repeat(x, active_sizes), np.repeat(active_total, active_sizes))
+            f = np.add.reduceat(p, active_offsets[:-1]) - 1
+            df = np.add.reduceat(dp, active_offsets[:-1])
+            residual[active] = f
+            done = np.abs(f) <= tol
+            converged[active] = done
+            if done.all() or iteration == max_iter:
+                break
+
+            # Narrow the bracket around the root, then take the Newton step if it stays inside it
+            x_lo = np.where(f > 0, x, lo[active])
+            x_hi = np.where(f < 0, x, hi[active])
+            lo[active], hi[active] = x_lo, x_hi
+            newton = x - f / df
+            fallback = np.where(
+                np.isfinite(x_lo) & np.isfinite(x_hi), 0.5 * (x_lo + x_hi),
+                np.where(np.isinf(x_hi), x_lo + np.maximum(1.0, np.abs(x_lo)),
+                         x_hi - np.maximum(1.0, np.abs(x_hi))))
+            step = np.where(np.isfinite(newton) & (newton > x_lo) & (newton < x_hi), newton, fallback)
+
+            pending = ~done
+            parameter[active[pending]] = step[pending]
+            iterations[active[pending]] += 1
+
+            active = active[pending]
+            active_pi = active_pi[np.repeat(pending, active_sizes)]
+            active_sizes = active_sizes[pending]
+            active_total = active_total[pending]
+            active_offsets = np.concatenate(([0], np.cumsum(active_sizes)))
+
+        fair, _ = transform(pi, np.repeat(parameter, sizes), np.repeat(total, sizes))
+    return fair, SolverInfo(parameter, iterations, residual, converged)
+
+
+def calculate_true_odds_batch(odds, offsets=None, market_ids=None, tax_rate=0, method='proportional',
+                              tol=1e-12, max_iter=100, full_output=False):
+    """
+    Calculate true odds for many markets in one pass by removing the vigorish and applying tax adjustment.
+
+    This is the array counterpart of calculate_true_odds: each market is de-vigged on its own, with
+    segmented sums over the flat odds array. The tax adjustment is applied after de-vigging.
+
+    :param odds: Flat array of decimal odds for all selections of all markets.
+    :param offsets: CSR offsets of the markets, length number of markets + 1.
+    :param market_ids: Alternatively, one market id per selection.
+    :param tax_rate: Tax rate as a percentage (default: 0).
+    :param method: One of 'proportional', 'power', 'logarithmic', 'odds_ratio' or 'shin'.
+    :param tol: Tolerance on each market's summed fair probability for the iterative methods.
+    :param max_iter: Maximum number of solver iterations for the iterative methods.
+    :param full_output: If True, also return a SolverInfo with the fitted parameter, iteration count,
+                        residual (summed fair probability minus one) and convergence flag of each market.
+    :return: TrueOdds of float64 arrays (market_probability, adjusted_probability, true_odds), one value per
+             selection, or a (TrueOdds, SolverInfo) tuple if full_output is True.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}.")
+    odds = as_float_array(odds, "Odds must be numeric values.").reshape(-1)
+    if odds_mask(odds).any():
+        raise ValueError(ODDS_MESSAGE)
+    offsets, codes = _segments(len(odds), offsets, market_ids)
+
+    # Convert decimal odds to implied probabilities and calculate each market percentage
+    market_probability = 1.0 / odds
+
+    if method == 'proportional':
+        # Adjust probabilities for overround
+        market_percentage = segment_sum(market_probability, offsets, codes)
+        fair_probability = market_probability / expand(market_percentage, offsets, codes)
+        n_markets = len(market_percentage)
+        info = SolverInfo(market_percentage, np.zeros(n_markets, dtype=np.int64),
+                          segment_sum(fair_probability, offsets, codes) - 1, np.ones(n_markets, dtype=bool))
+    elif offsets is not None:
+        fair_probability, info = _solve(method, market_probability, offsets, tol, max_iter)
+    else:
+        # The solver works on contiguous markets, so group the selections by market and scatter back
+        order = np.argsort(codes, kind='stable')
+        grouped_offsets = np.concatenate(([0], np.cumsum(np.bincount(codes))))
+        fair_probability = np.empty_like(market_probability)
+        fair_probability[order], info = _solve(method, market_probability[order], grouped_offsets, tol, max_iter)
+
+    # Apply tax adjustment (if any)
+    tax_multiplier = 1 - (tax_rate / 100)
+    adjusted_probability = fair_probability * tax_multiplier
+
+    result = TrueOdds(market_probability, adjusted_probability, 1.0 / adjusted_probability)
+    if full_output:
+        return result, info
+    return result
+
+
+def iter_true_odds(chunks, tax_rate=0, method='proportional'):
+    """
+    Stream true odds market by market as chunks of a feed arrive.
+
+    Each chunk is a ``(market_ids, odds)`` pair. Markets must be contiguous in the stream but may be
+    split across chunk boundaries; the trailing market of a chunk is held back until the next chunk
+    shows it is complete. Complete markets of a chunk are normalized together in one pass. The ids of
+    completed markets are kept, so that a market reappearing later in the stream raises a ValueError.
+
+    :param chunks: Iterable of (market_ids, odds) array pairs.
+    :param tax_rate: Tax rate as a percentage (default: 0).
+    :param method: De-vig method, see calculate_true_odds_batch.
+    :return: Generator of (market_id, TrueOdds) tuples, one per market.
+    """
+    pending_ids = None
+    pending_odds = np.empty(0)
+    closed = set()
+
+    for market_ids, odds in chunks:
+        market_ids = np.asarray(market_ids).reshape(-1)
+        odds = as_float_array(odds, "Odds must be numeric values.").reshape(-1)
+        if len(market_ids) != len(odds):
+            raise ValueError("market_ids must have one entry per odds value.")
+        if pending_ids is not None:
+            market_ids = np.concatenate((pending_ids, market_ids))
+            odds = np.concatenate((pending_odds, odds))
+        if not len(odds):
+            continue
+
+        offsets = market_offsets(market_ids)
+        runs = market_ids[offsets[:-1]].tolist()
+        if len(set(runs)) != len(runs) or not closed.isdisjoint(runs):
+            raise ValueError("market_ids must be contiguous: a market reappears after another market.")
+        closed.update(runs[:-1])
+        complete = offsets[-2]
+        pending_ids, pending_odds = market_ids[complete:], odds[complete:]
+        if complete:
+            yield from _split_markets(market_ids[:complete], odds[:complete], offsets[:-1], tax_rate, method)
+
+    if pending_ids is not None and len(pending_odds):
+        yield from _split_markets(pending_ids, pending_odds, market_offsets(pending_ids), tax_rate, method)
+
+
+def _split_markets(market_ids, odds, offsets, tax_rate, method):
+    result = calculate_true_odds_batch(odds, offsets=offsets, tax_rate=tax_rate, method=method)
+    for start, stop in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+        yield market_ids[start], TrueOdds(*(column[start:stop] for column in result))
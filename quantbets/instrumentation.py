@@ -0,0 +1,222 @@
+"""
+Opt-in instrumentation of the hot paths: call counts, latency histograms and validation failures.
+
+Instrumented functions are wrapped once, when they are defined, so every reference to them is recorded however
+it was imported. The wrapper reads a single module global: while instrumentation is disabled, which is the
+default, it calls straight through. enable() installs a sink that receives one record per call with its latency,
+and one per ValueError raised by validation. InMemorySink aggregates them, and to_prometheus renders the
+aggregate in the Prometheus text exposition format, which start_http_server serves for local scraping.
+"""
+import functools
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+_sink = None
+
+
+class Sink:
+    """
+    Receiver of instrumentation records. Subclasses override the methods for the records they need.
+    """
+
+    def record_call(self, name, seconds):
+        """
+        Called once per instrumented call, including calls that raise.
+
+        :param name: Name of the instrumented function.
+        :param seconds: Wall-clock duration of the call.
+        """
+
+    def record_failure(self, name, message):
+        """
+        Called when an instrumented call raises a ValueError, i.e. its input failed validation.
+
+        :param name: Name of the instrumented function.
+        :param message: Message of the ValueError.
+        """
+
+
+class CallStats:
+    __slots__ = ('count', 'total', 'buckets')
+
+    def __init__(self, n_buckets):
+        self.count = 0
+        self.total = 0.0
+        # One count per bucket, the last one for durations above every bound
+        self.buckets = [0] * (n_buckets + 1)
+
+
+class InMemorySink(Sink):
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Aggregate records in memory.
+
+        :param buckets: Increasing upper bounds of the latency histogram buckets, in seconds.
+        """
+        self.bucket_bounds = tuple(buckets)
+        self.calls = {}
+        self.failures = {}
+        self._lock = threading.Lock()
+
+    def record_call(self, name, seconds):
+        with self._lock:
+            stats = self.calls.get(name)
+            if stats is None:
+                stats = self.calls[name] = CallStats(len(self.bucket_bounds))
+            stats.count += 1
+            stats.total += seconds
+            stats.buckets[bisect_left(self.bucket_bounds, seconds)] += 1
+
+    def record_failure(self, name, message):
+        with self._lock:
+            key = (name, message)
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+    def snapshot(self):
+        """
+        Copy of the aggregates.
+
+        :return: Dict with 'calls' ({name: {'count', 'total', 'buckets'}}) and 'failures' ({(name, message): count}).
+        """
+        with self._lock:
+            calls = {name: {'count': stats.count, 'total': stats.total, 'buckets': list(stats.buckets)}
+                     for name, stats in self.calls.items()}
+            return {'calls': calls, 'failures': dict(self.failures)}
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.failures.clear()
+
+
+def enable(sink=None):
+    """
+    Start recording instrumented calls.
+
+    :param sink: Sink receiving the records, None for a new InMemorySink.
+    :return: The active sink.
+    """
+    global _sink
+    _sink = InMemorySink() if sink is None else sink
+    return _sink
+
+
+def disable():
+    """
+    Stop recording; instrumented functions call straight through again.
+    """
+    global _sink
+    _sink = None
+
+
+def get_sink():
+    """
+    The active sink, None while instrumentation is disabled.
+    """
+    return _sink
+
+
+@contextmanager
+def instrumented(sink=None):
+    """
+    Context manager that enables instrumentation and restores the previous sink on exit.
+
+    :param sink: Sink receiving the records, None for a new InMemorySink.
+    """
+    global _sink
+    previous = _sink
+    try:
+        yield enable(sink)
+    finally:
+        _sink = previous
+
+
+def instrument(name):
+    """
+    Decorator recording calls of a function under the given name while instrumentation is enabled.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            sink = _sink
+            if sink is None:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except ValueError as error:
+                sink.record_failure(name, str(error))
+                raise
+            finally:
+                sink.record_call(name, perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def to_prometheus(sink, prefix='quantbets'):
+    """
+    Render an InMemorySink in the Prometheus text exposition format.
+
+    Call counts are the _count series of the latency histogram.
+
+    :param sink: InMemorySink to export.
+    :param prefix: Prefix of the metric names.
+    :return: The exposition text.
+    """
+    data = sink.snapshot()
+    metric = f'{prefix}_call_duration_seconds'
+    lines = [f'# HELP {metric} Latency of instrumented quantbets calls.', f'# TYPE {metric} histogram']
+    for name, stats in sorted(data['calls'].items()):
+        label = f'function="{_escape(name)}"'
+        cumulative = 0
+        for bound, count in zip(sink.bucket_bounds + (float('inf'),), stats['buckets']):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(float(bound))
+            lines.append(f'{metric}_bucket{{{label},le="{le}"}} {cumulative}')
+        lines.append(f'{metric}_sum{{{label}}} {stats["total"]!r}')
+        lines.append(f'{metric}_count{{{label}}} {stats["count"]}')
+
+    metric = f'{prefix}_validation_failures_total'
+    lines += [f'# HELP {metric} Calls rejected by input validation.', f'# TYPE {metric} counter']
+    for (name, message), count in sorted(data['failures'].items()):
+        lines.append(f'{metric}{{function="{_escape(name)}",message="{_escape(message)}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def start_http_server(port, address='127.0.0.1', sink=None):
+    """
+    Serve the Prometheus exposition of a sink over HTTP from a daemon thread.
+
+    :param port: Port to listen on, 0 for any free port.
+    :param address: Address to bind to.
+    :param sink: InMemorySink to export, None for the sink active at each scrape.
+    :return: The server; call shutdown() to stop it. Its server_address holds the bound port.
+    """
+    # Imported here, as http.server pulls in a large part of the standard library
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            current = sink if sink is not None else _sink
+            body = (to_prometheus(current) if isinstance(current, InMemorySink) else '').encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((address, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
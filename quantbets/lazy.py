@@ -0,0 +1,27 @@
+"""
+Deferred imports of heavy dependencies.
+
+The scalar core (Odds, calculate_ev_percentage, kelly_criterion) must import without NumPy, while the
+vectorized functions in the same modules use it. Those modules bind ``np = lazy_import('numpy')``: the real
+module is imported on the first attribute access, that is, the first time a vectorized path runs. Each
+attribute is then stored on the proxy, so later lookups cost the same as on the module itself.
+"""
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    def __getattr__(self, name):
+        value = getattr(importlib.import_module(self.__name__), name)
+        setattr(self, name, value)
+        return value
+
+
+def lazy_import(name):
+    """
+    Module proxy that imports the named module on first attribute access.
+
+    :param name: Absolute module name, e.g. 'numpy'.
+    :return: LazyModule.
+    """
+    return LazyModule(name)
@@ -0,0 +1,215 @@
+"""
+Bankroll ledger that settles graded bets in vectorized batches and feeds its balance into Kelly sizing.
+
+Bets are stored in growable parallel arrays (stake, odds, status), about 17 bytes per bet, and identified by
+their index. Placing a bet moves its stake from the balance into open exposure. Settling returns
+``stake * odds`` for a win, the stake for a void and nothing for a loss.
+
+Equity is the balance plus open exposure valued at cost. Drawdown is the fractional fall of equity from its
+running peak, ``1 - equity / peak``, as in quantbets.simulation. A settled batch is applied in the given
+order, so the peak and maximum drawdown follow the equity path through the batch, not only its end point.
+
+Kelly sizing uses the balance, the bankroll not tied up in open bets. A drawdown rule maps the current
+drawdown to a factor in [0, 1] that scales the Kelly multiplier, so stakes shrink as the drawdown grows.
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+from .bankroll_management import kelly_criterion_batch
+from .validation import (
+    BANKROLL_MESSAGE, MULTIPLIER_MESSAGE, ODDS_MESSAGE, as_float_array, bankroll_mask, odds_mask,
+    validate_bankroll, validate_multiplier,
+)
+
+# Bet status codes; settle() takes LOST, WON or VOID as results
+OPEN, LOST, WON, VOID = 0, 1, 2, 3
+
+
+def linear_drawdown_rule(limit):
+    """
+    Drawdown rule that scales the multiplier down linearly, from 1 with no drawdown to 0 at the limit.
+
+    :param limit: Drawdown, between 0 (exclusive) and 1 (inclusive), at which betting stops.
+    :return: Function mapping a drawdown to a multiplier factor.
+    """
+    if not 0 < limit <= 1:
+        raise ValueError("limit must be between 0 and 1, exclusive of 0 and inclusive of 1.")
+    return lambda drawdown: max(0.0, 1.0 - drawdown / limit)
+
+
+def step_drawdown_rule(thresholds, factors):
+    """
+    Drawdown rule that applies factors[i] once the drawdown reaches thresholds[i], and 1 below the first threshold.
+
+    :param thresholds: Increasing drawdown levels.
+    :param factors: Multiplier factor in [0, 1] for each level.
+    :return: Function mapping a drawdown to a multiplier factor.
+    """
+    thresholds = [float(threshold) for threshold in thresholds]
+    factors = [1.0] + [float(factor) for factor in factors]
+    if len(factors) != len(thresholds) + 1:
+        raise ValueError("thresholds and factors must have the same length.")
+    if any(later <= earlier for earlier, later in zip(thresholds, thresholds[1:])):
+        raise ValueError("thresholds must be increasing.")
+    if not all(0 <= factor <= 1 for factor in factors):
+        raise ValueError("factors must be between 0 and 1, inclusive.")
+    return lambda drawdown: factors[bisect_right(thresholds, drawdown)]
+
+
+class BankrollLedger:
+    def __init__(self, bankroll, capacity=1024):
+        """
+        Initialize the ledger with a starting bankroll and no bets.
+
+        :param bankroll: Starting bankroll, positive.
+        :param capacity: Number of bets to allocate storage for up front; storage grows as needed.
+        """
+        bankroll = float(bankroll)
+        validate_bankroll(bankroll)
+        self.balance = bankroll
+        self.open_exposure = 0.0
+        self.peak = bankroll
+        self.max_drawdown = 0.0
+        self.n_bets = 0
+        self.n_open = 0
+        self._stake = np.empty(capacity, dtype=np.float64)
+        self._odds = np.empty(capacity, dtype=np.float64)
+        self._status = np.empty(capacity, dtype=np.int8)
+
+    @property
+    def equity(self):
+        """
+        Balance plus the stakes of the open bets.
+        """
+        return self.balance + self.open_exposure
+
+    @property
+    def drawdown(self):
+        """
+        Current fractional drawdown of equity from its peak.
+        """
+        return 1.0 - self.equity / self.peak
+
+    @property
+    def stakes(self):
+        return self._stake[:self.n_bets]
+
+    @property
+    def odds(self):
+        return self._odds[:self.n_bets]
+
+    @property
+    def status(self):
+        """
+        Status code of every bet: OPEN, LOST, WON or VOID.
+        """
+        return self._status[:self.n_bets]
+
+    def _reserve(self, n):
+        needed = self.n_bets + n
+        if needed <= len(self._stake):
+            return
+        capacity = max(needed, 2 * len(self._stake))
+        for name in ('_stake', '_odds', '_status'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.n_bets] = old[:self.n_bets]
+            setattr(self, name, new)
+
+    def place(self, stakes, odds):
+        """
+        Record new open bets and move their stakes from the balance into open exposure.
+
+        :param stakes: Positive stakes, scalar or array.
+        :param odds: Decimal odds of the bets, broadcast against stakes.
+        :return: int64 ndarray of the ids of the new bets.
+        """
+        stakes, odds = np.broadcast_arrays(as_float_array(stakes, "Stakes must be numeric values."),
+                                           as_float_array(odds, "Odds must be numeric values."))
+        stakes, odds = stakes.reshape(-1), odds.reshape(-1)
+        if bankroll_mask(stakes).any() or not np.isfinite(stakes).all():
+            raise ValueError("Stakes must be positive values.")
+        if odds_mask(odds).any():
+            raise ValueError(ODDS_MESSAGE)
+        total = float(stakes.sum())
+        if total > self.balance:
+            raise ValueError("Stakes exceed the available balance.")
+
+        self._reserve(len(stakes))
+        ids = np.arange(self.n_bets, self.n_bets + len(stakes))
+        self._stake[ids] = stakes
+        self._odds[ids] = odds
+        self._status[ids] = OPEN
+        self.n_bets += len(stakes)
+        self.n_open += len(stakes)
+        self.balance -= total
+        self.open_exposure += total
+        return ids
+
+    def settle(self, bet_ids, results):
+        """
+        Settle a batch of open bets in one vectorized update.
+
+        :param bet_ids: Ids of open bets, each at most once per batch, in settlement order.
+        :param results: Result code of each bet (LOST, WON or VOID), broadcast against bet_ids.
+        :return: float64 ndarray of the profit or loss of each settled bet.
+        """
+        bet_ids = np.asarray(bet_ids).reshape(-1)
+        if not len(bet_ids):
+            # np.asarray([]) is float64, so an empty batch would fail the dtype checks below
+            return np.empty(0)
+        if not np.issubdtype(bet_ids.dtype, np.integer):
+            raise ValueError("bet_ids must be integers.")
+        bet_ids = bet_ids.astype(np.int64)
+        results = np.broadcast_to(np.asarray(results), bet_ids.shape)
+        if ((bet_ids < 0) | (bet_ids >= self.n_bets)).any():
+            raise ValueError("Unknown bet id.")
+        if not (np.issubdtype(results.dtype, np.integer) and ((results >= LOST) & (results <= VOID)).all()):
+            raise ValueError("Results must be LOST, WON or VOID.")
+        ordered = np.sort(bet_ids)
+        if (self._status[bet_ids] != OPEN).any() or (ordered[1:] == ordered[:-1]).any():
+            raise ValueError("Bets must be open and settled once.")
+
+        stakes = self._stake[bet_ids]
+        payout = np.where(results == WON, stakes * self._odds[bet_ids], np.where(results == VOID, stakes, 0.0))
+        profit = payout - stakes
+        self._status[bet_ids] = results
+
+        # Equity path through the batch, for the peak-to-trough drawdown
+        equity = self.equity + np.cumsum(profit)
+        peak = np.maximum.accumulate(np.concatenate(([self.peak], equity)))[1:]
+        self.max_drawdown = max(self.max_drawdown, float((1.0 - equity / peak).max()))
+        self.peak = float(peak[-1])
+        self.balance += float(payout.sum())
+        self.open_exposure -= float(stakes.sum())
+        self.n_open -= len(bet_ids)
+        if not self.n_open:
+            # Re-anchor the running sum, so that rounding drift does not leave phantom exposure
+            self.open_exposure = 0.0
+        return profit
+
+    def size(self, win_input, odds, multiplier=1.0, input_type='probability', drawdown_rule=None, errors='raise'):
+        """
+        Kelly stakes for new bets from the current balance, see kelly_criterion_batch.
+
+        :param win_input: Estimated probabilities of winning or true odds, based on the input_type.
+        :param odds: Decimal odds of the bets.
+        :param multiplier: Kelly multiplier, between 0 (exclusive) and 1 (inclusive).
+        :param input_type: 'probability' or 'true_odds'.
+        :param drawdown_rule: Function mapping the current drawdown to a factor in [0, 1] applied to the
+                              multiplier, e.g. linear_drawdown_rule(0.3); None to ignore the drawdown.
+        :param errors: 'raise' or 'nan', see kelly_criterion_batch.
+        :return: float64 ndarray of recommended stakes; zero when the rule stops betting, and negative where the
+                 bet has negative expected value, as for kelly_criterion_batch.
+        """
+        validate_multiplier(multiplier)
+        factor = 1.0 if drawdown_rule is None else drawdown_rule(self.drawdown)
+        if not 0 <= multiplier * factor <= 1:
+            raise ValueError(MULTIPLIER_MESSAGE)
+        if self.balance <= 0:
+            raise ValueError(BANKROLL_MESSAGE)
+        # Stakes are linear in the multiplier. Sizing at the unscaled one validates the inputs even when the rule
+        # stops betting
+        stakes = kelly_criterion_batch(self.balance, win_input, odds, multiplier, input_type, errors)
+        return stakes if factor == 1 else stakes * factor
@@ -0,0 +1,184 @@
+"""
+Stateful market that keeps de-vigged prices, EV and stakes current as individual prices tick.
+
+Proportional de-vig divides each implied probability 1 / odds by the market's overround S, the sum of all
+implied probabilities. A tick on one selection changes S by a single difference, so it is applied in O(1)
+without re-summing the market. EV and Kelly stakes depend only on a selection's own odds and model probability,
+so a tick recomputes them for the ticked selection alone. Values that depend on S (fair probabilities, and the
+EV and stakes of selections without a model probability) are derived on access.
+"""
+import math
+
+from .precision import to_number
+from .validation import validate_bankroll, validate_multiplier, validate_odds, validate_probability
+
+_UNSET = object()
+
+
+class Market:
+    def __init__(self, odds, probabilities=None, bankroll=1.0, multiplier=1.0, tax_rate=0, resum_interval=1000):
+        """
+        Initialize the market.
+
+        :param odds: Mapping of selection to decimal odds.
+        :param probabilities: Mapping of selection to the bettor's estimated probability of winning. Selections
+                              without one are evaluated at their de-vigged fair probability.
+        :param bankroll: Bankroll used for Kelly staking.
+        :param multiplier: Kelly multiplier, between 0 (exclusive) and 1 (inclusive).
+        :param tax_rate: Tax rate as a percentage (default: 0), applied after de-vigging.
+        :param resum_interval: Number of ticks after which the overround is re-summed exactly, bounding the
+                               rounding drift of the running sum.
+        """
+        bankroll = to_number(bankroll, 'fast')
+        multiplier = to_number(multiplier, 'fast')
+        validate_bankroll(bankroll)
+        validate_multiplier(multiplier)
+        self.bankroll = bankroll
+        self.multiplier = multiplier
+        self.tax_multiplier = 1 - (tax_rate / 100)
+        self.resum_interval = resum_interval
+        self.ticks = 0
+
+        self._odds = {}
+        self._implied = {}
+        self._estimates = {}
+        self._ev = {}
+        self._stake = {}
+        self._overround = 0.0
+        probabilities = probabilities or {}
+        for selection, price in odds.items():
+            self.tick(selection, price, probabilities.get(selection))
+        self.resum()
+
+    def __len__(self):
+        return len(self._odds)
+
+    def __contains__(self, selection):
+        return selection in self._odds
+
+    @property
+    def selections(self):
+        return list(self._odds)
+
+    @property
+    def overround(self):
+        """
+        Sum of the implied probabilities of all selections.
+        """
+        return self._overround
+
+    def tick(self, selection, odds, probability=_UNSET):
+        """
+        Apply a price change, adding the selection if it is new.
+
+        :param selection: Selection whose price changed.
+        :param odds: New decimal odds.
+        :param probability: New estimated probability of winning, None to evaluate at the fair probability.
+                            Left unchanged when omitted.
+        """
+        odds = to_number(odds, 'fast')
+        validate_odds(odds)
+        if probability is not _UNSET:
+            self._set_estimate(selection, probability)
+
+        implied = 1 / odds
+        self._overround += implied - self._implied.get(selection, 0.0)
+        self._odds[selection] = odds
+        self._implied[selection] = implied
+        self._reprice(selection)
+        self._count_tick()
+
+    def set_probability(self, selection, probability):
+        """
+        Update the estimated probability of winning of one selection.
+
+        :param probability: New estimated probability, None to evaluate at the fair probability.
+        """
+        if selection not in self._odds:
+            raise KeyError(selection)
+        self._set_estimate(selection, probability)
+        self._reprice(selection)
+
+    def remove(self, selection):
+        """
+        Remove a selection from the market, e.g. when it is withdrawn.
+        """
+        self._overround -= self._implied.pop(selection)
+        del self._odds[selection]
+        self._estimates.pop(selection, None)
+        self._ev.pop(selection, None)
+        self._stake.pop(selection, None)
+        self._count_tick()
+
+    def resum(self):
+        """
+        Recompute the overround exactly from the implied probabilities.
+        """
+        self._overround = math.fsum(self._implied.values())
+
+    def odds(self, selection):
+        return self._odds[selection]
+
+    def fair_probability(self, selection):
+        """
+        De-vigged, tax-adjusted probability of the selection.
+        """
+        return self._implied[selection] / self._overround * self.tax_multiplier
+
+    def true_odds(self, selection):
+        return 1 / self.fair_probability(selection)
+
+    def probability(self, selection):
+        """
+        Estimated probability of the selection, falling back to its fair probability.
+        """
+        estimate = self._estimates.get(selection)
+        return self.fair_probability(selection) if estimate is None else estimate
+
+    def ev(self, selection):
+        """
+        Expected value of a unit bet on the selection, as in calculate_ev_percentage.
+        """
+        if selection in self._ev:
+            return self._ev[selection]
+        return self._compute_ev(self._odds[selection], self.probability(selection))
+
+    def stake(self, selection):
+        """
+        Recommended Kelly stake on the selection, as in kelly_criterion.
+        """
+        if selection in self._stake:
+            return self._stake[selection]
+        return self._compute_stake(self._odds[selection], self.probability(selection))
+
+    def _set_estimate(self, selection, probability):
+        if probability is None:
+            self._estimates.pop(selection, None)
+            return
+        probability = to_number(probability, 'fast')
+        validate_probability(probability)
+        self._estimates[selection] = probability
+
+    def _reprice(self, selection):
+        estimate = self._estimates.get(selection)
+        if estimate is None:
+            # Depends on the overround, derived on access instead
+            self._ev.pop(selection, None)
+            self._stake.pop(selection, None)
+            return
+        odds = self._odds[selection]
+        self._ev[selection] = self._compute_ev(odds, estimate)
+        self._stake[selection] = self._compute_stake(odds, estimate)
+
+    def _compute_ev(self, odds, probability):
+        return (probability * (odds - 1)) - (1 - probability)
+
+    def _compute_stake(self, odds, probability):
+        b = odds - 1
+        kelly_fraction = (b * probability - (1 - probability)) / b
+        return self.bankroll * (kelly_fraction * self.multiplier)
+
+    def _count_tick(self):
+        self.ticks += 1
+        if self.resum_interval and self.ticks % self.resum_interval == 0:
+            self.resum()
@@ -1,102 +1,178 @@
-from decimal import Decimal, InvalidOperation
-from .probability import calculate_ev_percentage
+from decimal import Decimal
+from functools import lru_cache
+
+from .instrumentation import instrument
+from .lazy import lazy_import
+from .precision import resolve_precision, to_number
+from .probability import calculate_ev_percentage, calculate_ev_percentage_batch
+from .validation import ODDS_MESSAGE, as_float_array, validate_odds
+
+np = lazy_import('numpy')
+
+INTERN_CACHE_SIZE = 65536
+
 
 class Odds:
-    def __init__(self, odds, odds_type='decimal'):
+    """
+    Immutable price in decimal, fractional or American format.
+
+    The other formats and the implied probability are computed on first access and cached on the instance.
+    Instances use __slots__, and Odds.interned shares one instance per distinct price through a bounded cache.
+    """
+
+    __slots__ = ('odds', 'odds_type', 'precision', '_decimal_odds', '_fractional', '_american', '_probability')
+
+    @instrument('Odds')
+    def __init__(self, odds, odds_type='decimal', precision=None):
         """
-        Initialize the Odds object with odds and their type. Converts odds to Decimal for precision.
+        Initialize the Odds object with odds and their type. Converts odds to Decimal for precision,
+        or to float when the 'fast' precision mode is selected.
 
         :param odds: The odds value, can be a numeric value for decimal and American odds, or a tuple for fractional odds.
         :param odds_type: The type of the odds ('decimal', 'fractional', 'american').
+        :param precision: 'exact' to compute with Decimal, 'fast' to compute with float, None for the package-wide setting.
         """
         if odds_type.lower() not in ['decimal', 'fractional', 'american']:
             raise ValueError("Unsupported odds type. Use 'decimal', 'fractional', or 'american'.")
+        odds_type = odds_type.lower()
+        precision = resolve_precision(precision)
 
         try:
-            # Convert input odds to Decimal for precision, handling tuples for fractional odds
-            if isinstance(odds, str) or isinstance(odds, (int, float)):
-                odds = Decimal(odds)
-                if odds == Decimal('0'):
-                    raise ValueError("Odds must be a positive value.")
+            # Convert input odds to the backend number type, handling tuples for fractional odds
+            if isinstance(odds, str) or isinstance(odds, (int, float, Decimal)):
+                odds = to_number(odds, precision)
             elif isinstance(odds, tuple):
-                odds = (Decimal(odds[0]), Decimal(odds[1]))
-                if odds[0] <= Decimal('0') or odds[1] <= Decimal('0'):
-                    raise ValueError("Fractional odds must be positive values.")
+                odds = (to_number(odds[0], precision), to_number(odds[1], precision))
             else:
-                raise ValueError("Odds must be a numeric value or a tuple of numeric values for fractional odds.")
-        except (InvalidOperation, TypeError):
+                raise TypeError
+        except (ValueError, TypeError):
             raise ValueError("Invalid odds format or type.")
 
-        self.odds = odds
-        self.odds_type = odds_type.lower()
-        self.decimal_odds = self.to_decimal()  # Convert odds to decimal format for internal calculations
-        
-        if self.decimal_odds <= Decimal('1'):
-            if self.odds_type == 'american':
-                if self.odds == 0:
-                    raise ValueError("American odds cannot be zero.")
-            else:
-                raise ValueError("Odds must be greater than 1.")
+        if isinstance(odds, tuple) != (odds_type == 'fractional'):
+            raise ValueError("Odds must be a numeric value or a tuple of numeric values for fractional odds.")
+        if isinstance(odds, tuple):
+            if odds[0] <= 0 or odds[1] <= 0:
+                raise ValueError("Fractional odds must be positive values.")
+        elif odds == 0:
+            raise ValueError("Odds must be a positive value.")
+
+        set_slot = object.__setattr__
+        set_slot(self, 'odds', odds)
+        set_slot(self, 'odds_type', odds_type)
+        set_slot(self, 'precision', precision)
+        set_slot(self, '_decimal_odds', odds if odds_type == 'decimal' else None)
+        set_slot(self, '_fractional', odds if odds_type == 'fractional' else None)
+        set_slot(self, '_american', odds if odds_type == 'american' else None)
+        set_slot(self, '_probability', None)
+
+        # Fractional and American odds always convert to decimal odds above 1
+        if odds_type == 'decimal':
+            validate_odds(odds)
+
+    @classmethod
+    def interned(cls, odds, odds_type='decimal', precision=None):
+        """
+        Return a shared Odds instance for a price, creating it on first use.
+
+        Instances are kept in a bounded least-recently-used cache keyed by (odds, odds_type, precision);
+        sharing them is safe because Odds objects are immutable.
+
+        :param odds: The odds value, as for Odds.
+        :param odds_type: The type of the odds ('decimal', 'fractional', 'american').
+        :param precision: 'exact', 'fast' or None for the package-wide setting.
+        :return: Odds.
+        """
+        precision = resolve_precision(precision)
+        try:
+            return _interned_odds(odds, odds_type.lower(), precision)
+        except TypeError:
+            # Unhashable input, let the constructor report it
+            return cls(odds, odds_type, precision)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Odds objects are immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Odds objects are immutable.")
+
+    def __reduce__(self):
+        return (Odds, (self.odds, self.odds_type, self.precision))
+
+    @property
+    def decimal_odds(self):
+        """
+        Odds in decimal format, used for all internal calculations.
+        """
+        decimal_odds = self._decimal_odds
+        if decimal_odds is None:
+            decimal_odds = self._convert_to_decimal()
+            object.__setattr__(self, '_decimal_odds', decimal_odds)
+        return decimal_odds
+
+    def _convert_to_decimal(self):
+        if self.odds_type == 'fractional':
+            numerator, denominator = self.odds
+            return numerator / denominator + 1
+        if self.odds > 0:
+            return self.odds / 100 + 1
+        return -100 / self.odds + 1
 
     def to_decimal(self):
         """
         Converts odds to decimal format based on the original odds type.
 
-        :return: Odds in decimal format as a Decimal object.
+        :return: Odds in decimal format as a Decimal object (float in 'fast' precision).
         """
-        if self.odds_type == 'decimal':
-            return self.odds
-        elif self.odds_type == 'fractional':
-            numerator, denominator = self.odds
-            return numerator / denominator + Decimal('1')
-        elif self.odds_type == 'american':
-            if self.odds > 0:
-                return self.odds / Decimal('100') + Decimal('1')
-            else:
-                return Decimal('-100') / self.odds + Decimal('1')
-        else:
-            raise ValueError("Unsupported odds type. Use 'decimal', 'fractional', or 'american'.")
+        return self.decimal_odds
 
     def to_fractional(self):
         """
         Converts the internal decimal odds back to fractional format.
 
-        :return: Odds in fractional format as a tuple of Decimals.
+        :return: Odds in fractional format as a tuple of Decimals (floats in 'fast' precision).
         """
-        if self.odds_type == 'fractional':
-            return self.odds
-        fractional = (self.decimal_odds - Decimal('1')).as_integer_ratio()
-        return (Decimal(fractional[0]), Decimal(fractional[1]))
+        fractional = self._fractional
+        if fractional is None:
+            ratio = (self.decimal_odds - 1).as_integer_ratio()
+            fractional = (to_number(ratio[0], self.precision), to_number(ratio[1], self.precision))
+            object.__setattr__(self, '_fractional', fractional)
+        return fractional
 
     def to_american(self):
         """
         Converts the internal decimal odds to American format.
 
-        :return: Odds in American format as a Decimal.
+        :return: Odds in American format as a Decimal (float in 'fast' precision).
         """
-        if self.odds_type == 'american':
-            return self.odds
-        if self.decimal_odds >= Decimal('2'):
-            return (self.decimal_odds - Decimal('1')) * Decimal('100')
-        else:
-            return Decimal('-100') / (self.decimal_odds - Decimal('1'))
+        american = self._american
+        if american is None:
+            if self.decimal_odds >= 2:
+                american = (self.decimal_odds - 1) * 100
+            else:
+                american = -100 / (self.decimal_odds - 1)
+            object.__setattr__(self, '_american', american)
+        return american
 
     def odds_to_probability(self):
         """
         Calculates the implied probability from the internal decimal odds.
 
-        :return: Implied probability as a Decimal.
+        :return: Implied probability as a Decimal (float in 'fast' precision).
         """
-        return Decimal('1') / self.decimal_odds
+        probability = self._probability
+        if probability is None:
+            probability = 1 / self.decimal_odds
+            object.__setattr__(self, '_probability', probability)
+        return probability
 
     def calculate_ev(self, estimated_probability):
         """
         Calculates the expected value (EV) of a bet based on the internal decimal odds and an estimated probability.
 
         :param estimated_probability: Your estimated probability of the outcome, as a numeric value or string that can be converted to Decimal.
-        :return: The expected value of the bet as a Decimal.
+        :return: The expected value of the bet as a Decimal (float in 'fast' precision).
         """
-        return calculate_ev_percentage(self.decimal_odds, estimated_probability)
+        return calculate_ev_percentage(self.decimal_odds, estimated_probability, precision=self.precision)
 
     def __str__(self):
         """
@@ -114,25 +190,215 @@ class Odds:
                     f"American: {american_str}, Probability: {self.odds_to_probability()}")
         except Exception as e:
             return f"Error converting odds formats: {e}"
-        
-def calculate_true_odds(odds_df, tax_rate=0):
+
+
+@lru_cache(maxsize=INTERN_CACHE_SIZE)
+def _interned_odds(odds, odds_type, precision):
+    return Odds(odds, odds_type, precision)
+
+
+class OddsArray:
+    """
+    Column of prices stored as decimal odds in a contiguous, read-only float64 buffer.
+
+    Conversions are vectorized over the whole column and agree with the scalar Odds results to a
+    relative tolerance of 1e-12 (float64 rounding instead of Decimal arithmetic). Fractional output
+    is reduced over a power-of-ten denominator, so it matches Odds exactly for prices with at most
+    ``decimals`` decimal places.
+    """
+
+    def __init__(self, decimal_odds):
+        """
+        Initialize the OddsArray from decimal odds.
+
+        :param decimal_odds: Array-like of decimal odds, all greater than 1.
+        """
+        decimal_odds = as_float_array(decimal_odds, "Invalid odds format or type.").reshape(-1)
+        if not (decimal_odds > 1).all():
+            raise ValueError(ODDS_MESSAGE)
+        decimal_odds = np.ascontiguousarray(decimal_odds)
+        if decimal_odds.flags.writeable:
+            decimal_odds = decimal_odds.copy()
+            decimal_odds.flags.writeable = False
+        self.decimal_odds = decimal_odds
+
+    @classmethod
+    def from_decimal(cls, odds):
+        """
+        Build an OddsArray from decimal odds.
+
+        :param odds: Array-like of decimal odds.
+        :return: OddsArray.
+        """
+        return cls(odds)
+
+    @classmethod
+    def from_american(cls, odds):
+        """
+        Build an OddsArray from American odds.
+
+        :param odds: Array-like of non-zero American odds.
+        :return: OddsArray.
+        """
+        odds = as_float_array(odds, "Invalid odds format or type.").reshape(-1)
+        if not np.isfinite(odds).all():
+            raise ValueError("Invalid odds format or type.")
+        if (odds == 0).any():
+            raise ValueError("American odds cannot be zero.")
+        with np.errstate(divide='ignore'):
+            decimal_odds = np.where(odds > 0, odds / 100.0 + 1.0, -100.0 / odds + 1.0)
+        return cls(decimal_odds)
+
+    @classmethod
+    def from_fractional(cls, numerators, denominators):
+        """
+        Build an OddsArray from fractional odds given as separate numerator and denominator columns.
+
+        :param numerators: Array-like of positive numerators.
+        :param denominators: Array-like of positive denominators.
+        :return: OddsArray.
+        """
+        message = "Invalid odds format or type."
+        numerators, denominators = np.broadcast_arrays(as_float_array(numerators, message),
+                                                       as_float_array(denominators, message))
+        if not ((numerators > 0) & (denominators > 0)).all():
+            raise ValueError("Fractional odds must be positive values.")
+        return cls(numerators / denominators + 1.0)
+
+    @classmethod
+    def from_strings(cls, values, odds_type=None):
+        """
+        Build an OddsArray from raw price strings, see quantbets.parsing.parse_odds.
+
+        :param values: Sequence of str or bytes, NumPy string array, or a newline-separated bytes buffer.
+        :param odds_type: None to detect the format of each entry, or 'decimal', 'fractional' or 'american'.
+        :return: OddsArray.
+        """
+        from .parsing import parse_odds
+
+        parsed = parse_odds(values, odds_type)
+        if parsed.invalid.any():
+            raise ValueError("Invalid odds format or type.")
+        return cls(parsed.decimal_odds)
+
+    @classmethod
+    def from_odds(cls, odds):
+        """
+        Build an OddsArray from an iterable of Odds objects.
+
+        :param odds: Iterable of Odds.
+        :return: OddsArray.
+        """
+        return cls(np.fromiter((float(o.decimal_odds) for o in odds), dtype=np.float64))
+
+    def to_odds(self):
+        """
+        Converts the column back into scalar Odds objects in decimal format.
+
+        Each value goes through its shortest repr, so 1.91 becomes Decimal('1.91') rather than the exact binary
+        expansion of the float.
+
+        :return: List of Odds.
+        """
+        return [Odds(repr(value)) for value in self.decimal_odds.tolist()]
+
+    def to_decimal(self):
+        """
+        Returns the decimal odds.
+
+        :return: Read-only float64 ndarray of decimal odds.
+        """
+        return self.decimal_odds
+
+    def to_american(self):
+        """
+        Converts the decimal odds to American format.
+
+        :return: float64 ndarray of American odds.
+        """
+        b = self.decimal_odds - 1.0
+        return np.where(self.decimal_odds >= 2.0, b * 100.0, -100.0 / b)
+
+    def to_fractional(self, decimals=6):
+        """
+        Converts the decimal odds to reduced fractional format.
+
+        :param decimals: Number of decimal places of the prices kept in the fraction.
+        :return: Tuple of int64 ndarrays (numerators, denominators).
+        """
+        denominators = np.full(self.decimal_odds.shape, 10 ** decimals, dtype=np.int64)
+        numerators = np.rint((self.decimal_odds - 1.0) * denominators).astype(np.int64)
+        divisor = np.gcd(numerators, denominators)
+        return numerators // divisor, denominators // divisor
+
+    def odds_to_probability(self):
+        """
+        Calculates the implied probabilities from the decimal odds.
+
+        :return: float64 ndarray of implied probabilities.
+        """
+        return 1.0 / self.decimal_odds
+
+    def calculate_ev(self, estimated_probability, errors='raise'):
+        """
+        Calculates the expected value (EV) of each bet from the decimal odds and estimated probabilities.
+
+        :param estimated_probability: Estimated probabilities, scalar or array broadcast against the odds.
+        :param errors: 'raise' or 'nan', see calculate_ev_percentage_batch.
+        :return: float64 ndarray of expected values.
+        """
+        return calculate_ev_percentage_batch(self.decimal_odds, estimated_probability, errors=errors)
+
+    def __len__(self):
+        return len(self.decimal_odds)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Odds(repr(float(self.decimal_odds[index])))
+        return OddsArray(self.decimal_odds[index])
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.decimal_odds
+        return self.decimal_odds.astype(dtype)
+
+    def __repr__(self):
+        return f"OddsArray({self.decimal_odds!r})"
+
+
+@instrument('calculate_true_odds')
+def calculate_true_odds(odds_df, tax_rate=0, method='proportional'):
     """
     Calculate true odds by removing the vigorish (vig) and applying tax adjustment.
 
     Parameters:
     - odds_df (DataFrame): DataFrame containing the odds data. The DataFrame should have a column named 'odds'.
     - tax_rate (float): Tax rate as a percentage (default: 0).
+    - method (str): De-vig method, one of 'proportional' (default), 'power', 'logarithmic', 'odds_ratio' or 'shin'.
+      See quantbets.devig for the definitions.
 
     Returns:
     - DataFrame: Updated DataFrame with true odds calculated.
     """
+    from .devig import METHODS, calculate_true_odds_batch
+
+    # Checked before any column is written, so that a failed call leaves odds_df untouched
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}.")
+    if method != 'proportional':
+        odds = np.asarray(odds_df['odds'], dtype=np.float64)
+        result = calculate_true_odds_batch(odds, offsets=[0, len(odds)], method=method)
 
     # Convert decimal odds to implied probabilities and calculate market percentage
     odds_df['market_probability'] = 1 / odds_df['odds']
-    market_percentage = odds_df['market_probability'].sum()
 
-    # Adjust probabilities for overround
-    odds_df['adjusted_probability'] = odds_df['market_probability'] / market_percentage
+    if method == 'proportional':
+        market_percentage = odds_df['market_probability'].sum()
+
+        # Adjust probabilities for overround
+        odds_df['adjusted_probability'] = odds_df['market_probability'] / market_percentage
+    else:
+        odds_df['adjusted_probability'] = result.adjusted_probability
 
     # Apply tax adjustment (if any)
     tax_multiplier = 1 - (tax_rate / 100)
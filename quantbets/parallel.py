@@ -0,0 +1,272 @@
+"""
+Multi-core evaluation of the batch EV and Kelly functions over very large arrays.
+
+Inputs and outputs live in multiprocessing.shared_memory blocks wrapped as SharedArray. A SharedArray pickles
+as its block name, shape and dtype, so a task sent to a worker process carries only that handle and a
+(start, stop) range. The worker attaches to the blocks, evaluates its range and writes it into the shared
+output. The thread backend skips shared memory altogether and relies on NumPy releasing the GIL inside its
+elementwise loops.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .bankroll_management import kelly_criterion_batch
+from .probability import calculate_ev_percentage_batch
+from .validation import as_float_array, check_errors, validate_input_type
+
+BACKENDS = ('process', 'thread')
+
+# Chunks are kept small enough for their temporaries to stay in cache and for the pool to balance load
+MIN_CHUNK_SIZE = 1 << 16
+MAX_CHUNK_SIZE = 1 << 20
+CHUNKS_PER_WORKER = 4
+
+
+class SharedArray:
+    def __init__(self, shape, dtype=np.float64, name=None):
+        """
+        Create a NumPy array in a new shared-memory block, or attach to an existing block by name.
+
+        The process that creates the block owns it and unlinks it on close.
+
+        :param shape: Shape of the array.
+        :param dtype: NumPy dtype of the array.
+        :param name: Name of an existing block to attach to, None to create one.
+        """
+        dtype = np.dtype(dtype)
+        shape = tuple(np.atleast_1d(shape).tolist())
+        self._owner = name is None
+        if self._owner:
+            self._shm = SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        else:
+            self._shm = SharedMemory(name=name)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def from_array(cls, values):
+        """
+        Copy an array into a new shared-memory block.
+        """
+        values = np.asarray(values)
+        shared = cls(values.shape, values.dtype)
+        shared.array[...] = values
+        return shared
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def close(self):
+        """
+        Release this process's mapping of the block, unlinking it if this process created it.
+        """
+        if self.array is None:
+            return
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __reduce__(self):
+        return SharedArray, (self.array.shape, self.array.dtype.str, self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _chunk(value, start, stop):
+    if isinstance(value, SharedArray):
+        return value.array.reshape(-1)[start:stop]
+    if isinstance(value, np.ndarray) and value.ndim:
+        return value[start:stop]
+    return value
+
+
+def _evaluate_chunk(function, arguments, output, start, stop, kwargs):
+    """
+    Evaluate function over one range of the flattened inputs and write it into the output.
+    """
+    chunks = [_chunk(argument, start, stop) for argument in arguments]
+    error = None
+    try:
+        _chunk(output, start, stop)[...] = function(*chunks, **kwargs)
+    except ValueError as exception:
+        # Keep only the message: the traceback would hold views into the blocks and keep them from closing
+        error = exception.args
+    del chunks
+    for value in (*arguments, output):
+        if isinstance(value, SharedArray) and not value._owner:
+            value.close()
+    if error is not None:
+        raise ValueError(*error)
+
+
+def chunk_size_for(n, n_jobs):
+    """
+    Default number of elements per task for n elements spread over n_jobs workers.
+    """
+    return int(min(max(-(-n // (n_jobs * CHUNKS_PER_WORKER)), MIN_CHUNK_SIZE), MAX_CHUNK_SIZE))
+
+
+class ParallelEvaluator:
+    def __init__(self, n_jobs=None, backend='process', chunk_size=None):
+        """
+        Initialize the evaluator. The worker pool is started on first use and kept until close().
+
+        :param n_jobs: Number of workers, None for the number of CPUs.
+        :param backend: 'process' for a process pool over shared memory, 'thread' for a thread pool.
+        :param chunk_size: Elements per task, None to size chunks from the input length and n_jobs.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend must be one of {', '.join(BACKENDS)}.")
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def calculate_ev_percentage(self, odds, probability, errors='raise', out=None):
+        """
+        Parallel calculate_ev_percentage_batch.
+
+        :param odds: Decimal odds of the bets, scalar, array or SharedArray.
+        :param probability: The bettor's estimated probabilities of winning, broadcast against odds.
+        :param errors: 'raise' to raise a ValueError on the first failed check, 'nan' to return NaN for invalid rows.
+        :param out: Optional float64 ndarray or SharedArray the results are written into.
+        :return: The expected values as a float64 ndarray.
+        """
+        check_errors(errors)
+        return self._map(calculate_ev_percentage_batch, (odds, probability), {'errors': errors}, out,
+                         "Odds and probability must be numeric values.")
+
+    def kelly_criterion(self, bankroll, win_input, odds, multiplier=1.0, input_type='probability', errors='raise',
+                        out=None):
+        """
+        Parallel kelly_criterion_batch.
+
+        :param bankroll: Total available bankroll for betting, scalar, array or SharedArray.
+        :param win_input: The bettor's estimated probabilities of winning or the true odds, based on input_type.
+        :param odds: Decimal odds of the bets.
+        :param multiplier: Multiplier(s) applied to the full Kelly fraction.
+        :param input_type: 'probability' or 'true_odds', applies to every row.
+        :param errors: 'raise' to raise a ValueError on the first failed check, 'nan' to return NaN for invalid rows.
+        :param out: Optional float64 ndarray or SharedArray the results are written into.
+        :return: The recommended bet sizes as a float64 ndarray.
+        """
+        check_errors(errors)
+        validate_input_type(input_type)
+        return self._map(kelly_criterion_batch, (bankroll, win_input, odds, multiplier),
+                         {'input_type': input_type, 'errors': errors}, out,
+                         "Bankroll, win_input, odds, and multiplier must be numeric values.")
+
+    def close(self):
+        """
+        Shut down the worker pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _map(self, function, arguments, kwargs, out, message):
+        values = [argument.array if isinstance(argument, SharedArray) else as_float_array(argument, message)
+                  for argument in arguments]
+        shape = np.broadcast(*values).shape
+        n = int(np.prod(shape))
+        chunk_size = self.chunk_size or chunk_size_for(n, self.n_jobs)
+
+        if self.n_jobs <= 1 or n <= chunk_size:
+            result = function(*values, **kwargs)
+            if out is None:
+                return result
+            target = out.array if isinstance(out, SharedArray) else out
+            target.reshape(-1)[...] = result.reshape(-1)
+            return target.reshape(shape)
+
+        # Scalars travel with the task, full-size inputs as flat views, anything else is broadcast first
+        flat = []
+        for argument, value in zip(arguments, values):
+            if value.size == 1:
+                flat.append(value.reshape(-1)[0])
+            elif value.shape != shape:
+                flat.append(np.broadcast_to(value, shape).reshape(-1))
+            else:
+                flat.append(argument if isinstance(argument, SharedArray) else value.reshape(-1))
+        tasks = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+        if self.backend == 'thread':
+            flat = [value.array.reshape(-1) if isinstance(value, SharedArray) else value for value in flat]
+            if out is None:
+                out = np.empty(n)
+            target = out.array if isinstance(out, SharedArray) else out
+            self._run(function, flat, target.reshape(-1), tasks, kwargs)
+            return target.reshape(shape)
+
+        created = []
+        try:
+            for index, value in enumerate(flat):
+                if isinstance(value, np.ndarray):
+                    flat[index] = SharedArray.from_array(value)
+                    created.append(flat[index])
+            output = out
+            if not isinstance(out, SharedArray):
+                output = SharedArray(n)
+                created.append(output)
+            self._run(function, flat, output, tasks, kwargs)
+
+            if out is None:
+                return output.array.reshape(shape).copy()
+            if output is not out:
+                out.reshape(-1)[...] = output.array
+                return out.reshape(shape)
+            return out.array.reshape(shape)
+        finally:
+            for block in created:
+                block.close()
+
+    def _run(self, function, arguments, output, tasks, kwargs):
+        futures = [self._pool().submit(_evaluate_chunk, function, arguments, output, start, stop, kwargs)
+                   for start, stop in tasks]
+        # Let every task finish before the caller closes the blocks, even when one of them fails
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def _pool(self):
+        if self._executor is None:
+            if self.backend == 'process':
+                # Workers must share this process's tracker, or their own would unlink the blocks when they exit
+                resource_tracker.ensure_running()
+                self._executor = ProcessPoolExecutor(max_workers=self.n_jobs)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.n_jobs)
+        return self._executor
+
+
+def calculate_ev_percentage_parallel(odds, probability, errors='raise', n_jobs=None, backend='process',
+                                     chunk_size=None):
+    """
+    Evaluate calculate_ev_percentage_batch across a temporary worker pool, see ParallelEvaluator.
+    """
+    with ParallelEvaluator(n_jobs, backend, chunk_size) as evaluator:
+        return evaluator.calculate_ev_percentage(odds, probability, errors)
+
+
+def kelly_criterion_parallel(bankroll, win_input, odds, multiplier=1.0, input_type='probability', errors='raise',
+                             n_jobs=None, backend='process', chunk_size=None):
+    """
+    Evaluate kelly_criterion_batch across a temporary worker pool, see ParallelEvaluator.
+    """
+    with ParallelEvaluator(n_jobs, backend, chunk_size) as evaluator:
+        return evaluator.kelly_criterion(bankroll, win_input, odds, multiplier, input_type, errors)
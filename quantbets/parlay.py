@@ -0,0 +1,202 @@
+"""
+Pricing, enumeration and Kelly sizing of parlays (accumulators) over a flat array of legs.
+
+Legs are selections given as flat arrays of decimal odds, optionally grouped into markets by CSR ``offsets`` or
+``market_ids`` as in quantbets.devig. A batch of parlays is an int array of leg indices of shape
+(parlays, max_legs), with -1 padding for parlays with fewer legs.
+
+Legs are assumed independent. The parlay price is the product of the leg odds, and the joint probability is
+the product of the leg probabilities. Both products are summed in log space. Two legs from the same market are
+mutually exclusive and never form a valid parlay. Correlated same-game legs from different markets need their
+probabilities adjusted by the caller before pricing.
+
+The EV of a parlay is ``prod(p_i * o_i) - 1``, so it only depends on the legs' edges ``e_i = p_i * o_i``.
+enumerate_parlays builds combinations one leg at a time over legs sorted by decreasing edge. A partial
+combination is extended only while its log edge plus the best edges still available can reach the minimum EV,
+so parlays below the bound are never materialized.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .bankroll_management import kelly_criterion_batch
+from .devig import _segments, calculate_true_odds_batch
+from .validation import (
+    ODDS_MESSAGE, PROBABILITY_MESSAGE, as_float_array, check_errors, flag_invalid, odds_mask, probability_mask,
+)
+
+ParlayPrices = namedtuple('ParlayPrices', ['odds', 'fair_odds', 'probability', 'ev'])
+
+LEGS_MESSAGE = "Parlay legs must be valid, distinct leg indices from different markets."
+DEFAULT_LIMIT = 10_000_000
+
+
+def _leg_arrays(odds, probability, offsets, market_ids):
+    """
+    Validate the legs and resolve each leg's market code.
+
+    :return: Tuple (odds, probability or None, market codes or None).
+    """
+    odds = as_float_array(odds, "Odds must be numeric values.").reshape(-1)
+    if odds_mask(odds).any():
+        raise ValueError(ODDS_MESSAGE)
+    if probability is not None:
+        probability = np.broadcast_to(as_float_array(probability, "Probability must be numeric values."),
+                                      odds.shape)
+        if probability_mask(probability).any():
+            raise ValueError(PROBABILITY_MESSAGE)
+
+    if offsets is None and market_ids is None:
+        return odds, probability, None
+    offsets, codes = _segments(len(odds), offsets, market_ids)
+    if codes is None:
+        codes = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    return odds, probability, codes
+
+
+def _invalid_legs(legs, n_legs, codes):
+    """
+    Rows with an index out of range, a repeated leg, two legs from one market or no legs at all.
+    """
+    padding = legs < 0
+    invalid = (legs >= n_legs).any(axis=1) | (legs < -1).any(axis=1) | padding.all(axis=1)
+    index = np.clip(legs, 0, max(n_legs - 1, 0))
+    keys = index if codes is None else codes[index]
+    # Padding gets distinct negative keys so that it never collides
+    keys = np.where(padding, -1 - np.arange(legs.shape[1]), keys)
+    keys = np.sort(keys, axis=1)
+    invalid |= (keys[:, 1:] == keys[:, :-1]).any(axis=1)
+    return invalid
+
+
+def price_parlays(legs, odds, probability=None, offsets=None, market_ids=None, tax_rate=0, method='proportional',
+                  errors='raise'):
+    """
+    Price a batch of parlays.
+
+    Each leg is de-vigged within its market when a market layout is given. Legs without a market layout are
+    valued at their implied probability 1 / odds.
+
+    :param legs: int array (parlays, max_legs) of leg indices, -1 for unused slots.
+    :param odds: Flat array of decimal odds of all legs.
+    :param probability: Estimated probabilities of winning per leg, None to use the de-vigged fair probabilities.
+    :param offsets: CSR offsets grouping the legs into markets.
+    :param market_ids: Alternatively, one market id per leg.
+    :param tax_rate: Tax rate as a percentage (default: 0), applied to the fair probabilities of the legs.
+    :param method: De-vig method, see quantbets.devig.
+    :param errors: 'raise' to raise a ValueError for invalid parlays, 'nan' to return NaN for them instead.
+    :return: ParlayPrices of float64 arrays: the parlay odds, the fair odds of the de-vigged legs, the joint
+             probability of winning and the expected value per unit staked.
+    """
+    check_errors(errors)
+    odds, probability, codes = _leg_arrays(odds, probability, offsets, market_ids)
+    legs = np.asarray(legs)
+    if legs.ndim != 2 or not np.issubdtype(legs.dtype, np.integer):
+        raise ValueError("legs must be a 2-D integer array of leg indices.")
+    invalid = flag_invalid(_invalid_legs(legs, len(odds), codes), LEGS_MESSAGE, errors,
+                           np.zeros(len(legs), dtype=bool))
+
+    if codes is None:
+        fair = 1.0 / odds
+    else:
+        fair = calculate_true_odds_batch(odds, offsets, market_ids, method=method).adjusted_probability
+    fair = fair * (1 - tax_rate / 100)
+    if probability is None:
+        probability = fair
+
+    padding = legs < 0
+    index = np.clip(legs, 0, max(len(odds) - 1, 0))
+
+    def log_product(values):
+        with np.errstate(divide='ignore'):
+            return np.where(padding, 0.0, np.log(values)[index]).sum(axis=1)
+
+    log_odds = log_product(odds)
+    log_probability = log_product(probability)
+    with np.errstate(over='ignore', invalid='ignore'):
+        result = ParlayPrices(np.exp(log_odds), np.exp(-log_product(fair)), np.exp(log_probability),
+                              np.expm1(log_odds + log_probability))
+    if invalid.any():
+        for values in result:
+            values[invalid] = np.nan
+    return result
+
+
+def enumerate_parlays(odds, probability, size, min_ev=0.0, offsets=None, market_ids=None, limit=DEFAULT_LIMIT):
+    """
+    Enumerate the parlays of a given size whose EV reaches a minimum.
+
+    :param odds: Flat array of decimal odds of all legs.
+    :param probability: Estimated probabilities of winning per leg.
+    :param size: Number of legs per parlay.
+    :param min_ev: Minimum expected value per unit staked.
+    :param offsets: CSR offsets grouping the legs into markets; legs of one market are never combined.
+    :param market_ids: Alternatively, one market id per leg.
+    :param limit: Maximum number of partial combinations held at any step; a ValueError is raised beyond it.
+    :return: int64 array (parlays, size) of leg indices, increasing within each row.
+    """
+    odds, probability, codes = _leg_arrays(odds, probability, offsets, market_ids)
+    if probability is None:
+        raise ValueError("probability is required to enumerate parlays.")
+    if size < 1:
+        raise ValueError("size must be at least 1.")
+    threshold = np.log1p(min_ev) if min_ev > -1 else -np.inf
+
+    # Candidate legs sorted by decreasing log edge; legs that cannot win are dropped
+    with np.errstate(divide='ignore'):
+        log_edge = np.log(probability) + np.log(odds)
+    order = np.argsort(-log_edge, kind='stable')
+    order = order[np.isfinite(log_edge[order])]
+    log_edge = log_edge[order]
+    n = len(order)
+    if n < size:
+        return np.empty((0, size), dtype=np.int64)
+    cumulative = np.concatenate(([0.0], np.cumsum(log_edge)))
+
+    # Partial combinations as positions in the sorted candidates, with their summed log edge
+    combos = np.empty((1, 0), dtype=np.int64)
+    partial = np.zeros(1)
+    last = np.full(1, -1, dtype=np.int64)
+    for level in range(size):
+        remaining = size - level
+        # window[u] is the best log edge of the remaining legs when the next one is candidate u; it does not
+        # increase with u, so the candidates that can still reach the threshold form a prefix after `last`
+        starts = np.arange(n - remaining + 1)
+        window = cumulative[starts + remaining] - cumulative[starts]
+        stop = np.searchsorted(-window, partial - threshold, side='right')
+        counts = np.maximum(stop - (last + 1), 0)
+        total = int(counts.sum())
+        if total > limit:
+            raise ValueError(f"More than {limit} candidate parlays; raise min_ev or limit.")
+
+        parent = np.repeat(np.arange(len(partial)), counts)
+        first = np.repeat(last + 1 - np.cumsum(counts) + counts, counts)
+        position = first + np.arange(total)
+        combos = np.concatenate((combos[parent], position[:, None]), axis=1)
+        partial = partial[parent] + log_edge[position]
+        last = position
+
+        if codes is not None and level:
+            leg_codes = codes[order[combos]]
+            distinct = (leg_codes[:, :-1] != leg_codes[:, -1:]).all(axis=1)
+            combos, partial, last = combos[distinct], partial[distinct], last[distinct]
+
+    legs = np.sort(order[combos], axis=1)
+    return legs[partial >= threshold]
+
+
+def kelly_parlays(bankroll, prices, multiplier=1.0, errors='raise'):
+    """
+    Kelly stakes of priced parlays, each sized on its own.
+
+    Parlays that share legs are correlated, and sizing each one independently over-bets the shared legs when
+    several are placed together. No joint sizer for correlated parlays is provided; scale the multiplier down
+    accordingly.
+
+    :param bankroll: Total available bankroll.
+    :param prices: ParlayPrices from price_parlays.
+    :param multiplier: Kelly multiplier, between 0 (exclusive) and 1 (inclusive).
+    :param errors: 'raise' or 'nan', see kelly_criterion_batch.
+    :return: float64 ndarray of recommended bet sizes.
+    """
+    return kelly_criterion_batch(bankroll, prices.probability, prices.odds, multiplier, errors=errors)
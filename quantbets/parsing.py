@@ -0,0 +1,178 @@
+"""
+Vectorized parsing of raw feed prices into decimal odds.
+
+Prices arrive as strings such as ``"2.50"``, ``"5/2"``, ``"+150"`` or ``"-110"``. parse_odds takes a sequence of
+str or bytes, a NumPy string array, or a single bytes buffer of separator-delimited prices. The strings are laid
+out as a (rows, width) matrix of character codes, which is scanned one column at a time with the parser state of
+every row held in arrays.
+Malformed or out-of-range entries are flagged in an error mask instead of raising.
+
+When no odds_type is given, the format of each entry is detected from its characters:
+
+- a ``/`` marks fractional odds, e.g. ``"5/2"`` or ``"1.5/1"``;
+- a leading ``+`` or ``-`` marks American odds, e.g. ``"+150"`` or ``"-110"``;
+- anything else is read as decimal odds, e.g. ``"2.50"``.
+
+An explicit odds_type applies one format to the whole column, which skips the detection and also accepts
+unsigned American prices such as ``"150"``. Leading and trailing whitespace is ignored. Exponents, ``inf`` and
+``nan`` are rejected, as are parts with more than 15 digits. Within that limit every price is converted with a
+single correctly rounded division, so the results equal ``float()`` of the same decimal string.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+ParsedOdds = namedtuple('ParsedOdds', ['decimal_odds', 'invalid', 'formats'])
+
+# Codes of the formats array; invalid entries get INVALID
+FORMATS = ('decimal', 'fractional', 'american')
+DECIMAL, FRACTIONAL, AMERICAN, INVALID = 0, 1, 2, -1
+
+# Rows decoded per block, so that the per-character temporaries stay in cache
+CHUNK_SIZE = 1 << 16
+# Digits are accumulated in a float64 mantissa, which is exact up to 15 digits
+MAX_DIGITS = 15
+
+_POWERS = 10.0 ** np.arange(MAX_DIGITS + 1)
+
+
+def _char_matrix(values, sep):
+    """
+    Lay out the input as a matrix of character codes, one row per price, padded with zeros.
+    """
+    if isinstance(values, (bytes, bytearray, memoryview)):
+        return _split_buffer(np.frombuffer(values, dtype=np.uint8), sep[0])
+
+    values = np.asarray(values)
+    if values.size == 0:
+        return np.zeros((0, 1), dtype=np.uint8)
+    if values.dtype.kind not in 'SU':
+        if values.dtype.kind != 'O':
+            raise ValueError("Odds strings must be str or bytes.")
+        try:
+            values = values.astype('S')
+        except UnicodeEncodeError:
+            values = values.astype('U')
+    values = values.reshape(-1)
+    if values.dtype.itemsize == 0:
+        return np.zeros((len(values), 1), dtype=np.uint8)
+    code_type = np.uint8 if values.dtype.kind == 'S' else np.uint32
+    return values.view(code_type).reshape(len(values), -1)
+
+
+def _split_buffer(buffer, sep):
+    """
+    Split a byte buffer on a separator into a zero-padded character matrix; a trailing separator is ignored.
+    """
+    if not len(buffer):
+        return np.zeros((0, 1), dtype=np.uint8)
+    ends = np.flatnonzero(buffer == sep)
+    if not len(ends) or ends[-1] != len(buffer) - 1:
+        ends = np.append(ends, len(buffer))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    width = max(int(lengths.max()), 1)
+    index = np.minimum(starts[:, None] + np.arange(width), len(buffer) - 1)
+    return np.where(np.arange(width) < lengths[:, None], buffer[index], 0).astype(np.uint8)
+
+
+def _decode(codes, odds_type):
+    """
+    Decode one block of the character matrix by scanning its columns, updating the state of every row at once.
+
+    :return: Tuple (decimal_odds, formats) for the block.
+    """
+    rows = len(codes)
+    false = np.zeros(rows, dtype=bool)
+    started, ended, signed, negative, slashed, dotted, invalid = (false.copy() for _ in range(7))
+    mantissa = np.zeros(rows)
+    scale = np.zeros(rows, dtype=np.int64)
+    digits = np.zeros(rows, dtype=np.int64)
+    numerator = np.zeros(rows)
+
+    for column in np.ascontiguousarray(codes.T):
+        blank = column <= 32
+        digit = (column >= 48) & (column <= 57)
+        dot = column == 46
+        slash = column == 47
+        minus = column == 45
+        sign = minus | (column == 43)
+
+        # Anything but blanks after the trailing blanks, or a sign after the first character
+        invalid |= ~blank & ended
+        invalid |= sign & started
+        invalid |= ~(blank | digit | dot | slash | sign)
+        ended |= blank & started
+        started |= ~blank
+        signed |= sign
+        negative |= minus
+
+        # A slash closes the numerator and starts the denominator
+        invalid |= slash & (slashed | (digits == 0) | (digits > MAX_DIGITS))
+        if slash.any():
+            numerator = np.where(slash, mantissa / _POWERS[np.minimum(scale, MAX_DIGITS)], numerator)
+            mantissa[slash] = 0
+            scale[slash] = 0
+            digits[slash] = 0
+            dotted &= ~slash
+        slashed |= slash
+
+        invalid |= dot & dotted
+        dotted |= dot
+        mantissa = np.where(digit, mantissa * 10 + (column - 48), mantissa)
+        scale += digit & dotted
+        digits += digit
+
+    invalid |= (digits == 0) | (digits > MAX_DIGITS)
+    value = mantissa / _POWERS[np.minimum(scale, MAX_DIGITS)]
+
+    if odds_type is None:
+        formats = np.where(slashed, FRACTIONAL, np.where(signed, AMERICAN, DECIMAL))
+    else:
+        formats = np.full(rows, FORMATS.index(odds_type))
+        invalid |= slashed != (odds_type == 'fractional')
+        invalid |= signed & (odds_type != 'american')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decimal_odds = value.copy()
+        american = formats == AMERICAN
+        if american.any():
+            decimal_odds[american] = np.where(negative, 100.0 / value + 1.0, value / 100.0 + 1.0)[american]
+            invalid |= american & (value == 0)
+        if slashed.any():
+            invalid |= slashed & (signed | (numerator == 0) | (value == 0))
+            decimal_odds[slashed] = (numerator / value + 1.0)[slashed]
+
+    invalid |= ~(decimal_odds > 1)
+    decimal_odds[invalid] = np.nan
+    formats[invalid] = INVALID
+    return decimal_odds, formats
+
+
+def parse_odds(values, odds_type=None, sep=b'\n'):
+    """
+    Parse raw price strings into decimal odds, detecting the format of each entry.
+
+    :param values: Sequence of str or bytes, NumPy string array, or a bytes-like buffer of prices separated by sep.
+    :param odds_type: None to detect the format per entry, or 'decimal', 'fractional' or 'american' for a
+        homogeneous column.
+    :param sep: Single-byte separator of the prices in a bytes buffer.
+    :return: ParsedOdds of float64 decimal_odds (NaN where invalid), a boolean invalid mask and int8 format codes
+        indexing FORMATS (INVALID where invalid).
+    """
+    if odds_type is not None:
+        odds_type = odds_type.lower()
+        if odds_type not in FORMATS:
+            raise ValueError("Unsupported odds type. Use 'decimal', 'fractional', or 'american'.")
+    if isinstance(sep, str):
+        sep = sep.encode()
+    if len(sep) != 1:
+        raise ValueError("sep must be a single byte.")
+
+    codes = _char_matrix(values, sep)
+    decimal_odds = np.empty(len(codes), dtype=np.float64)
+    formats = np.empty(len(codes), dtype=np.int8)
+    for start in range(0, len(codes), CHUNK_SIZE):
+        block = slice(start, start + CHUNK_SIZE)
+        decimal_odds[block], formats[block] = _decode(codes[block], odds_type)
+    return ParsedOdds(decimal_odds, formats == INVALID, formats)
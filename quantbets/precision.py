@@ -0,0 +1,91 @@
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal, InvalidOperation
+
+PRECISIONS = ('exact', 'fast')
+
+# Process-wide default, and the override of precision_context, which is local to each thread and asyncio task
+_default_precision = 'exact'
+_context_precision = ContextVar('quantbets_precision', default=None)
+
+
+def _check_precision(precision):
+    if precision not in PRECISIONS:
+        raise ValueError("precision must be either 'exact' or 'fast'.")
+
+
+def get_precision():
+    """
+    Get the precision mode in effect: the one of the innermost precision_context, else the package-wide default.
+
+    :return: 'exact' for Decimal arithmetic, 'fast' for float arithmetic.
+    """
+    precision = _context_precision.get()
+    return _default_precision if precision is None else precision
+
+
+def set_precision(precision):
+    """
+    Set the package-wide default precision mode used when a function is called without an explicit precision.
+
+    The default applies to every thread, except inside a precision_context, which takes precedence.
+
+    :param precision: 'exact' to compute with Decimal, 'fast' to compute with float.
+    """
+    global _default_precision
+    _check_precision(precision)
+    _default_precision = precision
+
+
+@contextmanager
+def precision_context(precision):
+    """
+    Temporarily set the precision mode inside a with block.
+
+    The mode only applies to the current thread or asyncio task, so concurrent blocks do not affect each other.
+
+    :param precision: 'exact' or 'fast'.
+    """
+    _check_precision(precision)
+    token = _context_precision.set(precision)
+    try:
+        yield
+    finally:
+        _context_precision.reset(token)
+
+
+def resolve_precision(precision=None):
+    """
+    Resolve a per-call precision argument against the package-wide setting.
+
+    :param precision: 'exact', 'fast' or None to use the package-wide setting.
+    :return: 'exact' or 'fast'.
+    """
+    if precision is None:
+        return get_precision()
+    _check_precision(precision)
+    return precision
+
+
+def to_number(value, precision):
+    """
+    Convert a value to the number type of the given precision backend.
+
+    :param value: Numeric value or numeric string.
+    :param precision: 'exact' to return a Decimal, 'fast' to return a float.
+    :return: Decimal or float.
+    :raises ValueError: If the value cannot be converted or is NaN.
+    """
+    if precision == 'fast':
+        number = float(value)
+        if math.isnan(number):
+            raise ValueError("NaN is not a valid number.")
+        return number
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError("Value must be convertible to Decimal.")
+    if number.is_nan():
+        raise ValueError("NaN is not a valid number.")
+    return number
@@ -1,26 +1,61 @@
-from decimal import Decimal, InvalidOperation
+from .instrumentation import instrument
+from .lazy import lazy_import
+from .precision import resolve_precision, to_number
+from .validation import (
+    ODDS_MESSAGE, PROBABILITY_MESSAGE, as_float_array, check_errors, flag_invalid, odds_mask, probability_mask,
+    validate_odds, validate_probability,
+)
 
-def calculate_ev_percentage(odds, probability):
+np = lazy_import('numpy')
+
+
+@instrument('calculate_ev_percentage')
+def calculate_ev_percentage(odds, probability, precision=None):
     """
     Calculate the expected value (EV) as a percentage of return on investment (ROI) in decimal format.
 
     :param odds: Decimal odds of the bet.
     :param probability: The bettor's estimated probability of winning (as a decimal).
+    :param precision: 'exact' to compute with Decimal, 'fast' to compute with float, None for the package-wide setting.
     :return: The expected value of the bet as a percentage in decimal format.
     """
-    try:
-        odds = Decimal(odds)
-        probability = Decimal(probability)
-    except InvalidOperation:
-        raise ValueError("Odds and probability must be convertible to Decimal.")
+    precision = resolve_precision(precision)
 
-    if not (Decimal('0') <= probability <= Decimal('1')):
-        raise ValueError("Probability must be between 0 and 1.")
+    try:
+        odds = to_number(odds, precision)
+        probability = to_number(probability, precision)
+    except ValueError:
+        raise ValueError("Odds and probability must be numeric values.")
 
-    if odds <= Decimal('1'):
-        raise ValueError("Odds must be greater than 1.")
+    validate_probability(probability)
+    validate_odds(odds)
 
     # EV calculation as ROI percentage
-    ev_percentage = (probability * (odds - Decimal('1'))) - (Decimal('1') - probability)
-    
-    return ev_percentage
\ No newline at end of file
+    ev_percentage = (probability * (odds - 1)) - (1 - probability)
+
+    return ev_percentage
+
+
+def calculate_ev_percentage_batch(odds, probability, errors='raise'):
+    """
+    Vectorized calculate_ev_percentage over arrays of odds and probabilities.
+
+    :param odds: Decimal odds of the bets, scalar or array.
+    :param probability: The bettor's estimated probabilities of winning, broadcast against odds.
+    :param errors: 'raise' to raise a ValueError on the first failed check, 'nan' to return NaN for invalid rows.
+    :return: The expected values as a float64 ndarray.
+    """
+    check_errors(errors)
+    message = "Odds and probability must be numeric values."
+    odds, probability = np.broadcast_arrays(as_float_array(odds, message), as_float_array(probability, message))
+    invalid = np.zeros(odds.shape, dtype=bool)
+
+    invalid = flag_invalid(probability_mask(probability), PROBABILITY_MESSAGE, errors, invalid)
+    invalid = flag_invalid(odds_mask(odds), ODDS_MESSAGE, errors, invalid)
+
+    with np.errstate(invalid='ignore'):
+        ev_percentage = np.asarray((probability * (odds - 1.0)) - (1.0 - probability), dtype=np.float64)
+
+    if invalid.any():
+        ev_percentage[invalid] = np.nan
+    return ev_percentage
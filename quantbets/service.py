@@ -0,0 +1,252 @@
+"""
+Asyncio pipeline that turns streams of price updates into staking recommendations.
+
+Updates from any number of async sources go through a bounded queue. They are coalesced per market within a
+time window, and every touched market is then de-vigged, evaluated and staked in one batch on an executor.
+Recommendations are emitted through a second bounded queue, so a slow consumer holds back the sources
+instead of letting the buffers grow without limit.
+
+Updates are validated as they are coalesced. An invalid update (malformed, non-numeric, odds not above 1 or a
+probability outside [0, 1]) is counted in ``rejected`` and passed to the optional error callback, and never
+reaches a market, so one bad tick cannot stop the service or poison later batches.
+"""
+import asyncio
+import math
+from collections import deque, namedtuple
+
+import numpy as np
+
+from .bankroll_management import kelly_criterion_batch
+from .devig import calculate_true_odds_batch
+from .probability import calculate_ev_percentage_batch
+from .precision import to_number
+from .validation import ODDS_MESSAGE, validate_bankroll, validate_multiplier, validate_odds, validate_probability
+
+PriceUpdate = namedtuple('PriceUpdate', ['market_id', 'selection', 'odds', 'probability'])
+PriceUpdate.__new__.__defaults__ = (None,)
+
+Recommendation = namedtuple('Recommendation', ['market_id', 'selection', 'odds', 'fair_odds', 'probability', 'ev',
+                                               'stake', 'latency'])
+
+_END = object()
+
+
+class FakeSource:
+    def __init__(self, updates, interval=0.0):
+        """
+        In-process price source replaying a fixed list of updates, for tests and demos.
+
+        :param updates: Iterable of PriceUpdate (or tuples with the same fields).
+        :param interval: Seconds to sleep between updates.
+        """
+        self.updates = [PriceUpdate(*update) for update in updates]
+        self.interval = interval
+
+    async def __aiter__(self):
+        for update in self.updates:
+            if self.interval:
+                await asyncio.sleep(self.interval)
+            yield update
+
+
+def validate_update(update):
+    """
+    Check a price update and convert its numbers to float.
+
+    :param update: PriceUpdate.
+    :return: Tuple (odds, probability), with NaN for a missing probability.
+    :raises ValueError: If the odds or the probability are invalid.
+    :raises TypeError: If a value is not numeric.
+    """
+    odds = to_number(update.odds, 'fast')
+    validate_odds(odds)
+    if math.isinf(odds):
+        raise ValueError(ODDS_MESSAGE)
+    if update.probability is None:
+        return odds, np.nan
+    probability = to_number(update.probability, 'fast')
+    validate_probability(probability)
+    return odds, probability
+
+
+def reprice(odds, probability, offsets, bankroll, multiplier=1.0, method='proportional'):
+    """
+    De-vig, evaluate and stake a batch of markets laid out with CSR offsets.
+
+    Selections without a model probability (NaN) are evaluated at their de-vigged fair probability.
+
+    :return: Tuple of float64 arrays (fair odds, probability, EV, stake), one value per selection.
+    """
+    fair_odds = calculate_true_odds_batch(odds, offsets=offsets, method=method).true_odds
+    probability = np.where(np.isnan(probability), 1 / fair_odds, probability)
+    ev = calculate_ev_percentage_batch(odds, probability, errors='nan')
+    stake = kelly_criterion_batch(bankroll, probability, odds, multiplier, errors='nan')
+    return fair_odds, probability, ev, stake
+
+
+class RepricingService:
+    def __init__(self, sources, bankroll, multiplier=1.0, window=0.05, method='proportional', input_size=10000,
+                 output_size=10000, executor=None, latency_samples=100000, on_error=None):
+        """
+        Initialize the service.
+
+        :param sources: Async iterables of PriceUpdate.
+        :param bankroll: Bankroll used for Kelly staking.
+        :param multiplier: Kelly multiplier, between 0 (exclusive) and 1 (inclusive).
+        :param window: Seconds to coalesce updates before a market is repriced.
+        :param method: De-vig method, see calculate_true_odds_batch.
+        :param input_size: Capacity of the bounded queue of incoming updates.
+        :param output_size: Capacity of the bounded queue of outgoing recommendations.
+        :param executor: concurrent.futures executor for the batch computations, None for the loop's default.
+        :param latency_samples: Number of most recent update-to-recommendation latencies kept for percentiles.
+        :param on_error: Function called with (update, error) for every rejected update, None to only count them.
+        """
+        validate_bankroll(bankroll)
+        validate_multiplier(multiplier)
+        self.sources = list(sources)
+        self.bankroll = bankroll
+        self.multiplier = multiplier
+        self.window = window
+        self.method = method
+        self.executor = executor
+        self.input_size = input_size
+        self.output_size = output_size
+        self.latencies = deque(maxlen=latency_samples)
+        self.on_error = on_error
+        self.rejected = 0
+        self.markets = {}
+        self._updates = None
+        self._recommendations = None
+        self._finished = False
+
+    async def run(self):
+        """
+        Consume every source until it is exhausted, emitting recommendations as markets are repriced.
+
+        Ends the output stream once the last batch has been emitted. If a source or a batch raises, the other
+        tasks are cancelled and the error propagates.
+        """
+        self._updates = asyncio.Queue(maxsize=self.input_size)
+        self._finished = False
+        if self._recommendations is None:
+            self._recommendations = asyncio.Queue(maxsize=self.output_size)
+        ingest = [asyncio.ensure_future(self._ingest(source)) for source in self.sources]
+        tasks = ingest + [asyncio.ensure_future(self._close_input(ingest)), asyncio.ensure_future(self._coalesce())]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            # Never wait here: after an error or a cancellation the consumer may be gone with the queue full.
+            # If the end marker does not fit, stream() ends once it has drained the queue instead
+            self._finished = True
+            try:
+                self._recommendations.put_nowait(_END)
+            except asyncio.QueueFull:
+                pass
+
+    async def stream(self):
+        """
+        Iterate over recommendations as they are emitted, until run() completes.
+        """
+        if self._recommendations is None:
+            self._recommendations = asyncio.Queue(maxsize=self.output_size)
+        while True:
+            if self._finished and self._recommendations.empty():
+                return
+            recommendation = await self._recommendations.get()
+            if recommendation is _END:
+                return
+            yield recommendation
+
+    def latency_percentiles(self, percentiles=(50, 99)):
+        """
+        Update-to-recommendation latency over the most recent recommendations.
+
+        :param percentiles: Percentiles to report.
+        :return: Dict mapping 'p50', 'p99', ... to seconds; NaN before the first recommendation.
+        """
+        samples = np.fromiter(self.latencies, dtype=np.float64)
+        return {f'p{p:g}': float(np.percentile(samples, p)) if len(samples) else float('nan') for p in percentiles}
+
+    async def _ingest(self, source):
+        loop = asyncio.get_running_loop()
+        async for update in source:
+            try:
+                update = PriceUpdate(*update)
+            except TypeError as error:
+                self._reject(update, error)
+                continue
+            await self._updates.put((loop.time(), update))
+
+    async def _close_input(self, ingest):
+        await asyncio.gather(*ingest)
+        await self._updates.put(_END)
+
+    def _reject(self, update, error):
+        self.rejected += 1
+        if self.on_error is not None:
+            self.on_error(update, error)
+
+    async def _coalesce(self):
+        loop = asyncio.get_running_loop()
+        pending = {}
+        deadline = None
+        while True:
+            if deadline is None:
+                item = await self._updates.get()
+            else:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self._updates.get(), timeout)
+                    else:
+                        # Past the deadline, drain what is already queued without yielding, then flush
+                        item = self._updates.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    await self._flush(pending)
+                    pending, deadline = {}, None
+                    continue
+
+            if item is _END:
+                if pending:
+                    await self._flush(pending)
+                return
+            received, update = item
+            try:
+                price = validate_update(update)
+            except (TypeError, ValueError) as error:
+                self._reject(update, error)
+                continue
+            self.markets.setdefault(update.market_id, {})[update.selection] = price
+            # Keep the oldest pending update per market, the worst case for latency
+            pending.setdefault(update.market_id, received)
+            if deadline is None:
+                deadline = received + self.window
+
+    async def _flush(self, pending):
+        market_ids = list(pending)
+        keys, odds, probability, sizes = [], [], [], []
+        for market_id in market_ids:
+            selections = self.markets[market_id]
+            sizes.append(len(selections))
+            for selection, (price, model_probability) in selections.items():
+                keys.append((market_id, selection))
+                odds.append(price)
+                probability.append(model_probability)
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+
+        loop = asyncio.get_running_loop()
+        fair_odds, probability, ev, stake = await loop.run_in_executor(
+            self.executor, reprice, np.array(odds), np.array(probability), offsets, self.bankroll,
+            self.multiplier, self.method)
+
+        for index, (market_id, selection) in enumerate(keys):
+            latency = loop.time() - pending[market_id]
+            self.latencies.append(latency)
+            await self._recommendations.put(Recommendation(
+                market_id, selection, odds[index], float(fair_odds[index]), float(probability[index]),
+                float(ev[index]), float(stake[index]), latency))
@@ -0,0 +1,109 @@
+"""
+Monte Carlo simulation of bankroll paths for fractional-Kelly staking strategies.
+
+Every strategy is simulated on the same random outcomes (common random numbers), so differences between
+multipliers are not drowned in sampling noise. Paths are generated in chunks, each seeded from its own
+child of one SeedSequence, which makes the results identical whether the chunks run in this process or
+are spread over a process pool.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .bankroll_management import kelly_criterion_batch
+from .validation import (
+    ODDS_MESSAGE, PROBABILITY_MESSAGE, as_float_array, odds_mask, probability_mask, validate_bankroll,
+    validate_multiplier,
+)
+
+StrategyStats = namedtuple('StrategyStats', ['multiplier', 'fractions', 'terminal_wealth', 'max_drawdown',
+                                             'ruin_probability', 'growth_rate'])
+
+
+def _simulate_chunk(seed, n_paths, probabilities, odds, fractions, ruin_level):
+    """
+    Simulate one chunk of paths for every strategy.
+
+    :return: List of (log terminal wealth, max drawdown, ruined) arrays, one tuple per strategy.
+    """
+    wins = np.random.default_rng(seed).random((n_paths, len(probabilities))) < probabilities
+    results = []
+    with np.errstate(divide='ignore'):
+        for fraction in fractions:
+            log_growth = np.where(wins, np.log1p(fraction * (odds - 1)), np.log1p(-fraction))
+            log_wealth = np.cumsum(log_growth, axis=1)
+            peak = np.maximum(np.maximum.accumulate(log_wealth, axis=1), 0.0)
+            drawdown = -np.expm1((log_wealth - peak).min(axis=1))
+            ruined = log_wealth.min(axis=1) <= ruin_level
+            results.append((log_wealth[:, -1], drawdown, ruined))
+    return results
+
+
+def simulate_bankroll(probabilities, odds, multipliers=(1.0,), estimated_probabilities=None, n_paths=100000,
+                      initial_bankroll=1.0, ruin_threshold=0.01, seed=None, chunk_size=None, n_jobs=None):
+    """
+    Simulate bankroll paths over a sequence of bets for several fractional-Kelly multipliers.
+
+    Each bet is sized as a fraction of the current bankroll with kelly_criterion_batch, using the
+    estimated probabilities and the strategy's multiplier; bets without positive expected value are skipped.
+    Outcomes are drawn from the true probabilities.
+
+    :param probabilities: True probabilities of winning each bet of the sequence.
+    :param odds: Decimal odds of each bet.
+    :param multipliers: Kelly multipliers to compare, each between 0 (exclusive) and 1 (inclusive).
+    :param estimated_probabilities: Probabilities used for sizing, defaults to the true probabilities.
+    :param n_paths: Number of simulated bankroll paths.
+    :param initial_bankroll: Starting bankroll of every path.
+    :param ruin_threshold: A path is ruined once its bankroll falls to this fraction of the initial bankroll.
+    :param seed: Seed for numpy's SeedSequence; the same seed gives the same paths for any n_jobs.
+    :param chunk_size: Paths simulated per chunk, defaults to about four million bets per chunk.
+    :param n_jobs: Number of worker processes, None to simulate in this process.
+    :return: Dict mapping each multiplier to its StrategyStats (fractions staked per bet, terminal wealth and
+             max drawdown per path, ruin probability and mean log growth rate per bet).
+    """
+    message = "Probabilities and odds must be numeric values."
+    probabilities = as_float_array(probabilities, message).reshape(-1)
+    odds = as_float_array(odds, message).reshape(-1)
+    estimated = probabilities if estimated_probabilities is None else \
+        as_float_array(estimated_probabilities, message).reshape(-1)
+    if not (len(probabilities) == len(odds) == len(estimated)) or not len(odds):
+        raise ValueError("probabilities, odds and estimated_probabilities must be non-empty and of equal length.")
+    if probability_mask(probabilities).any() or probability_mask(estimated).any():
+        raise ValueError(PROBABILITY_MESSAGE)
+    if odds_mask(odds).any():
+        raise ValueError(ODDS_MESSAGE)
+    validate_bankroll(initial_bankroll)
+    for multiplier in multipliers:
+        validate_multiplier(multiplier)
+    if not 0 < ruin_threshold < 1:
+        raise ValueError("ruin_threshold must be between 0 and 1, exclusive.")
+
+    fractions = [np.maximum(kelly_criterion_batch(1.0, estimated, odds, multiplier), 0.0)
+                 for multiplier in multipliers]
+
+    if chunk_size is None:
+        chunk_size = max(1, (1 << 22) // len(odds))
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(chunk_seed, size, probabilities, odds, fractions, np.log(ruin_threshold))
+             for chunk_seed, size in zip(seeds, sizes)]
+
+    if n_jobs is None or n_jobs <= 1:
+        chunks = [_simulate_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*tasks)))
+
+    results = {}
+    for index, multiplier in enumerate(multipliers):
+        log_terminal, drawdown, ruined = (np.concatenate(parts) for parts in zip(*(chunk[index] for chunk in chunks)))
+        results[multiplier] = StrategyStats(
+            multiplier=multiplier,
+            fractions=fractions[index],
+            terminal_wealth=initial_bankroll * np.exp(log_terminal),
+            max_drawdown=drawdown,
+            ruin_probability=ruined.mean(),
+            growth_rate=log_terminal.mean() / len(odds),
+        )
+    return results
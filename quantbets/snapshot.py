@@ -0,0 +1,185 @@
+"""
+Compact binary format for odds snapshots that is reloaded by memory mapping instead of parsing.
+
+A snapshot file is a 64-byte header followed by fixed-width 32-byte little-endian records:
+
+========== ======= =====================================================
+field      type    meaning
+========== ======= =====================================================
+market_id  uint64  market identifier
+timestamp  int64   snapshot time, e.g. nanoseconds since the Unix epoch
+odds       float64 decimal odds
+selection  uint32  selection identifier within the market
+book       uint16  source bookmaker identifier
+reserved   uint16  padding, always zero
+========== ======= =====================================================
+
+The header holds the magic bytes ``QBSNAP``, the format version and the record size. Readers expose each
+field as a zero-copy view into the mapped file, which the vectorized functions such as
+calculate_ev_percentage_batch and calculate_true_odds_batch accept directly.
+"""
+import os
+import struct
+
+import numpy as np
+
+from .validation import ODDS_MESSAGE, as_float_array, odds_mask
+
+MAGIC = b'QBSNAP'
+VERSION = 1
+HEADER_SIZE = 64
+SNAPSHOT_DTYPE = np.dtype([
+    ('market_id', '<u8'),
+    ('timestamp', '<i8'),
+    ('odds', '<f8'),
+    ('selection', '<u4'),
+    ('book', '<u2'),
+    ('reserved', '<u2'),
+])
+
+_HEADER = struct.Struct('<6sHI')
+
+
+def _header():
+    header = _HEADER.pack(MAGIC, VERSION, SNAPSHOT_DTYPE.itemsize)
+    return header + b'\0' * (HEADER_SIZE - len(header))
+
+
+def _check_header(header):
+    if len(header) < HEADER_SIZE:
+        raise ValueError("File is too short to be an odds snapshot.")
+    magic, version, record_size = _HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError("File is not an odds snapshot.")
+    if version != VERSION or record_size != SNAPSHOT_DTYPE.itemsize:
+        raise ValueError(f"Unsupported snapshot version {version} with {record_size}-byte records.")
+
+
+class SnapshotWriter:
+    def __init__(self, path):
+        """
+        Open a snapshot file for appending, creating it with a header if it does not exist.
+
+        A partial record left at the end of the file by an interrupted write is discarded.
+
+        :param path: Path to the snapshot file.
+        """
+        self.path = path
+        self._file = open(path, 'a+b')
+        self._file.seek(0)
+        header = self._file.read(HEADER_SIZE)
+        if not header:
+            self._file.write(_header())
+            self._file.flush()
+        else:
+            try:
+                _check_header(header)
+            except ValueError:
+                self._file.close()
+                raise
+            size = os.fstat(self._file.fileno()).st_size
+            aligned = HEADER_SIZE + (size - HEADER_SIZE) // SNAPSHOT_DTYPE.itemsize * SNAPSHOT_DTYPE.itemsize
+            if aligned != size:
+                self._file.truncate(aligned)
+
+    def append(self, market_id, selection, timestamp, odds, book=0):
+        """
+        Append snapshot records. Arguments are broadcast against each other.
+
+        :param market_id: Market identifiers.
+        :param selection: Selection identifiers.
+        :param timestamp: Snapshot timestamps as integers.
+        :param odds: Decimal odds, all greater than 1.
+        :param book: Source bookmaker identifiers.
+        :return: Number of records written.
+        """
+        odds = as_float_array(odds, "Odds must be numeric values.")
+        if odds_mask(odds).any():
+            raise ValueError(ODDS_MESSAGE)
+        market_id, selection, timestamp, odds, book = np.broadcast_arrays(
+            np.asarray(market_id), np.asarray(selection), np.asarray(timestamp), odds, np.asarray(book))
+
+        records = np.zeros(odds.size, dtype=SNAPSHOT_DTYPE)
+        records['market_id'] = market_id.reshape(-1)
+        records['selection'] = selection.reshape(-1)
+        records['timestamp'] = timestamp.reshape(-1)
+        records['odds'] = odds.reshape(-1)
+        records['book'] = book.reshape(-1)
+        self._file.write(records.tobytes())
+        self._file.flush()
+        return len(records)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SnapshotReader:
+    def __init__(self, path):
+        """
+        Memory-map a snapshot file for reading.
+
+        :param path: Path to the snapshot file.
+        """
+        self.path = path
+        self.refresh()
+
+    def refresh(self):
+        """
+        Re-map the file to pick up records appended since it was opened.
+        """
+        with open(self.path, 'rb') as handle:
+            _check_header(handle.read(HEADER_SIZE))
+        size = os.path.getsize(self.path)
+        count = (size - HEADER_SIZE) // SNAPSHOT_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(self.path, dtype=SNAPSHOT_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=SNAPSHOT_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def market_id(self):
+        return self.records['market_id']
+
+    @property
+    def selection(self):
+        return self.records['selection']
+
+    @property
+    def timestamp(self):
+        return self.records['timestamp']
+
+    @property
+    def odds(self):
+        return self.records['odds']
+
+    @property
+    def book(self):
+        return self.records['book']
+
+
+def write_snapshot(path, market_id, selection, timestamp, odds, book=0):
+    """
+    Append records to a snapshot file, creating it if needed.
+
+    :return: Number of records written.
+    """
+    with SnapshotWriter(path) as writer:
+        return writer.append(market_id, selection, timestamp, odds, book)
+
+
+def read_snapshot(path):
+    """
+    Memory-map a snapshot file.
+
+    :return: SnapshotReader.
+    """
+    return SnapshotReader(path)
@@ -0,0 +1,102 @@
+"""
+Validation shared by the exact (Decimal) and fast (float) scalar backends and by the vectorized entry points.
+
+The scalar validators only compare against integers, so they work unchanged for Decimal and float inputs.
+"""
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+
+BANKROLL_MESSAGE = "Bankroll must be a positive value."
+PROBABILITY_MESSAGE = "Probability must be between 0 and 1, inclusive."
+TRUE_ODDS_MESSAGE = "True odds must be greater than 1."
+ODDS_MESSAGE = "Odds must be greater than 1."
+MULTIPLIER_MESSAGE = "Multiplier must be between 0 and 1, exclusive of 0 and inclusive of 1."
+INPUT_TYPE_MESSAGE = "input_type must be either 'probability' or 'true_odds'."
+
+
+def validate_bankroll(bankroll):
+    if bankroll <= 0:
+        raise ValueError(BANKROLL_MESSAGE)
+
+
+def validate_probability(probability):
+    if not (0 <= probability <= 1):
+        raise ValueError(PROBABILITY_MESSAGE)
+
+
+def validate_true_odds(true_odds):
+    if true_odds <= 1:
+        raise ValueError(TRUE_ODDS_MESSAGE)
+
+
+def validate_odds(odds):
+    if odds <= 1:
+        raise ValueError(ODDS_MESSAGE)
+
+
+def validate_multiplier(multiplier):
+    if not (0 < multiplier <= 1):
+        raise ValueError(MULTIPLIER_MESSAGE)
+
+
+def validate_input_type(input_type):
+    if input_type not in ('probability', 'true_odds'):
+        raise ValueError(INPUT_TYPE_MESSAGE)
+
+
+def check_errors(errors):
+    """
+    Validate the ``errors`` argument shared by the vectorized entry points.
+
+    :param errors: 'raise' to raise on the first failed check, 'nan' to mark invalid rows as NaN.
+    """
+    if errors not in ('raise', 'nan'):
+        raise ValueError("errors must be either 'raise' or 'nan'.")
+
+
+def as_float_array(values, message):
+    """
+    Convert array-like input to a float64 NumPy array.
+
+    :param values: Scalar or array-like of numeric values (or numeric strings).
+    :param message: Error message used if the values cannot be converted.
+    :return: The values as a float64 ndarray.
+    """
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(message)
+
+
+def flag_invalid(invalid, message, errors, mask):
+    """
+    Record the rows that failed a check.
+
+    Checks are expressed as the negation of the valid condition, so NaN inputs are always flagged.
+
+    :param invalid: Boolean array, True where the check failed.
+    :param message: Error message raised when errors is 'raise' and any row failed.
+    :param errors: 'raise' or 'nan'.
+    :param mask: Boolean array of rows already known to be invalid.
+    :return: The updated mask of invalid rows.
+    """
+    if errors == 'raise' and invalid.any():
+        raise ValueError(message)
+    return mask | invalid
+
+
+def probability_mask(probability):
+    return ~((probability >= 0) & (probability <= 1))
+
+
+def bankroll_mask(bankroll):
+    return ~(bankroll > 0)
+
+
+def odds_mask(odds):
+    return ~(odds > 1)
+
+
+def multiplier_mask(multiplier):
+    return ~((multiplier > 0) & (multiplier <= 1))
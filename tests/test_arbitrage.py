@@ -0,0 +1,78 @@
+# tests/test_arbitrage.py
+import numpy as np
+import pytest
+from quantbets.arbitrage import ArbitrageScanner, arbitrage_stakes, scan_arbitrage
+
+NAN = np.nan
+PRICES = np.array([
+    [[2.10, 2.00, NAN], [1.85, 2.05, 1.90]],  # best 2.10 / 2.05 -> arbitrage
+    [[1.90, 1.95, 1.92], [1.90, 1.88, 1.91]],  # no arbitrage
+    [[3.00, NAN, NAN], [NAN, NAN, NAN]],  # outcome without any price
+])
+
+def random_prices(rng, markets=20, outcomes=3, books=6):
+    prices = outcomes / rng.uniform(0.9, 1.1, (markets, outcomes, books)) * rng.uniform(0.9, 1.0, (markets, 1, 1))
+    prices[rng.random(prices.shape) < 0.2] = NAN
+    return prices
+
+def test_scan_finds_best_prices_and_arbitrage():
+    scan = scan_arbitrage(PRICES)
+    assert scan.best_odds[0].tolist() == [2.10, 2.05]
+    assert scan.best_book[0].tolist() == [0, 1]
+    assert scan.is_arbitrage.tolist() == [True, False, False]
+    assert np.isnan(scan.implied_sum[2])
+    assert scan.best_book[2, 1] == -1
+
+def test_stakes_return_target_payout():
+    stakes, profit = arbitrage_stakes([2.10, 2.05], target_payout=100)
+    assert stakes * np.array([2.10, 2.05]) == pytest.approx([100, 100])
+    assert profit == pytest.approx(100 - stakes.sum())
+    assert profit > 0
+
+def test_scanner_tick_updates():
+    scanner = ArbitrageScanner(PRICES)
+    assert scanner.opportunities().tolist() == [0]
+    assert scanner.update(0, 1, 1, 1.8) is False, "Lowering the best price should rescan the row"
+    assert scanner.best_odds[0, 1] == 1.9
+    assert scanner.best_book[0, 1] == 2
+    assert scanner.update(1, 0, 2, 2.2) is True
+    assert scanner.update(2, 1, 0, 1.6) is True
+    assert scanner.opportunities().tolist() == [1, 2]
+    stakes, books, profit = scanner.stakes(1, target_payout=100)
+    assert books.tolist() == [2, 2]
+    assert profit > 0
+
+def test_scanner_matches_full_rescan_after_random_ticks():
+    rng = np.random.default_rng(0)
+    prices = random_prices(rng)
+    scanner = ArbitrageScanner(prices)
+    for _ in range(2000):
+        index = tuple(rng.integers(0, n) for n in prices.shape)
+        price = NAN if rng.random() < 0.1 else prices.shape[1] / rng.uniform(0.85, 1.1)
+        scanner.update(*index, price)
+        prices[index] = price
+    scan = scan_arbitrage(prices)
+    assert np.array_equal(scanner.best_odds, scan.best_odds, equal_nan=True)
+    assert np.allclose(scanner.implied_sum, scan.implied_sum, equal_nan=True)
+    assert np.array_equal(scanner.is_arbitrage, scan.is_arbitrage)
+
+def test_scanner_update_many():
+    rng = np.random.default_rng(1)
+    prices = random_prices(rng)
+    scanner = ArbitrageScanner(prices)
+    markets, outcomes, books = (rng.integers(0, n, 50) for n in prices.shape)
+    new_prices = rng.uniform(1.5, 5.0, 50)
+    arbitrages = scanner.update_many(markets, outcomes, books, new_prices)
+    prices[markets, outcomes, books] = new_prices
+    scan = scan_arbitrage(prices)
+    assert np.array_equal(scanner.best_odds, scan.best_odds, equal_nan=True)
+    assert set(arbitrages.tolist()) == set(np.flatnonzero(scan.is_arbitrage)) & set(markets.tolist())
+
+def test_invalid_prices():
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        scan_arbitrage([[[2.0, 0.5]]])
+    with pytest.raises(ValueError):
+        scan_arbitrage([[2.0, 2.0]])
+    scanner = ArbitrageScanner(PRICES)
+    with pytest.raises(ValueError):
+        scanner.update(0, 0, 0, 1.0)
@@ -0,0 +1,95 @@
+# tests/test_backtest.py
+import csv
+import numpy as np
+import pytest
+from quantbets.backtest import Backtest, read_csv_chunks, run_backtest
+from quantbets.bankroll_management import kelly_criterion
+
+ROWS = [
+    # market_id, odds, result, probability, closing_odds
+    ('m1', 2.2, 1, 0.5, 2.0),
+    ('m1', 1.8, 0, 0.5, 1.85),
+    ('m2', 3.0, 0, 0.4, 2.8),
+    ('m2', 3.5, 0, 0.25, 3.6),
+    ('m2', 2.9, 1, 0.35, 2.9),
+    ('m3', 1.5, 1, 0.7, 1.45),
+    ('m3', 2.6, 0, 0.3, 2.75),
+]
+
+@pytest.fixture
+def bet_log(tmp_path):
+    path = tmp_path / 'bets.csv'
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['market_id', 'odds', 'result', 'probability', 'closing_odds'])
+        writer.writerows(ROWS)
+    return path
+
+def expected_result(bankroll=1000):
+    staked = pnl = 0.0
+    for _, odds, won, probability, _ in ROWS:
+        stake = float(kelly_criterion(bankroll, probability, odds))
+        if probability * odds - 1 > 0 and stake > 0:
+            staked += stake
+            pnl += stake * (odds - 1) if won else -stake
+    return staked, pnl
+
+def test_csv_chunks_are_bounded(bet_log):
+    chunks = list(read_csv_chunks(bet_log, chunk_size=3))
+    assert [len(chunk['odds']) for chunk in chunks] == [3, 3, 1]
+    assert chunks[0]['odds'].dtype == np.float64
+    assert chunks[0]['market_id'].tolist() == ['m1', 'm1', 'm2']
+
+def test_backtest_matches_manual_computation(bet_log):
+    result = run_backtest(bet_log, 1000)
+    staked, pnl = expected_result()
+    assert result.n_selections == len(ROWS)
+    assert result.n_bets == 4
+    assert result.staked == pytest.approx(staked)
+    assert result.pnl == pytest.approx(pnl)
+    assert result.yield_ == pytest.approx(pnl / staked)
+    assert result.roi == pytest.approx(pnl / 1000)
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5])
+def test_backtest_independent_of_chunk_size(bet_log, chunk_size):
+    reference = run_backtest(bet_log, 1000, chunk_size=100, method='shin')
+    result = run_backtest(bet_log, 1000, chunk_size=chunk_size, method='shin')
+    for field in reference._fields:
+        assert getattr(result, field) == pytest.approx(getattr(reference, field))
+
+def test_backtest_clv_uses_devigged_closing_odds():
+    chunk = {'market_id': np.array([1, 1]), 'odds': np.array([2.2, 1.7]), 'result': np.array([0, 1]),
+             'probability': np.array([0.5, 0.5]), 'closing_odds': np.array([1.9, 1.9])}
+    backtest = Backtest(100)
+    backtest.update(chunk)
+    result = backtest.finish()
+    assert result.n_bets == 1
+    assert result.clv == pytest.approx(2.2 * 0.5 - 1)
+
+def test_backtest_probability_from_sharp_odds():
+    chunk = {'market_id': np.array([1, 1]), 'odds': np.array([2.2, 1.7]), 'result': np.array([1, 0]),
+             'sharp_odds': np.array([1.95, 1.95])}
+    result = run_backtest([chunk], 100)
+    assert result.n_bets == 1
+    assert result.expected_pnl == pytest.approx(float(kelly_criterion(100, 0.5, 2.2)) * 0.1)
+    assert np.isnan(result.clv)
+
+def test_backtest_invalid_inputs(tmp_path):
+    with pytest.raises(ValueError):
+        Backtest(0)
+    with pytest.raises(ValueError):
+        run_backtest(str(tmp_path / 'bets.json'), 1000)
+    with pytest.raises(ValueError):
+        run_backtest([{'market_id': np.array([1]), 'odds': np.array([2.0]), 'result': np.array([1])}], 1000)
+
+def test_backtest_parquet(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    columns = list(zip(*ROWS))
+    table = pa.table({'market_id': list(columns[0]), 'odds': list(columns[1]), 'result': list(columns[2]),
+                      'probability': list(columns[3]), 'closing_odds': list(columns[4])})
+    path = tmp_path / 'bets.parquet'
+    pq.write_table(table, path)
+    staked, pnl = expected_result()
+    result = run_backtest(path, 1000, chunk_size=2)
+    assert result.pnl == pytest.approx(pnl)
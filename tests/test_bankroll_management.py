@@ -1,7 +1,11 @@
 # tests/test_bankroll_management.py
+import math
+import numpy as np
 import pytest
 from decimal import Decimal
-from quantbets.bankroll_management import kelly_criterion
+from quantbets.bankroll_management import (
+    _maximize_log_growth, kelly_criterion, kelly_criterion_batch, kelly_mutually_exclusive, kelly_simultaneous,
+)
 
 def test_kelly_criterion_probability_basic():
     result = kelly_criterion(bankroll='1000', win_input='0.5', odds='2.0', multiplier='1.0', input_type='probability')
@@ -86,3 +90,113 @@ def test_kelly_criterion_extremely_high_odds():
     # Testing with extremely high odds to ensure function handles large numbers well
     result = kelly_criterion('1000', '0.99', '1000', '1.0', 'probability')
     assert result < Decimal('1000'), "Bet size should be less than bankroll even with very high odds and high probability"
+
+def test_kelly_criterion_batch_matches_scalar():
+    probabilities = np.array([0.5, 0.6, 0.55, 0.99, 1.0])
+    odds = np.array([2.0, 2.0, 2.5, 1000.0, 2.5])
+    result = kelly_criterion_batch(1000, probabilities, odds, 0.5)
+    expected = [float(kelly_criterion(1000, p, o, 0.5)) for p, o in zip(probabilities, odds)]
+    assert result.dtype == np.float64
+    assert np.allclose(result, expected, rtol=1e-12, atol=0)
+
+def test_kelly_criterion_batch_true_odds_matches_scalar():
+    true_odds = np.array([2.0, 1.5, 1.8])
+    odds = np.array([2.0, 2.5, 2.1])
+    result = kelly_criterion_batch(1000, true_odds, odds, input_type='true_odds')
+    expected = [float(kelly_criterion(1000, t, o, 1.0, 'true_odds')) for t, o in zip(true_odds, odds)]
+    assert np.allclose(result, expected, rtol=1e-12, atol=0)
+
+def test_kelly_criterion_batch_broadcasts_scalars():
+    result = kelly_criterion_batch([1000, 2000], 0.6, 2.0)
+    assert result.shape == (2,)
+    assert result[1] == 2 * result[0]
+
+def test_kelly_criterion_batch_raises_with_scalar_messages():
+    with pytest.raises(ValueError, match="Bankroll must be a positive value"):
+        kelly_criterion_batch([1000, 0], 0.55, 2.5)
+    with pytest.raises(ValueError, match="Probability must be between 0 and 1"):
+        kelly_criterion_batch(1000, [0.55, 1.1], 2.5)
+    with pytest.raises(ValueError, match="True odds must be greater than 1."):
+        kelly_criterion_batch(1000, [1.5, 1.0], 2.5, input_type='true_odds')
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        kelly_criterion_batch(1000, 0.55, [2.5, 1.0])
+    with pytest.raises(ValueError, match="Multiplier must be between 0 and 1"):
+        kelly_criterion_batch(1000, 0.55, 2.5, [0.5, 0])
+
+def test_kelly_criterion_batch_nan_mode():
+    result = kelly_criterion_batch([1000, -1, 1000, 1000], [0.6, 0.6, np.nan, 0.6], [2.0, 2.0, 2.0, 1.0], errors='nan')
+    assert result[0] == pytest.approx(200.0)
+    assert all(math.isnan(value) for value in result[1:])
+
+def test_kelly_criterion_batch_invalid_arguments():
+    with pytest.raises(ValueError):
+        kelly_criterion_batch(1000, 0.55, 2.5, input_type='invalid_type')
+    with pytest.raises(ValueError):
+        kelly_criterion_batch(1000, 0.55, 2.5, errors='ignore')
+    with pytest.raises(ValueError):
+        kelly_criterion_batch(1000, ['invalid'], 2.5)
+
+def test_portfolio_kelly_single_bet_matches_kelly_criterion():
+    expected = float(kelly_criterion('1000', '0.6', '2.0', '0.5'))
+    assert kelly_mutually_exclusive(1000, [0.6], [2.0], 0.5)[0] == pytest.approx(expected, rel=1e-12)
+    assert kelly_simultaneous(1000, [0.6], [2.0], 0.5)[0] == pytest.approx(expected, rel=1e-9)
+
+def test_kelly_mutually_exclusive_matches_numerical_optimum():
+    probabilities = np.array([0.45, 0.3, 0.2])
+    odds = np.array([2.2, 3.5, 4.0])
+    stakes = kelly_mutually_exclusive(1000, probabilities, odds)
+    # One scenario per winning outcome plus the one where none of them wins
+    returns = np.vstack((np.where(np.eye(3, dtype=bool), odds - 1, -1.0), -np.ones(3)))
+    weights = np.append(probabilities, 1 - probabilities.sum())
+    assert stakes == pytest.approx(1000 * _maximize_log_growth(returns, weights), abs=1e-6)
+    assert stakes[2] == 0, "Outcome with negative expected return should not be backed"
+
+def test_kelly_mutually_exclusive_true_odds():
+    stakes = kelly_mutually_exclusive(1000, [2.0, 4.0], [2.2, 3.0], input_type='true_odds')
+    assert stakes == pytest.approx(kelly_mutually_exclusive(1000, [0.5, 0.25], [2.2, 3.0]))
+
+def test_kelly_mutually_exclusive_rejects_excess_probability():
+    with pytest.raises(ValueError, match="sum to at most 1"):
+        kelly_mutually_exclusive(1000, [0.6, 0.5], [2.0, 2.0])
+
+def test_kelly_simultaneous_bets_less_than_sum_of_single_bets():
+    stakes = kelly_simultaneous(1000, [0.6, 0.6], [2.0, 2.0])
+    single = float(kelly_criterion(1000, 0.6, 2.0))
+    assert stakes[0] == pytest.approx(stakes[1])
+    assert stakes.sum() < 2 * single
+    assert stakes[0] == pytest.approx(1000 * 0.25 / 1.3, rel=1e-9)
+
+def test_kelly_simultaneous_skips_negative_ev():
+    stakes = kelly_simultaneous(1000, [0.6, 0.3], [2.0, 2.0])
+    assert stakes[1] == 0
+    assert stakes[0] > 0
+
+def test_kelly_simultaneous_sampling_approximates_enumeration():
+    rng = np.random.default_rng(0)
+    probabilities = rng.uniform(0.3, 0.6, 8)
+    odds = 1 / probabilities * rng.uniform(0.95, 1.15, 8)
+    exact = kelly_simultaneous(1000, probabilities, odds)
+    sampled = kelly_simultaneous(1000, probabilities, odds, max_enumerate=0, n_samples=200000, seed=1)
+    assert sampled == pytest.approx(exact, abs=10)
+    assert np.array_equal(sampled, kelly_simultaneous(1000, probabilities, odds, max_enumerate=0,
+                                                      n_samples=200000, seed=1))
+
+def test_kelly_simultaneous_sampling_with_low_probabilities():
+    # The all-lose outcome is likely here; counting it twice used to zero every stake
+    probabilities, odds = np.full(14, 0.1), np.full(14, 11.5)
+    exact = kelly_simultaneous(1000, probabilities, odds, max_enumerate=14)
+    sampled = kelly_simultaneous(1000, probabilities, odds, n_samples=50000, seed=0)
+    assert exact.sum() == pytest.approx(195.6, abs=0.1)
+    assert sampled.sum() == pytest.approx(exact.sum(), rel=0.05)
+
+def test_portfolio_kelly_reuses_validation():
+    with pytest.raises(ValueError, match="Bankroll must be a positive value"):
+        kelly_simultaneous(0, [0.6], [2.0])
+    with pytest.raises(ValueError, match="Probability must be between 0 and 1"):
+        kelly_simultaneous(1000, [0.6, 1.2], [2.0, 2.0])
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        kelly_mutually_exclusive(1000, [0.6], [1.0])
+    with pytest.raises(ValueError, match="Multiplier must be between 0 and 1"):
+        kelly_mutually_exclusive(1000, [0.6], [2.0], multiplier=2)
+    with pytest.raises(ValueError):
+        kelly_simultaneous(1000, [0.6, 0.5], [2.0])
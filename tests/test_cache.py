@@ -0,0 +1,122 @@
+import threading
+
+import numpy as np
+import pytest
+
+from quantbets.bankroll_management import kelly_criterion_batch
+from quantbets.cache import CacheStats, ResultCache, price_key
+from quantbets.devig import calculate_true_odds_batch
+from quantbets.probability import calculate_ev_percentage_batch
+
+ODDS = [2.1, 3.4, 3.6]
+PROBABILITY = [0.5, 0.3, 0.2]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_results_match_batch_functions():
+    cache = ResultCache()
+    np.testing.assert_array_equal(cache.ev('v1', 'm1', ODDS, PROBABILITY),
+                                  calculate_ev_percentage_batch(ODDS, PROBABILITY))
+    np.testing.assert_array_equal(cache.kelly('v1', 'm1', ODDS, PROBABILITY, 1000, 0.5),
+                                  kelly_criterion_batch(1000, PROBABILITY, ODDS, 0.5))
+    expected = calculate_true_odds_batch(ODDS, offsets=[0, 3], method='shin')
+    for cached, value in zip(cache.true_odds('m1', ODDS, method='shin'), expected):
+        np.testing.assert_array_equal(cached, value)
+
+
+def test_hits_misses_and_keys():
+    cache = ResultCache()
+    first = cache.ev('v1', 'm1', ODDS, PROBABILITY)
+    assert cache.ev('v1', 'm1', list(ODDS), PROBABILITY) is first
+    assert not first.flags.writeable
+    cache.ev('v2', 'm1', ODDS, PROBABILITY)
+    cache.ev('v1', 'm2', ODDS, PROBABILITY)
+    cache.ev('v1', 'm1', [2.2, 3.4, 3.6], PROBABILITY)
+    cache.kelly('v1', 'm1', ODDS, PROBABILITY, 1000)
+    cache.kelly('v1', 'm1', ODDS, PROBABILITY, 2000)
+    assert cache.stats() == CacheStats(hits=1, misses=6, evictions=0, expirations=0, invalidations=0, size=6)
+
+
+def test_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    cache.ev('v1', 'a', ODDS, PROBABILITY)
+    cache.ev('v1', 'b', ODDS, PROBABILITY)
+    cache.ev('v1', 'a', ODDS, PROBABILITY)
+    cache.ev('v1', 'c', ODDS, PROBABILITY)
+    assert cache.stats().evictions == 1
+    cache.ev('v1', 'a', ODDS, PROBABILITY)
+    assert cache.stats().hits == 2
+    cache.ev('v1', 'b', ODDS, PROBABILITY)
+    assert cache.stats().misses == 4
+
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = ResultCache(ttl=10, clock=clock)
+    first = cache.ev('v1', 'm1', ODDS, PROBABILITY)
+    clock.now = 9.9
+    assert cache.ev('v1', 'm1', ODDS, PROBABILITY) is first
+    clock.now = 10.0
+    assert cache.ev('v1', 'm1', ODDS, PROBABILITY) is not first
+    assert cache.stats()[:4] == (1, 2, 0, 1)
+
+
+def test_invalidation():
+    cache = ResultCache()
+    for model_version in ('v1', 'v2'):
+        for market_id in ('m1', 'm2'):
+            cache.ev(model_version, market_id, ODDS, PROBABILITY)
+    cache.true_odds('m1', ODDS)
+    assert cache.invalidate(market_id='m1', model_version='v1') == 1
+    assert cache.invalidate(market_id='m1') == 2
+    assert cache.invalidate(model_version='v2') == 1
+    assert cache.invalidate(market_id='missing') == 0
+    assert len(cache) == 1
+    assert cache.invalidate() == 1
+    assert cache.stats().invalidations == 5
+    cache.clear()
+    assert cache.stats() == CacheStats(0, 0, 0, 0, 0, 0)
+
+
+def test_errors_are_not_cached():
+    cache = ResultCache()
+    with pytest.raises(ValueError):
+        cache.ev('v1', 'm1', [0.5, 2.0], [0.5, 0.5])
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=0)
+    with pytest.raises(ValueError):
+        ResultCache(ttl=0)
+
+
+def test_price_key():
+    assert price_key([2.0, 3.0]) == price_key(np.array([2, 3])) != price_key([3.0, 2.0])
+
+
+def test_threads():
+    cache = ResultCache(maxsize=50)
+    markets = [(f'm{i}', [2.0 + i / 100, 1.9]) for i in range(100)]
+
+    def work():
+        for _ in range(20):
+            for market_id, odds in markets:
+                cache.ev('v1', market_id, odds, [0.5, 0.5])
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats.hits + stats.misses == 8 * 20 * 100
+    assert stats.size == 50
+    # Concurrent misses of one key store it twice, the second store replacing the first
+    assert stats.misses - stats.evictions >= 50
+    assert sum(len(keys) for keys in cache._by_market.values()) == 50
@@ -0,0 +1,164 @@
+# tests/test_devig.py
+import numpy as np
+import pandas as pd
+import pytest
+from quantbets.devig import METHODS, calculate_true_odds_batch, iter_true_odds, market_offsets
+from quantbets.odds import calculate_true_odds
+
+MARKETS = [[1.9, 1.9], [2.5, 3.4, 2.9], [1.25, 4.2]]
+
+def flatten(markets):
+    odds = np.concatenate([np.asarray(m, dtype=float) for m in markets])
+    offsets = np.cumsum([0] + [len(m) for m in markets])
+    return odds, offsets
+
+def test_batch_matches_calculate_true_odds_per_market():
+    odds, offsets = flatten(MARKETS)
+    result = calculate_true_odds_batch(odds, offsets=offsets, tax_rate=5)
+    for market, start, stop in zip(MARKETS, offsets[:-1], offsets[1:]):
+        expected = calculate_true_odds({'odds': np.asarray(market, dtype=float)}, tax_rate=5)
+        for column in ('market_probability', 'adjusted_probability', 'true_odds'):
+            assert np.allclose(getattr(result, column)[start:stop], expected[column], rtol=1e-12)
+
+def test_batch_normalizes_each_market():
+    odds, offsets = flatten(MARKETS)
+    result = calculate_true_odds_batch(odds, offsets=offsets)
+    sums = np.add.reduceat(result.adjusted_probability, offsets[:-1])
+    assert np.allclose(sums, 1.0, rtol=1e-12)
+
+def test_market_ids_layouts_agree():
+    odds, offsets = flatten(MARKETS)
+    ids = np.repeat([10, 20, 30], np.diff(offsets))
+    contiguous = calculate_true_odds_batch(odds, market_ids=ids)
+    assert np.array_equal(contiguous.true_odds, calculate_true_odds_batch(odds, offsets=offsets).true_odds)
+    order = np.random.default_rng(0).permutation(len(odds))
+    shuffled = calculate_true_odds_batch(odds[order], market_ids=ids[order])
+    assert np.allclose(shuffled.true_odds, contiguous.true_odds[order], rtol=1e-12)
+
+def test_batch_does_not_mutate_input():
+    odds, offsets = flatten(MARKETS)
+    original = odds.copy()
+    calculate_true_odds_batch(odds, offsets=offsets)
+    assert np.array_equal(odds, original)
+
+def test_batch_invalid_layouts():
+    odds, offsets = flatten(MARKETS)
+    with pytest.raises(ValueError):
+        calculate_true_odds_batch(odds)
+    with pytest.raises(ValueError):
+        calculate_true_odds_batch(odds, offsets=[0, 2, 2, len(odds)])
+    with pytest.raises(ValueError):
+        calculate_true_odds_batch(odds, offsets=[0, 2])
+    with pytest.raises(ValueError):
+        calculate_true_odds_batch(odds, market_ids=[1, 2])
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        calculate_true_odds_batch([2.0, 1.0], offsets=[0, 2])
+
+def test_market_offsets():
+    assert market_offsets(['a', 'a', 'b', 'c', 'c']).tolist() == [0, 2, 3, 5]
+
+def test_iter_true_odds_handles_markets_split_across_chunks():
+    odds, offsets = flatten(MARKETS)
+    ids = np.repeat(['x', 'y', 'z'], np.diff(offsets))
+    chunks = [(ids[:1], odds[:1]), (ids[1:4], odds[1:4]), (ids[4:4], odds[4:4]), (ids[4:], odds[4:])]
+    streamed = list(iter_true_odds(chunks, tax_rate=2))
+    expected = calculate_true_odds_batch(odds, offsets=offsets, tax_rate=2)
+    assert [market_id for market_id, _ in streamed] == ['x', 'y', 'z']
+    assert np.allclose(np.concatenate([result.true_odds for _, result in streamed]), expected.true_odds, rtol=1e-12)
+
+def test_calculate_true_odds_invalid_input_leaves_frame_untouched():
+    frame = pd.DataFrame({'odds': [1.9, 1.9]})
+    with pytest.raises(ValueError, match="method must be one of"):
+        calculate_true_odds(frame, method='magic')
+    invalid = pd.DataFrame({'odds': [1.9, 0.5]})
+    with pytest.raises(ValueError):
+        calculate_true_odds(invalid, method='shin')
+    assert list(frame.columns) == ['odds'] and list(invalid.columns) == ['odds']
+
+def test_iter_true_odds_rejects_non_contiguous_markets():
+    with pytest.raises(ValueError, match="contiguous"):
+        list(iter_true_odds([([1, 2, 1, 2], [1.9, 1.9, 2.0, 2.0])]))
+    # Market 1 closes in the first chunk and reappears in the third
+    chunks = [([1, 1, 2], [1.9, 1.9, 2.0]), ([2], [2.0]), ([1, 1], [1.9, 1.9])]
+    with pytest.raises(ValueError, match="contiguous"):
+        list(iter_true_odds(chunks))
+
+def test_iter_true_odds_is_lazy():
+    def chunks():
+        yield [1, 1, 2], [1.9, 1.9, 2.0]
+        raise AssertionError("second chunk should not be requested yet")
+    stream = iter_true_odds(chunks())
+    market_id, result = next(stream)
+    assert market_id == 1
+    assert np.allclose(result.true_odds, [2.0, 2.0])
+
+
+def bisect(func, lo, hi):
+    # Reference root finder for a decreasing function, one market at a time
+    for _ in range(200):
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if func(mid) > 0 else (lo, mid)
+    return (lo + hi) / 2
+
+def reference_fair_probabilities(odds, method):
+    pi = 1 / np.asarray(odds, dtype=float)
+    total = pi.sum()
+    if method in ('power', 'logarithmic'):
+        k = bisect(lambda k: (pi ** k).sum() - 1, 0, 10)
+        return pi ** k
+    if method == 'odds_ratio':
+        c = bisect(lambda c: (pi / (c * (1 - pi) + pi)).sum() - 1, 1e-9, 10)
+        return pi / (c * (1 - pi) + pi)
+    def shin(z):
+        return (np.sqrt(z ** 2 + 4 * (1 - z) * pi ** 2 / total) - z) / (2 * (1 - z))
+    z = bisect(lambda z: shin(z).sum() - 1, -10, 1 - 1e-12)
+    return shin(z)
+
+@pytest.mark.parametrize('method', [m for m in METHODS if m != 'proportional'])
+def test_iterative_methods_match_reference(method):
+    markets = MARKETS + [[2.1, 2.1], [1.5, 4.5, 9.0, 15.0, 26.0]]
+    odds, offsets = flatten(markets)
+    result, info = calculate_true_odds_batch(odds, offsets=offsets, method=method, full_output=True)
+    assert info.converged.all()
+    assert np.abs(info.residual).max() <= 1e-12
+    assert (info.iterations > 0).all()
+    for market, start, stop in zip(markets, offsets[:-1], offsets[1:]):
+        expected = reference_fair_probabilities(market, method)
+        assert np.allclose(result.adjusted_probability[start:stop], expected, rtol=1e-9)
+
+def test_iterative_methods_shade_longshots():
+    odds, offsets = flatten([[1.25, 4.2]])
+    proportional = calculate_true_odds_batch(odds, offsets=offsets).adjusted_probability
+    for method in ('power', 'odds_ratio', 'shin'):
+        adjusted = calculate_true_odds_batch(odds, offsets=offsets, method=method).adjusted_probability
+        assert adjusted[1] < proportional[1], f"{method} should remove more margin from the longshot"
+
+def test_odds_ratio_is_constant_within_market():
+    odds, offsets = flatten([[2.5, 3.4, 2.9]])
+    result = calculate_true_odds_batch(odds, offsets=offsets, method='odds_ratio')
+    pi, p = result.market_probability, result.adjusted_probability
+    ratios = pi / (1 - pi) / (p / (1 - p))
+    assert np.allclose(ratios, ratios[0], rtol=1e-10)
+
+def test_iterative_methods_with_unsorted_market_ids():
+    odds, offsets = flatten(MARKETS)
+    ids = np.repeat([1, 2, 3], np.diff(offsets))
+    order = np.random.default_rng(1).permutation(len(odds))
+    grouped = calculate_true_odds_batch(odds, offsets=offsets, method='shin', tax_rate=3)
+    shuffled = calculate_true_odds_batch(odds[order], market_ids=ids[order], method='shin', tax_rate=3)
+    assert np.allclose(shuffled.adjusted_probability, grouped.adjusted_probability[order], rtol=1e-12)
+
+def test_solver_reports_non_convergence():
+    odds, offsets = flatten(MARKETS)
+    _, info = calculate_true_odds_batch(odds, offsets=offsets, method='power', max_iter=1, full_output=True)
+    assert not info.converged.all()
+    assert (info.iterations <= 1).all()
+
+def test_calculate_true_odds_method():
+    frame = calculate_true_odds({'odds': np.array([1.25, 4.2])}, method='power')
+    expected = reference_fair_probabilities([1.25, 4.2], 'power')
+    assert np.allclose(frame['adjusted_probability'], expected, rtol=1e-9)
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        calculate_true_odds_batch([1.9, 1.9], offsets=[0, 2], method='additive')
@@ -0,0 +1,126 @@
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from quantbets import instrumentation
+from quantbets.bankroll_management import kelly_criterion
+from quantbets.instrumentation import InMemorySink, Sink, instrumented, start_http_server, to_prometheus
+from quantbets.odds import Odds, calculate_true_odds
+from quantbets.probability import calculate_ev_percentage
+from quantbets.validation import ODDS_MESSAGE, PROBABILITY_MESSAGE
+
+
+def test_disabled_by_default():
+    assert instrumentation.get_sink() is None
+    assert kelly_criterion(1000, 0.55, 2.5, precision='fast') == pytest.approx(250.0)
+
+
+def test_references_taken_before_enable_are_recorded():
+    import quantbets
+    from quantbets import bankroll_management, odds, probability
+
+    early = quantbets.kelly_criterion
+    with instrumented() as sink:
+        early(1000, 0.55, 2.5)
+        quantbets.kelly_criterion(1000, 0.55, 2.5)
+        bankroll_management.kelly_criterion(1000, 0.55, 2.5)
+        # Odds.calculate_ev goes through the name odds.py imported from probability
+        odds.Odds(2.5).calculate_ev(0.5)
+        probability.calculate_ev_percentage(2.5, 0.5)
+    calls = sink.snapshot()['calls']
+    assert calls['kelly_criterion']['count'] == 3
+    assert calls['calculate_ev_percentage']['count'] == 2
+
+
+def test_nested_sinks():
+    with instrumented() as outer:
+        with instrumented() as inner:
+            kelly_criterion(1000, 0.55, 2.5)
+        assert instrumentation.get_sink() is outer
+        calculate_ev_percentage(2.5, 0.5)
+    assert instrumentation.get_sink() is None
+    assert list(inner.snapshot()['calls']) == ['kelly_criterion']
+    assert list(outer.snapshot()['calls']) == ['calculate_ev_percentage']
+
+
+def test_counts_calls_and_latency():
+    with instrumented() as sink:
+        Odds(2.5)
+        Odds(150, 'american')
+        calculate_ev_percentage(2.5, 0.5)
+        kelly_criterion(1000, 0.55, 2.5)
+        calculate_true_odds(pd.DataFrame({'odds': [1.9, 1.9]}))
+    assert instrumentation.get_sink() is None
+
+    calls = sink.snapshot()['calls']
+    assert {name: stats['count'] for name, stats in calls.items()} == {
+        'Odds': 2, 'calculate_ev_percentage': 1, 'kelly_criterion': 1, 'calculate_true_odds': 1}
+    for stats in calls.values():
+        assert sum(stats['buckets']) == stats['count']
+        assert stats['total'] > 0
+
+
+def test_counts_validation_failures():
+    with instrumented() as sink:
+        with pytest.raises(ValueError):
+            Odds(0.5)
+        with pytest.raises(ValueError):
+            calculate_ev_percentage(2.0, 1.5)
+        with pytest.raises(ValueError):
+            calculate_ev_percentage(2.0, -1)
+    data = sink.snapshot()
+    assert data['failures'] == {('Odds', ODDS_MESSAGE): 1, ('calculate_ev_percentage', PROBABILITY_MESSAGE): 2}
+    assert data['calls']['calculate_ev_percentage']['count'] == 2
+
+
+def test_custom_sink():
+    class ListSink(Sink):
+        def __init__(self):
+            self.names = []
+
+        def record_call(self, name, seconds):
+            self.names.append(name)
+
+    with instrumented(ListSink()) as sink:
+        kelly_criterion(1000, 0.55, 2.5)
+        with pytest.raises(ValueError):
+            kelly_criterion(-1, 0.55, 2.5)
+    assert sink.names == ['kelly_criterion', 'kelly_criterion']
+
+
+def test_histogram_buckets():
+    sink = InMemorySink(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        sink.record_call('f', seconds)
+    assert sink.snapshot()['calls']['f']['buckets'] == [2, 1, 1]
+    sink.reset()
+    assert sink.snapshot() == {'calls': {}, 'failures': {}}
+
+
+def test_prometheus_text():
+    sink = InMemorySink(buckets=(0.1, 1.0))
+    sink.record_call('f', 0.05)
+    sink.record_call('f', 0.5)
+    sink.record_failure('f', 'bad "input"')
+    text = to_prometheus(sink)
+    assert '# TYPE quantbets_call_duration_seconds histogram' in text
+    assert 'quantbets_call_duration_seconds_bucket{function="f",le="0.1"} 1' in text
+    assert 'quantbets_call_duration_seconds_bucket{function="f",le="1.0"} 2' in text
+    assert 'quantbets_call_duration_seconds_bucket{function="f",le="+Inf"} 2' in text
+    assert 'quantbets_call_duration_seconds_sum{function="f"} 0.55' in text
+    assert 'quantbets_call_duration_seconds_count{function="f"} 2' in text
+    assert 'quantbets_validation_failures_total{function="f",message="bad \\"input\\""} 1' in text
+
+
+def test_http_server():
+    sink = InMemorySink()
+    sink.record_call('kelly_criterion', 1e-5)
+    server = start_http_server(0, sink=sink)
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(url) as response:
+            assert response.read().decode() == to_prometheus(sink)
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import quantbets
+from quantbets.lazy import lazy_import
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code):
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def test_import_does_not_load_numpy_or_pandas():
+    assert run("import sys, quantbets; print('numpy' in sys.modules, 'pandas' in sys.modules)") == ['False', 'False']
+
+
+def test_scalar_core_does_not_load_numpy():
+    code = ("import sys\n"
+            "from quantbets import Odds, calculate_ev_percentage, kelly_criterion\n"
+            "Odds((5, 2), 'fractional').to_american()\n"
+            "calculate_ev_percentage(2.5, 0.5)\n"
+            "kelly_criterion(1000, 0.55, 2.5, precision='fast')\n"
+            "print('numpy' in sys.modules)")
+    assert run(code) == ['False']
+
+
+def test_vectorized_paths_load_numpy():
+    code = ("import sys, quantbets\n"
+            "print(quantbets.kelly_criterion_batch(1000, [0.55], [2.5]).dtype, 'numpy' in sys.modules)")
+    assert run(code) == ['float64', 'True']
+
+
+def test_lazy_exports():
+    from quantbets.odds import OddsArray
+    assert quantbets.OddsArray is OddsArray
+    assert quantbets.devig.__name__ == 'quantbets.devig'
+    assert set(quantbets.__all__) <= set(dir(quantbets))
+    with pytest.raises(AttributeError):
+        quantbets.missing
+
+
+def test_lazy_import():
+    proxy = lazy_import('numpy')
+    assert proxy.float64 is np.float64
+    assert 'float64' in vars(proxy)
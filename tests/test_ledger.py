@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from quantbets.bankroll_management import kelly_criterion_batch
+from quantbets.ledger import (
+    LOST, OPEN, VOID, WON, BankrollLedger, linear_drawdown_rule, step_drawdown_rule,
+)
+
+
+def test_place_and_settle():
+    ledger = BankrollLedger(1000, capacity=2)
+    ids = ledger.place([100, 50, 20], [2.5, 1.8, 3.0])
+    assert ids.tolist() == [0, 1, 2]
+    assert ledger.balance == 830 and ledger.open_exposure == 170 and ledger.equity == 1000
+    assert ledger.n_open == 3
+
+    profit = ledger.settle([1, 0], [LOST, WON])
+    np.testing.assert_allclose(profit, [-50, 150])
+    assert ledger.balance == pytest.approx(1080)
+    assert ledger.open_exposure == pytest.approx(20)
+    assert ledger.status.tolist() == [WON, LOST, OPEN]
+
+    assert ledger.settle([2], VOID).tolist() == [0]
+    assert ledger.balance == pytest.approx(1100)
+    assert ledger.open_exposure == 0 and ledger.n_open == 0
+
+
+def test_drawdown_follows_equity_path():
+    ledger = BankrollLedger(1000)
+    ids = ledger.place([100] * 4, 2.0)
+    # Equity 1100, 1000, 900, 1000: peak 1100, trough 900
+    ledger.settle(ids, [WON, LOST, LOST, WON])
+    assert ledger.peak == pytest.approx(1100)
+    assert ledger.max_drawdown == pytest.approx(200 / 1100)
+    assert ledger.drawdown == pytest.approx(100 / 1100)
+
+
+def test_matches_sequential_settlement():
+    rng = np.random.default_rng(0)
+    stakes, odds = rng.uniform(1, 5, 1000), rng.uniform(1.5, 4.0, 1000)
+    results = rng.choice([LOST, WON, VOID], 1000)
+    batch = BankrollLedger(10000)
+    batch.settle(batch.place(stakes, odds), results)
+    one_by_one = BankrollLedger(10000)
+    ids = one_by_one.place(stakes, odds)
+    for bet_id, result in zip(ids, results):
+        one_by_one.settle([bet_id], result)
+    for name in ('balance', 'peak', 'max_drawdown'):
+        assert getattr(batch, name) == pytest.approx(getattr(one_by_one, name), rel=1e-12)
+
+
+def test_settle_empty_batch():
+    ledger = BankrollLedger(1000)
+    ledger.place(100, 2.0)
+    for bet_ids, results in (([], []), (np.empty(0, dtype=np.int64), WON)):
+        profit = ledger.settle(bet_ids, results)
+        assert profit.dtype == np.float64 and profit.shape == (0,)
+    assert ledger.balance == 900 and ledger.n_open == 1 and ledger.max_drawdown == 0
+
+
+def test_invalid_bets():
+    ledger = BankrollLedger(100)
+    with pytest.raises(ValueError):
+        ledger.place([60, 50], 2.0)
+    with pytest.raises(ValueError):
+        ledger.place(0, 2.0)
+    with pytest.raises(ValueError):
+        ledger.place(10, 1.0)
+    ids = ledger.place([10, 10], 2.0)
+    with pytest.raises(ValueError):
+        ledger.settle([5], WON)
+    with pytest.raises(ValueError):
+        ledger.settle([0, 0], WON)
+    with pytest.raises(ValueError):
+        ledger.settle(ids, OPEN)
+    with pytest.raises(ValueError):
+        ledger.settle(ids, 1.5)
+    ledger.settle([0], WON)
+    with pytest.raises(ValueError):
+        ledger.settle([0], WON)
+    assert ledger.n_open == 1
+    with pytest.raises(ValueError):
+        BankrollLedger(0)
+
+
+def test_size_uses_balance():
+    ledger = BankrollLedger(1000)
+    ledger.place(200, 2.0)
+    probability, odds = np.array([0.55, 0.4]), np.array([2.5, 2.0])
+    np.testing.assert_allclose(ledger.size(probability, odds, 0.5),
+                               kelly_criterion_batch(800, probability, odds, 0.5))
+
+
+def test_drawdown_rules():
+    rule = linear_drawdown_rule(0.4)
+    assert rule(0) == 1 and rule(0.1) == pytest.approx(0.75) and rule(0.5) == 0
+    steps = step_drawdown_rule([0.1, 0.2], [0.5, 0])
+    assert [steps(d) for d in (0, 0.1, 0.15, 0.2, 0.9)] == [1, 0.5, 0.5, 0, 0]
+    with pytest.raises(ValueError):
+        linear_drawdown_rule(0)
+    with pytest.raises(ValueError):
+        step_drawdown_rule([0.2, 0.1], [0.5, 0.2])
+    with pytest.raises(ValueError):
+        step_drawdown_rule([0.1], [1.5])
+
+    ledger = BankrollLedger(1000)
+    ledger.settle(ledger.place(100, 2.0), LOST)
+    np.testing.assert_allclose(ledger.size([0.55], [2.5], 1.0, drawdown_rule=rule),
+                               kelly_criterion_batch(900, [0.55], [2.5], 0.75))
+    ledger.settle(ledger.place(400, 2.0), LOST)
+    assert ledger.size([0.55], [2.5], drawdown_rule=rule).tolist() == [0.0]
+    # Inputs are still validated while the rule stops betting
+    with pytest.raises(ValueError):
+        ledger.size([1.5], [2.5], drawdown_rule=rule)
+    with pytest.raises(ValueError):
+        ledger.size([0.55], [0.5], drawdown_rule=rule)
+    assert np.isnan(ledger.size([1.5, 0.55], [2.5, 2.5], drawdown_rule=rule, errors='nan')).tolist() == [True, False]
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from quantbets.bankroll_management import kelly_criterion, kelly_criterion_batch
+from quantbets.devig import calculate_true_odds_batch
+from quantbets.market import Market
+from quantbets.probability import calculate_ev_percentage, calculate_ev_percentage_batch
+
+
+def full_recomputation(market, tax_rate=0):
+    selections = market.selections
+    odds = np.array([market.odds(s) for s in selections])
+    fair = calculate_true_odds_batch(odds, offsets=[0, len(odds)], tax_rate=tax_rate).adjusted_probability
+    probability = np.array([market._estimates.get(s, f) for s, f in zip(selections, fair)])
+    return (fair, calculate_ev_percentage_batch(odds, probability),
+            kelly_criterion_batch(market.bankroll, probability, odds, market.multiplier))
+
+
+def test_matches_full_recomputation_after_random_ticks():
+    rng = np.random.default_rng(0)
+    selections = list(range(6))
+    market = Market({s: 6.0 for s in selections}, {0: 0.2, 3: 0.15}, bankroll=500, multiplier=0.5, tax_rate=2,
+                    resum_interval=0)
+
+    for _ in range(5000):
+        selection = int(rng.integers(len(selections)))
+        if rng.random() < 0.1:
+            market.set_probability(selection, None if rng.random() < 0.3 else float(rng.uniform(0.05, 0.3)))
+        else:
+            market.tick(selection, float(rng.uniform(1.5, 12.0)))
+
+    fair, ev, stake = full_recomputation(market, tax_rate=2)
+    np.testing.assert_allclose([market.fair_probability(s) for s in selections], fair, rtol=1e-12)
+    np.testing.assert_allclose([market.ev(s) for s in selections], ev, rtol=1e-12)
+    np.testing.assert_allclose([market.stake(s) for s in selections], stake, rtol=1e-12)
+
+
+def test_add_and_remove_selections():
+    market = Market({'home': 2.0, 'away': 2.0})
+    market.tick('draw', 4.0, 0.3)
+    assert market.overround == pytest.approx(1.25)
+    market.remove('home')
+    assert market.selections == ['away', 'draw']
+    assert market.overround == pytest.approx(0.75)
+    fair, ev, stake = full_recomputation(market)
+    np.testing.assert_allclose([market.fair_probability(s) for s in market.selections], fair)
+    np.testing.assert_allclose([market.stake(s) for s in market.selections], stake)
+
+
+def test_matches_scalar_functions():
+    market = Market({'a': 2.5, 'b': 1.6}, {'a': 0.45}, bankroll=1000, multiplier=0.25)
+    assert market.ev('a') == calculate_ev_percentage(2.5, 0.45, precision='fast')
+    assert market.stake('a') == kelly_criterion(1000, 0.45, 2.5, 0.25, precision='fast')
+
+
+def test_resum_bounds_drift():
+    market = Market({'a': 2.0, 'b': 2.0}, resum_interval=100)
+    for price in np.linspace(1.01, 50.0, 1000):
+        market.tick('a', float(price))
+    market.tick('a', 2.0)
+    assert market.ticks == 1003
+    assert market.overround == pytest.approx(1.0, abs=1e-15)
+    market.resum()
+    assert market.overround == 1.0
+
+
+def test_invalid_ticks():
+    market = Market({'a': 2.0, 'b': 2.0})
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        market.tick('a', 1.0)
+    with pytest.raises(ValueError, match="Probability must be between 0 and 1, inclusive."):
+        market.tick('a', 2.1, 1.5)
+    with pytest.raises(KeyError):
+        market.set_probability('c', 0.5)
+    assert market.overround == 1.0
+    with pytest.raises(ValueError, match="Bankroll must be a positive value."):
+        Market({'a': 2.0}, bankroll=0)
@@ -1,7 +1,9 @@
 # tests/test_odds.py
+import pickle
+import numpy as np
 import pytest
 from decimal import Decimal
-from quantbets.odds import Odds
+from quantbets.odds import Odds, OddsArray
 
 def test_decimal_to_fractional_conversion():
     odds = Odds(2.5)  # Example for a constructor that takes decimal odds by default
@@ -96,4 +98,98 @@ def test_odds_representation():
     representation = str(odds)  # Assuming you implement a __str__ method in your Odds class
     assert "Decimal: 2.5" in representation
     assert "Fractional: (3, 2)" in representation or "Fractional: 3/2" in representation
-    assert "American: +150" in representation
\ No newline at end of file
+    assert "American: +150" in representation
+
+
+def test_odds_array_conversions_match_scalar():
+    prices = [1.2, 1.5, 1.91, 2.0, 2.5, 3.0, 11.0]
+    array = OddsArray(prices)
+    for value, american, probability in zip(prices, array.to_american(), array.odds_to_probability()):
+        odds = Odds(value)
+        assert american == pytest.approx(float(odds.to_american()), rel=1e-12)
+        assert probability == pytest.approx(float(odds.odds_to_probability()), rel=1e-12)
+
+def test_odds_array_from_american_and_fractional():
+    american = OddsArray.from_american([150, -200, 100])
+    assert np.allclose(american.to_decimal(), [2.5, 1.5, 2.0], rtol=1e-12)
+    fractional = OddsArray.from_fractional([3, 1, 5], [2, 2, 1])
+    assert np.allclose(fractional.to_decimal(), [2.5, 1.5, 6.0], rtol=1e-12)
+
+def test_odds_array_to_fractional():
+    numerators, denominators = OddsArray([2.5, 3.0, 1.91]).to_fractional()
+    assert numerators.tolist() == [3, 2, 91]
+    assert denominators.tolist() == [2, 1, 100]
+
+def test_odds_array_ev_matches_scalar():
+    array = OddsArray([2.0, 2.5])
+    ev = array.calculate_ev([0.55, 0.5])
+    assert ev == pytest.approx([float(Odds(2.0).calculate_ev(0.55)), float(Odds(2.5).calculate_ev(0.5))], rel=1e-12)
+
+def test_odds_array_round_trip():
+    odds = [Odds(2.5), Odds(150, odds_type='american'), Odds((1, 2), odds_type='fractional')]
+    array = OddsArray.from_odds(odds)
+    assert array.to_decimal().tolist() == [2.5, 2.5, 1.5]
+    assert [o.to_decimal() for o in array.to_odds()] == [Decimal('2.5'), Decimal('2.5'), Decimal('1.5')]
+    assert array[1].to_decimal() == Decimal('2.5')
+    assert len(array[1:]) == 2
+
+def test_odds_array_round_trip_keeps_short_decimals():
+    array = OddsArray.from_odds([Odds('1.91')])
+    assert array.to_odds()[0].to_decimal() == Decimal('1.91')
+    assert array.to_odds()[0].to_fractional() == (91, 100)
+    assert array[0].to_fractional() == (91, 100)
+
+def test_odds_array_is_read_only_copy():
+    prices = np.array([2.0, 3.0])
+    array = OddsArray(prices)
+    prices[0] = 5.0
+    assert array.to_decimal()[0] == 2.0
+    with pytest.raises(ValueError):
+        array.to_decimal()[0] = 4.0
+
+def test_odds_array_invalid_values():
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        OddsArray([2.0, 1.0])
+    with pytest.raises(ValueError, match="American odds cannot be zero."):
+        OddsArray.from_american([150, 0])
+    with pytest.raises(ValueError, match="Fractional odds must be positive values."):
+        OddsArray.from_fractional([1, -1], [2, 2])
+    with pytest.raises(ValueError):
+        OddsArray(['invalid'])
+
+
+def test_odds_are_slotted_and_immutable():
+    odds = Odds(2.5)
+    assert not hasattr(odds, '__dict__')
+    with pytest.raises(AttributeError):
+        odds.odds = Decimal('3')
+    with pytest.raises(AttributeError):
+        odds.extra = 1
+    with pytest.raises(AttributeError):
+        del odds.odds_type
+
+def test_odds_conversions_are_cached():
+    odds = Odds(-110, odds_type='american')
+    assert odds.to_fractional() is odds.to_fractional()
+    assert odds.odds_to_probability() is odds.odds_to_probability()
+    assert odds.to_decimal() is odds.decimal_odds
+    assert odds.to_american() == Decimal('-110')
+
+def test_odds_reject_mismatched_format():
+    with pytest.raises(ValueError):
+        Odds(2.5, odds_type='fractional')
+    with pytest.raises(ValueError):
+        Odds((3, 2), odds_type='american')
+
+def test_interned_odds_are_shared():
+    first = Odds.interned(2.5)
+    assert Odds.interned(2.5) is first
+    assert Odds.interned(2.5, precision='fast') is not first
+    assert Odds.interned((5, 2), odds_type='fractional').to_decimal() == Decimal('3.5')
+    with pytest.raises(ValueError):
+        Odds.interned([2.5])
+
+def test_odds_pickle_round_trip():
+    odds = pickle.loads(pickle.dumps(Odds(150, odds_type='american')))
+    assert odds.to_decimal() == Decimal('2.5')
+    assert odds.odds_type == 'american'
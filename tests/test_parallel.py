@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from quantbets.bankroll_management import kelly_criterion_batch
+from quantbets.parallel import (
+    MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, ParallelEvaluator, SharedArray, calculate_ev_percentage_parallel,
+    chunk_size_for, kelly_criterion_parallel,
+)
+from quantbets.probability import calculate_ev_percentage_batch
+
+rng = np.random.default_rng(0)
+ODDS = rng.uniform(1.1, 6.0, 10000)
+PROBABILITY = rng.uniform(0.0, 1.0, 10000)
+
+
+@pytest.mark.parametrize('backend', ['process', 'thread'])
+def test_matches_batch_functions(backend):
+    with ParallelEvaluator(n_jobs=2, backend=backend, chunk_size=1500) as evaluator:
+        np.testing.assert_array_equal(evaluator.calculate_ev_percentage(ODDS, PROBABILITY),
+                                      calculate_ev_percentage_batch(ODDS, PROBABILITY))
+        np.testing.assert_array_equal(evaluator.kelly_criterion(100, PROBABILITY, ODDS, 0.5),
+                                      kelly_criterion_batch(100, PROBABILITY, ODDS, 0.5))
+        true_odds = evaluator.kelly_criterion([[100], [200]], 1 / PROBABILITY[:3000].clip(0.01), ODDS[:3000],
+                                              input_type='true_odds')
+        assert true_odds.shape == (2, 3000)
+        np.testing.assert_array_equal(true_odds, kelly_criterion_batch(
+            [[100], [200]], 1 / PROBABILITY[:3000].clip(0.01), ODDS[:3000], input_type='true_odds'))
+
+
+@pytest.mark.parametrize('backend', ['process', 'thread'])
+def test_errors_across_chunks(backend):
+    probability = PROBABILITY.copy()
+    probability[9000] = 1.5
+    with ParallelEvaluator(n_jobs=2, backend=backend, chunk_size=1500) as evaluator:
+        with pytest.raises(ValueError, match="Probability must be between 0 and 1, inclusive."):
+            evaluator.kelly_criterion(100, probability, ODDS)
+        ev = evaluator.calculate_ev_percentage(ODDS, probability, errors='nan')
+    assert np.flatnonzero(np.isnan(ev)).tolist() == [9000]
+
+
+def test_shared_inputs_and_output():
+    with SharedArray.from_array(ODDS) as odds, SharedArray(len(ODDS)) as out:
+        result = kelly_criterion_parallel(100, 0.5, odds, n_jobs=2, chunk_size=1500)
+        np.testing.assert_array_equal(result, kelly_criterion_batch(100, 0.5, ODDS))
+        with ParallelEvaluator(n_jobs=2, chunk_size=1500) as evaluator:
+            evaluator.calculate_ev_percentage(odds, PROBABILITY, out=out)
+        np.testing.assert_array_equal(out.array, calculate_ev_percentage_batch(ODDS, PROBABILITY))
+
+
+def test_small_inputs_run_in_process():
+    assert calculate_ev_percentage_parallel(2.0, 0.6, n_jobs=4) == pytest.approx(0.2)
+    out = np.empty(3)
+    result = kelly_criterion_parallel(100, [0.5, 0.6, 0.7], 2.0, n_jobs=4)
+    np.testing.assert_allclose(ParallelEvaluator(4).kelly_criterion(100, [0.5, 0.6, 0.7], 2.0, out=out), result)
+    np.testing.assert_allclose(out, [0.0, 20.0, 40.0])
+
+
+def test_chunk_size_for():
+    assert chunk_size_for(1000, 8) == MIN_CHUNK_SIZE
+    assert chunk_size_for(10 ** 9, 8) == MAX_CHUNK_SIZE
+    assert chunk_size_for(8 * 4 * 100000, 8) == 100000
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="Backend must be one of process, thread."):
+        ParallelEvaluator(backend='gpu')
+    with pytest.raises(ValueError, match="Odds and probability must be numeric values."):
+        calculate_ev_percentage_parallel(['a'], 0.5)
+    with pytest.raises(ValueError, match="input_type must be either 'probability' or 'true_odds'."):
+        kelly_criterion_parallel(100, 0.5, 2.0, input_type='odds')
@@ -0,0 +1,86 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from quantbets.bankroll_management import kelly_criterion_batch
+from quantbets.devig import calculate_true_odds_batch
+from quantbets.parlay import LEGS_MESSAGE, enumerate_parlays, kelly_parlays, price_parlays
+
+ODDS = np.array([1.9, 1.95, 2.2, 1.7, 3.0, 1.4])
+PROBABILITY = np.array([0.55, 0.45, 0.5, 0.52, 0.36, 0.66])
+MARKET_IDS = np.array([0, 0, 1, 1, 2, 2])
+
+
+def brute_force(odds, probability, size, min_ev, market_ids):
+    return sorted(combo for combo in itertools.combinations(range(len(odds)), size)
+                  if len(set(market_ids[list(combo)])) == size
+                  and np.prod(odds[list(combo)] * probability[list(combo)]) - 1 >= min_ev)
+
+
+def test_price_parlays():
+    legs = np.array([[0, 2, 4], [1, 3, -1], [5, -1, -1]])
+    prices = price_parlays(legs, ODDS, PROBABILITY, market_ids=MARKET_IDS)
+    fair = calculate_true_odds_batch(ODDS, market_ids=MARKET_IDS).adjusted_probability
+    for row, combo in enumerate([[0, 2, 4], [1, 3], [5]]):
+        assert prices.odds[row] == pytest.approx(np.prod(ODDS[combo]), rel=1e-14)
+        assert prices.probability[row] == pytest.approx(np.prod(PROBABILITY[combo]), rel=1e-14)
+        assert prices.fair_odds[row] == pytest.approx(1 / np.prod(fair[combo]), rel=1e-14)
+        assert prices.ev[row] == pytest.approx(np.prod(ODDS[combo] * PROBABILITY[combo]) - 1, rel=1e-12)
+
+
+def test_price_parlays_defaults_to_fair_probability():
+    prices = price_parlays([[0, 2]], ODDS, offsets=[0, 2, 4, 6], tax_rate=5)
+    fair = calculate_true_odds_batch(ODDS, offsets=[0, 2, 4, 6], tax_rate=5).adjusted_probability
+    assert prices.probability[0] == pytest.approx(fair[0] * fair[2], rel=1e-14)
+    implied = price_parlays([[0, 2]], ODDS)
+    assert implied.ev[0] == pytest.approx(0.0, abs=1e-14)
+
+
+def test_invalid_parlays():
+    legs = [[0, 1], [0, 0], [0, 6], [-1, -1], [0, -2], [0, 2]]
+    with pytest.raises(ValueError, match=LEGS_MESSAGE):
+        price_parlays(legs, ODDS, PROBABILITY, market_ids=MARKET_IDS)
+    prices = price_parlays(legs, ODDS, PROBABILITY, market_ids=MARKET_IDS, errors='nan')
+    assert np.isnan(prices.ev).tolist() == [True] * 5 + [False]
+    # Without markets, only repeated legs conflict
+    assert not np.isnan(price_parlays([[0, 1]], ODDS, errors='nan').ev).any()
+    with pytest.raises(ValueError):
+        price_parlays([0, 1], ODDS)
+    with pytest.raises(ValueError):
+        price_parlays([[0, 1]], [0.5, 2.0])
+
+
+@pytest.mark.parametrize('size', [1, 2, 3])
+@pytest.mark.parametrize('min_ev', [-1.0, 0.0, 0.1])
+def test_enumerate_parlays_matches_brute_force(size, min_ev):
+    legs = enumerate_parlays(ODDS, PROBABILITY, size, min_ev, market_ids=MARKET_IDS)
+    assert sorted(map(tuple, legs.tolist())) == brute_force(ODDS, PROBABILITY, size, min_ev, MARKET_IDS)
+
+
+def test_enumerate_parlays_random_markets():
+    rng = np.random.default_rng(3)
+    odds = rng.uniform(1.2, 5.0, 30)
+    probability = np.clip(rng.uniform(0.85, 1.2, 30) / odds, 0, 1)
+    probability[7] = 0
+    market_ids = np.repeat(np.arange(10), 3)
+    for size in (2, 3, 4):
+        legs = enumerate_parlays(odds, probability, size, 0.05, market_ids=market_ids)
+        assert sorted(map(tuple, legs.tolist())) == brute_force(odds, probability, size, 0.05, market_ids)
+        assert (price_parlays(legs, odds, probability, market_ids=market_ids).ev >= 0.05 - 1e-12).all()
+
+
+def test_enumerate_parlays_limits():
+    assert enumerate_parlays(ODDS, PROBABILITY, 7).shape == (0, 7)
+    with pytest.raises(ValueError):
+        enumerate_parlays(ODDS, PROBABILITY, 3, -1.0, limit=10)
+    with pytest.raises(ValueError):
+        enumerate_parlays(ODDS, None, 2)
+    with pytest.raises(ValueError):
+        enumerate_parlays(ODDS, PROBABILITY, 0)
+
+
+def test_kelly_parlays():
+    prices = price_parlays([[0, 2], [5, -1]], ODDS, PROBABILITY)
+    np.testing.assert_allclose(kelly_parlays(1000, prices, 0.5),
+                               kelly_criterion_batch(1000, prices.probability, prices.odds, 0.5))
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from quantbets.odds import Odds, OddsArray
+from quantbets.parsing import AMERICAN, DECIMAL, FRACTIONAL, INVALID, parse_odds
+
+VALID = [('2.50', 'decimal', '2.50'), ('1.01', 'decimal', '1.01'), (' 1.91\r', 'decimal', '1.91'),
+         ('5/2', 'fractional', ('5', '2')), ('1.5/1', 'fractional', ('1.5', '1')),
+         ('+150', 'american', '150'), ('-110', 'american', '-110'), ('+99.5', 'american', '99.5')]
+INVALID_STRINGS = ['', '   ', 'abc', '2..5', '2 5', '1e3', 'nan', 'inf', '0.5', '1', '1/0', '0/1', '-5/2', '/2',
+                   '2/', '1/2/3', '+', '+-110', '+0', '2.5-', '1234567890123456']
+
+
+def test_detects_formats_and_matches_odds():
+    parsed = parse_odds([value for value, _, _ in VALID])
+    assert not parsed.invalid.any()
+    for (_, odds_type, price), decimal_odds, code in zip(VALID, parsed.decimal_odds, parsed.formats):
+        assert decimal_odds == pytest.approx(float(Odds(price, odds_type).to_decimal()), rel=1e-15)
+        assert code == {'decimal': DECIMAL, 'fractional': FRACTIONAL, 'american': AMERICAN}[odds_type]
+
+
+def test_invalid_entries_are_masked():
+    parsed = parse_odds(INVALID_STRINGS + ['2.5'])
+    assert parsed.invalid.tolist() == [True] * len(INVALID_STRINGS) + [False]
+    assert np.isnan(parsed.decimal_odds[:-1]).all()
+    assert (parsed.formats[:-1] == INVALID).all()
+    assert parsed.decimal_odds[-1] == 2.5
+
+
+def test_decimal_results_equal_float():
+    values = [f'{x:.3f}' for x in np.random.default_rng(0).uniform(1.001, 1000, 10000)]
+    np.testing.assert_array_equal(parse_odds(values).decimal_odds, np.array(values, dtype=np.float64))
+
+
+def test_input_types_agree():
+    values = ['2.50', '5/2', '+150', '-110', 'bad']
+    expected = parse_odds(values)
+    for variant in ([value.encode() for value in values], np.array(values), np.array(values, dtype='S'),
+                    '\n'.join(values).encode(), ('\n'.join(values) + '\n').encode(),
+                    bytearray('\r\n'.join(values).encode()), ','.join(values)):
+        sep = ',' if isinstance(variant, str) else b'\n'
+        if isinstance(variant, str):
+            variant = variant.encode()
+        parsed = parse_odds(variant, sep=sep)
+        np.testing.assert_array_equal(parsed.decimal_odds, expected.decimal_odds)
+        np.testing.assert_array_equal(parsed.invalid, expected.invalid)
+
+
+def test_non_ascii_and_missing_entries():
+    parsed = parse_odds(['１.5', None, '2.5'])
+    assert parsed.invalid.tolist() == [True, True, False]
+
+
+def test_homogeneous_columns():
+    parsed = parse_odds(['150', '+150', '-110', '5/2'], 'american')
+    np.testing.assert_allclose(parsed.decimal_odds[:3], [2.5, 2.5, 1 + 100 / 110])
+    assert parsed.invalid.tolist() == [False, False, False, True]
+    assert parse_odds(['2.5', '+2.5', '5/2'], 'Decimal').invalid.tolist() == [False, True, True]
+    assert parse_odds(['5/2', '2.5'], 'fractional').invalid.tolist() == [False, True]
+    with pytest.raises(ValueError):
+        parse_odds(['2.5'], 'moneyline')
+
+
+def test_empty_input():
+    for values in ([], b'', np.array([], dtype='S')):
+        parsed = parse_odds(values)
+        assert parsed.decimal_odds.shape == parsed.invalid.shape == (0,)
+
+
+def test_blocks():
+    values = ['2.5', '5/2', '-110', 'x'] * 20000
+    parsed = parse_odds(values)
+    assert parsed.invalid.sum() == 20000
+    np.testing.assert_array_equal(parsed.decimal_odds[4:8], parsed.decimal_odds[-4:])
+
+
+def test_odds_array_from_strings():
+    array = OddsArray.from_strings(['2.50', '5/2', '+150'])
+    np.testing.assert_allclose(array.to_decimal(), [2.5, 3.5, 2.5])
+    with pytest.raises(ValueError, match="Invalid odds format or type."):
+        OddsArray.from_strings(['2.50', 'x'])
@@ -0,0 +1,110 @@
+# tests/test_precision.py
+import itertools
+import threading
+import pytest
+from decimal import Decimal
+from quantbets.bankroll_management import kelly_criterion
+from quantbets.odds import Odds
+from quantbets.precision import get_precision, set_precision, precision_context
+from quantbets.probability import calculate_ev_percentage
+
+PROBABILITIES = ['0', '0.01', '0.3', '0.5', '0.55', '0.99', '1']
+ODDS = ['1.01', '1.5', '1.91', '2', '2.5', '10', '1000']
+
+def assert_agree(exact, fast):
+    assert isinstance(exact, Decimal)
+    assert isinstance(fast, float)
+    assert fast == pytest.approx(float(exact), rel=1e-12, abs=1e-12)
+
+def test_kelly_criterion_modes_agree():
+    for probability, odds in itertools.product(PROBABILITIES, ODDS):
+        exact = kelly_criterion('1000', probability, odds, '0.5', precision='exact')
+        fast = kelly_criterion('1000', probability, odds, '0.5', precision='fast')
+        assert_agree(exact, fast)
+
+def test_kelly_criterion_true_odds_modes_agree():
+    for true_odds, odds in itertools.product(ODDS, ODDS):
+        exact = kelly_criterion('1000', true_odds, odds, '1', 'true_odds', precision='exact')
+        fast = kelly_criterion('1000', true_odds, odds, '1', 'true_odds', precision='fast')
+        assert_agree(exact, fast)
+
+def test_calculate_ev_percentage_modes_agree():
+    for probability, odds in itertools.product(PROBABILITIES, ODDS):
+        assert_agree(calculate_ev_percentage(odds, probability, precision='exact'),
+                     calculate_ev_percentage(odds, probability, precision='fast'))
+
+def test_odds_modes_agree():
+    cases = [(value, 'decimal') for value in ODDS[1:]] + [(150, 'american'), (-110, 'american'), ((5, 2), 'fractional')]
+    for value, odds_type in cases:
+        exact = Odds(value, odds_type, precision='exact')
+        fast = Odds(value, odds_type, precision='fast')
+        assert_agree(exact.to_decimal(), fast.to_decimal())
+        assert_agree(exact.to_american(), fast.to_american())
+        assert_agree(exact.odds_to_probability(), fast.odds_to_probability())
+        assert_agree(exact.calculate_ev('0.4'), fast.calculate_ev('0.4'))
+
+def test_fast_mode_shares_validation():
+    with pytest.raises(ValueError, match="Bankroll must be a positive value"):
+        kelly_criterion('0', '0.55', '2.5', precision='fast')
+    with pytest.raises(ValueError, match="Multiplier must be between 0 and 1"):
+        kelly_criterion('1000', '0.55', '2.5', '1.1', precision='fast')
+    with pytest.raises(ValueError, match="Probability must be between 0 and 1"):
+        calculate_ev_percentage(2.5, 1.5, precision='fast')
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        Odds(0.5, precision='fast')
+    with pytest.raises(ValueError):
+        kelly_criterion('1000', 'nan', '2.5', precision='fast')
+    with pytest.raises(ValueError):
+        Odds('invalid', precision='fast')
+
+def test_global_precision_setting():
+    assert get_precision() == 'exact'
+    set_precision('fast')
+    try:
+        assert isinstance(kelly_criterion(1000, 0.6, 2.0), float)
+        assert isinstance(kelly_criterion(1000, 0.6, 2.0, precision='exact'), Decimal)
+    finally:
+        set_precision('exact')
+    assert isinstance(calculate_ev_percentage(2.0, 0.6), Decimal)
+
+def test_precision_context():
+    with precision_context('fast'):
+        assert isinstance(Odds(2.5).odds_to_probability(), float)
+    assert get_precision() == 'exact'
+
+def test_precision_context_is_thread_local():
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def compute(precision):
+        with precision_context(precision):
+            # Both threads are inside their block before either computes or leaves it
+            barrier.wait()
+            results[precision] = (get_precision(), type(kelly_criterion(1000, 0.6, 2.0)))
+            barrier.wait()
+
+    threads = [threading.Thread(target=compute, args=(precision,)) for precision in ('exact', 'fast')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {'exact': ('exact', Decimal), 'fast': ('fast', float)}
+    assert get_precision() == 'exact'
+
+def test_precision_context_overrides_default():
+    set_precision('fast')
+    try:
+        with precision_context('exact'):
+            assert get_precision() == 'exact'
+        assert get_precision() == 'fast'
+    finally:
+        set_precision('exact')
+
+def test_invalid_precision():
+    with pytest.raises(ValueError):
+        set_precision('approximate')
+    with pytest.raises(ValueError):
+        with precision_context('approximate'):
+            pass
+    with pytest.raises(ValueError):
+        kelly_criterion(1000, 0.6, 2.0, precision='approximate')
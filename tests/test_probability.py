@@ -1,7 +1,8 @@
 # tests/test_probability.py
+import math
 import pytest
 from decimal import Decimal
-from quantbets.probability import calculate_ev_percentage
+from quantbets.probability import calculate_ev_percentage, calculate_ev_percentage_batch
 
 def test_calculate_ev_percentage():
     assert calculate_ev_percentage(2.0, 0.5) == Decimal('0.0'), "EV should be 0 for break-even odds and probability"
@@ -88,4 +89,21 @@ def test_one_probability():
     odds = Decimal('2.5')
     probability = Decimal('1')
     expected_ev_percentage = Decimal('1.5')
-    assert calculate_ev_percentage(odds, probability) == expected_ev_percentage
\ No newline at end of file
+    assert calculate_ev_percentage(odds, probability) == expected_ev_percentage
+
+
+def test_calculate_ev_percentage_batch_matches_scalar():
+    odds = [2.0, 2.5, 10, 2.5]
+    probabilities = [0.55, 0.2, 1, 0]
+    result = calculate_ev_percentage_batch(odds, probabilities)
+    expected = [float(calculate_ev_percentage(o, p)) for o, p in zip(odds, probabilities)]
+    assert result.tolist() == pytest.approx(expected, rel=1e-12)
+
+def test_calculate_ev_percentage_batch_errors():
+    with pytest.raises(ValueError, match="Probability must be between 0 and 1."):
+        calculate_ev_percentage_batch([2.5, 2.5], [0.5, 1.5])
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        calculate_ev_percentage_batch([2.5, 1.0], 0.5)
+    result = calculate_ev_percentage_batch([2.5, 1.0, 2.5], [0.5, 0.5, -0.1], errors='nan')
+    assert result[0] == pytest.approx(0.25)
+    assert math.isnan(result[1]) and math.isnan(result[2])
@@ -0,0 +1,140 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from quantbets.bankroll_management import kelly_criterion_batch
+from quantbets.devig import calculate_true_odds_batch
+from quantbets.service import FakeSource, PriceUpdate, RepricingService
+
+
+def collect(service):
+    async def main():
+        task = asyncio.ensure_future(service.run())
+        recommendations = [recommendation async for recommendation in service.stream()]
+        await task
+        return recommendations
+
+    return asyncio.run(main())
+
+
+def test_recommendations_match_batch_functions():
+    updates = [PriceUpdate('m1', 'home', 2.1, 0.5), PriceUpdate('m1', 'away', 1.9),
+               PriceUpdate('m2', 'yes', 1.5, 0.7), PriceUpdate('m2', 'no', 2.8)]
+    recommendations = collect(RepricingService([FakeSource(updates)], 1000, multiplier=0.5, window=0.01))
+    assert [(r.market_id, r.selection) for r in recommendations] == [(u.market_id, u.selection) for u in updates]
+
+    fair = calculate_true_odds_batch([2.1, 1.9, 1.5, 2.8], offsets=[0, 2, 4]).true_odds
+    np.testing.assert_allclose([r.fair_odds for r in recommendations], fair)
+    probability = [0.5, 1 / fair[1], 0.7, 1 / fair[3]]
+    np.testing.assert_allclose([r.probability for r in recommendations], probability)
+    np.testing.assert_allclose([r.stake for r in recommendations],
+                               kelly_criterion_batch(1000, probability, [2.1, 1.9, 1.5, 2.8], 0.5))
+
+
+def test_updates_within_window_are_coalesced():
+    updates = [('m1', 'home', 2.0, 0.55), ('m1', 'away', 2.0), ('m1', 'home', 2.2, 0.55)]
+    recommendations = collect(RepricingService([FakeSource(updates)], 100, window=0.05))
+    assert len(recommendations) == 2
+    assert recommendations[0].odds == 2.2
+
+
+def test_later_updates_reprice_whole_market():
+    async def late_source():
+        yield PriceUpdate('m1', 'home', 2.0, 0.55)
+        yield PriceUpdate('m1', 'away', 2.0)
+        await asyncio.sleep(0.05)
+        yield PriceUpdate('m1', 'away', 1.8)
+
+    recommendations = collect(RepricingService([late_source()], 100, window=0.01))
+    assert [(r.selection, r.odds) for r in recommendations] == [('home', 2.0), ('away', 2.0), ('home', 2.0),
+                                                                ('away', 1.8)]
+
+
+def test_backpressure_with_slow_consumer():
+    updates = [(f'm{i}', side, 1.9, 0.5) for i in range(50) for side in ('a', 'b')]
+    service = RepricingService([FakeSource(updates[:50]), FakeSource(updates[50:])], 100, window=0.001,
+                               input_size=2, output_size=1)
+
+    async def main():
+        task = asyncio.ensure_future(service.run())
+        received = []
+        async for recommendation in service.stream():
+            assert service._recommendations.qsize() <= 1
+            received.append(recommendation)
+            await asyncio.sleep(0)
+        await task
+        return received
+
+    received = asyncio.run(main())
+    assert {(r.market_id, r.selection) for r in received} == {update[:2] for update in updates}
+
+
+def test_latency_percentiles():
+    service = RepricingService([FakeSource([('m1', 'a', 2.0), ('m1', 'b', 2.0)])], 100, window=0.01)
+    assert np.isnan(service.latency_percentiles()['p50'])
+    collect(service)
+    latency = service.latency_percentiles()
+    assert set(latency) == {'p50', 'p99'}
+    assert 0.0 <= latency['p50'] <= latency['p99']
+
+
+def test_invalid_bankroll():
+    with pytest.raises(ValueError, match="Bankroll must be a positive value."):
+        RepricingService([], 0)
+
+
+def test_invalid_updates_are_rejected():
+    updates = [('m1', 'a', 2.0, 0.55), ('m1', 'b', 1.0), ('m2', 'a', 2.1), ('m2', 'b', 1.9), ('m3', 'a', 'x'),
+               ('m3', 'b', 2.0, 1.5), ('m1', 'b', 1.8)]
+
+    async def malformed_source():
+        yield ('m4',)
+
+    errors = []
+    service = RepricingService([FakeSource(updates), malformed_source()], 100, window=0.01,
+                               on_error=lambda update, error: errors.append(tuple(update)[:3]))
+    recommendations = collect(service)
+    assert {(r.market_id, r.selection, r.odds) for r in recommendations} == {
+        ('m1', 'a', 2.0), ('m1', 'b', 1.8), ('m2', 'a', 2.1), ('m2', 'b', 1.9)}
+    assert service.rejected == 4
+    assert set(errors) == {('m1', 'b', 1.0), ('m3', 'a', 'x'), ('m3', 'b', 2.0), ('m4',)}
+    assert 'm3' not in service.markets
+
+
+def test_failing_source_cancels_the_other_tasks():
+    async def failing_source():
+        yield PriceUpdate('m1', 'a', 2.0)
+        raise RuntimeError("feed lost")
+
+    async def endless_source():
+        while True:
+            await asyncio.sleep(0.001)
+            yield PriceUpdate('m2', 'a', 2.0)
+
+    async def main():
+        service = RepricingService([failing_source(), endless_source()], 100, window=0.01)
+        with pytest.raises(RuntimeError, match="feed lost"):
+            await asyncio.wait_for(service.run(), 1)
+        current = asyncio.current_task()
+        return [task for task in asyncio.all_tasks() if task is not current]
+
+    assert asyncio.run(main()) == []
+
+
+def test_failure_with_full_output_queue_does_not_hang():
+    async def failing_source():
+        for market_id in ('m1', 'm2', 'm3'):
+            yield PriceUpdate(market_id, 'a', 2.0)
+        # Let the batch fill the output queue, which nobody reads, before failing
+        await asyncio.sleep(0.05)
+        raise RuntimeError("feed lost")
+
+    async def main():
+        service = RepricingService([failing_source()], 100, window=0.01, output_size=1)
+        with pytest.raises(RuntimeError, match="feed lost"):
+            await asyncio.wait_for(service.run(), 1)
+        # The buffered recommendation is still delivered, then the stream ends
+        return [recommendation.market_id async for recommendation in service.stream()]
+
+    assert asyncio.run(main()) == ['m1']
@@ -0,0 +1,51 @@
+# tests/test_simulation.py
+import numpy as np
+import pytest
+from quantbets.simulation import simulate_bankroll
+
+PROBABILITIES = np.full(100, 0.55)
+ODDS = np.full(100, 2.0)
+
+def test_simulation_is_reproducible():
+    first = simulate_bankroll(PROBABILITIES, ODDS, (1.0, 0.5), n_paths=2000, seed=7, chunk_size=300)
+    second = simulate_bankroll(PROBABILITIES, ODDS, (1.0, 0.5), n_paths=2000, seed=7, chunk_size=300)
+    for multiplier in (1.0, 0.5):
+        assert np.array_equal(first[multiplier].terminal_wealth, second[multiplier].terminal_wealth)
+
+def test_process_pool_matches_serial_run():
+    serial = simulate_bankroll(PROBABILITIES, ODDS, (1.0, 0.5), n_paths=2000, seed=3, chunk_size=500)
+    pooled = simulate_bankroll(PROBABILITIES, ODDS, (1.0, 0.5), n_paths=2000, seed=3, chunk_size=500, n_jobs=2)
+    for multiplier in (1.0, 0.5):
+        assert np.array_equal(serial[multiplier].terminal_wealth, pooled[multiplier].terminal_wealth)
+        assert np.array_equal(serial[multiplier].max_drawdown, pooled[multiplier].max_drawdown)
+        assert serial[multiplier].ruin_probability == pooled[multiplier].ruin_probability
+
+def test_growth_rate_matches_theory():
+    result = simulate_bankroll(PROBABILITIES, ODDS, (1.0,), n_paths=20000, seed=1)[1.0]
+    assert result.fractions == pytest.approx(0.1)
+    expected = 0.55 * np.log(1.1) + 0.45 * np.log(0.9)
+    assert result.growth_rate == pytest.approx(expected, rel=0.05)
+    assert result.terminal_wealth.shape == (20000,)
+
+def test_fractional_kelly_reduces_drawdown_and_ruin():
+    result = simulate_bankroll(PROBABILITIES, ODDS, (1.0, 0.25), estimated_probabilities=np.full(100, 0.6),
+                               n_paths=5000, seed=2, ruin_threshold=0.2)
+    full, quarter = result[1.0], result[0.25]
+    assert full.max_drawdown.mean() > quarter.max_drawdown.mean()
+    assert full.ruin_probability >= quarter.ruin_probability
+    assert ((0 <= full.max_drawdown) & (full.max_drawdown <= 1)).all()
+
+def test_negative_ev_bets_are_skipped():
+    result = simulate_bankroll([0.4, 0.6], [2.0, 2.0], (1.0,), n_paths=100, seed=0, initial_bankroll=50)[1.0]
+    assert result.fractions[0] == 0
+    assert set(np.round(result.terminal_wealth, 9)) <= {60.0, 40.0}
+
+def test_simulation_invalid_inputs():
+    with pytest.raises(ValueError):
+        simulate_bankroll([0.5, 1.5], [2.0, 2.0])
+    with pytest.raises(ValueError):
+        simulate_bankroll([0.5], [1.0])
+    with pytest.raises(ValueError):
+        simulate_bankroll([0.5], [2.0], multipliers=(0,))
+    with pytest.raises(ValueError):
+        simulate_bankroll([0.5, 0.5], [2.0])
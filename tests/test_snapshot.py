@@ -0,0 +1,68 @@
+# tests/test_snapshot.py
+import numpy as np
+import pytest
+from quantbets.devig import calculate_true_odds_batch
+from quantbets.probability import calculate_ev_percentage_batch
+from quantbets.snapshot import HEADER_SIZE, SNAPSHOT_DTYPE, SnapshotWriter, read_snapshot, write_snapshot
+
+def test_record_layout():
+    assert SNAPSHOT_DTYPE.itemsize == 32
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'odds.qbs'
+    write_snapshot(path, [7, 7], [1, 2], [1000, 1000], [1.9, 2.0], book=3)
+    snapshot = read_snapshot(path)
+    assert len(snapshot) == 2
+    assert snapshot.market_id.tolist() == [7, 7]
+    assert snapshot.selection.tolist() == [1, 2]
+    assert snapshot.timestamp.tolist() == [1000, 1000]
+    assert snapshot.odds.tolist() == [1.9, 2.0]
+    assert snapshot.book.tolist() == [3, 3]
+
+def test_incremental_append_and_refresh(tmp_path):
+    path = tmp_path / 'odds.qbs'
+    with SnapshotWriter(path) as writer:
+        writer.append(1, [1, 2], 10, [1.8, 2.1])
+    snapshot = read_snapshot(path)
+    with SnapshotWriter(path) as writer:
+        writer.append(2, [1, 2], 20, [1.5, 2.8])
+    assert len(snapshot) == 2
+    snapshot.refresh()
+    assert snapshot.market_id.tolist() == [1, 1, 2, 2]
+    assert snapshot.odds.tolist() == [1.8, 2.1, 1.5, 2.8]
+
+def test_views_are_zero_copy_and_consumable(tmp_path):
+    path = tmp_path / 'odds.qbs'
+    write_snapshot(path, [1, 1, 2, 2], [1, 2, 1, 2], 0, [1.9, 1.9, 1.5, 2.8])
+    snapshot = read_snapshot(path)
+    assert isinstance(snapshot.records, np.memmap)
+    assert np.shares_memory(snapshot.odds, snapshot.records)
+    ev = calculate_ev_percentage_batch(snapshot.odds, 0.55)
+    assert ev == pytest.approx([0.045, 0.045, -0.175, 0.54])
+    true_odds = calculate_true_odds_batch(snapshot.odds, market_ids=snapshot.market_id).true_odds
+    assert true_odds[:2] == pytest.approx([2.0, 2.0])
+
+def test_partial_record_is_discarded(tmp_path):
+    path = tmp_path / 'odds.qbs'
+    write_snapshot(path, 1, 1, 0, 2.0)
+    with open(path, 'ab') as handle:
+        handle.write(b'\x01' * 10)
+    assert len(read_snapshot(path)) == 1
+    write_snapshot(path, 2, 1, 0, 3.0)
+    assert read_snapshot(path).odds.tolist() == [2.0, 3.0]
+
+def test_empty_snapshot(tmp_path):
+    path = tmp_path / 'odds.qbs'
+    SnapshotWriter(path).close()
+    assert path.stat().st_size == HEADER_SIZE
+    assert len(read_snapshot(path)) == 0
+
+def test_invalid_files_and_odds(tmp_path):
+    path = tmp_path / 'odds.csv'
+    path.write_bytes(b'market_id,odds\n' + b'0' * 100)
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+    with pytest.raises(ValueError):
+        SnapshotWriter(path)
+    with pytest.raises(ValueError, match="Odds must be greater than 1."):
+        write_snapshot(tmp_path / 'odds.qbs', 1, 1, 0, 0.5)